@@ -0,0 +1,125 @@
+"""
+동시 채팅 처리량 벤치마크
+
+ChatService -> MultiAgentWorkflow -> Agent -> LLM 클라이언트 경로가
+끝까지 비동기로 await 되는지 확인하기 위해, 동시 요청 수를 늘려가며
+처리량(requests/s)이 함께 증가하는지 측정합니다.
+
+실제 OpenAI / Tavily 호출 대신 고정 지연을 가진 가짜 클라이언트를 사용합니다.
+
+실행:
+    cd ai-agent
+    python benchmarks/bench_concurrent_chat.py --latency-ms 200 --requests 64
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from typing import Callable, Dict, List, Optional
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+
+from domain.models.chat import ChatRequest  # noqa: E402
+from service.chat_service import ChatService  # noqa: E402
+
+
+class FakeLLMClient:
+    """고정 지연 후 응답하는 가짜 LLM 클라이언트 (네트워크 대기 시뮬레이션)"""
+
+    def __init__(self, latency_ms: float):
+        self.latency = latency_ms / 1000
+        self.calls = 0
+
+    async def generate(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        on_token: Optional[Callable[[str], None]] = None,
+        **kwargs,
+    ) -> str:
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        content = f"fake response for: {prompt[:30]}"
+        if on_token:
+            on_token(content)
+        return content
+
+
+class FakeSearchClient:
+    """고정 지연 후 결과를 돌려주는 가짜 검색 클라이언트 (TavilyClient.search 대체)"""
+
+    def __init__(self, latency_ms: float):
+        self.latency = latency_ms / 1000
+
+    async def search(self, query: str, max_results: int = 5, **kwargs) -> List[Dict]:
+        await asyncio.sleep(self.latency)
+        return [
+            {
+                "title": f"{query} result {i}",
+                "url": f"https://example.com/{abs(hash(query))}/{i}",
+                "content": f"{query} 관련 검색 결과 본문 {i}",
+                "score": 1.0 - i * 0.1,
+            }
+            for i in range(max_results)
+        ]
+
+    async def close(self):
+        pass
+
+
+# 각 에이전트(RAG / Search / General LLM 경로)로 라우팅되는 질의
+QUERIES = [
+    "API 문서 보여줘",
+    "요즘 AI 뉴스",
+    "AI에 대해 설명해줘",
+]
+
+
+async def run_level(service: ChatService, concurrency: int, total: int) -> float:
+    """동시 요청 수 concurrency로 total건을 처리하고 처리량(req/s)을 반환"""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i: int):
+        async with semaphore:
+            await service.chat(
+                ChatRequest(
+                    message=QUERIES[i % len(QUERIES)], session_id=f"bench_{i}"
+                )
+            )
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(total)))
+    elapsed = time.perf_counter() - start
+    return total / elapsed
+
+
+async def main(latency_ms: float, total: int, levels: List[int]):
+    llm = FakeLLMClient(latency_ms)
+    service = ChatService(openai_client=llm, tavily_client=FakeSearchClient(latency_ms))
+
+    print(f"LLM latency: {latency_ms:.0f}ms, requests per level: {total}")
+    print(f"{'in-flight':>10} | {'req/s':>10} | {'speedup':>8}")
+    print("-" * 34)
+
+    baseline = None
+    for level in levels:
+        throughput = await run_level(service, level, total)
+        baseline = baseline or throughput
+        print(f"{level:>10} | {throughput:>10.2f} | {throughput / baseline:>7.1f}x")
+
+    await service.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Concurrent chat throughput benchmark")
+    parser.add_argument("--latency-ms", type=float, default=200)
+    parser.add_argument("--requests", type=int, default=64)
+    parser.add_argument(
+        "--levels", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32, 64]
+    )
+    args = parser.parse_args()
+
+    asyncio.run(main(args.latency_ms, args.requests, args.levels))
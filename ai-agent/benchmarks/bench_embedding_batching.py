@@ -0,0 +1,134 @@
+"""
+EmbeddingService 마이크로 배칭 벤치마크
+
+동시 호출자 N명이 각자 질의 1개씩 임베딩할 때
+(1) 백엔드를 직접 호출하는 경우와 (2) EmbeddingService로 묶는 경우의
+백엔드 호출 수, 처리량, 호출자 지연(p50 / p95)을 비교합니다.
+
+백엔드는 호출당 고정 지연 + 텍스트당 지연을 흉내낸 로컬 임베더이며
+--max-inflight로 백엔드 동시 호출 상한(API rate limit 등)을 둘 수 있습니다.
+--repeat-ratio만큼 질의를 반복시켜 LRU 적중 효과도 확인합니다.
+
+실행:
+    cd ai-agent
+    python benchmarks/bench_embedding_batching.py --callers 2000 --concurrency 200
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+from typing import List
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from infrastructure.retrieval.embedding_service import EmbeddingService  # noqa: E402
+from infrastructure.retrieval.embeddings import Embedder, HashingEmbedder  # noqa: E402
+
+
+class SimulatedBackend(Embedder):
+    """원격 임베딩 API 대용: 호출당 지연 + 텍스트당 지연, 동시 호출 상한"""
+
+    def __init__(self, dim: int, call_ms: float, per_text_ms: float, max_inflight: int):
+        self.local = HashingEmbedder(dim)
+        self.name = "simulated"
+        self.dim = dim
+        self.call_ms = call_ms
+        self.per_text_ms = per_text_ms
+        self.semaphore = asyncio.Semaphore(max_inflight)
+        self.calls = 0
+
+    async def embed(self, texts: List[str]) -> np.ndarray:
+        async with self.semaphore:
+            self.calls += 1
+            await asyncio.sleep((self.call_ms + self.per_text_ms * len(texts)) / 1000)
+            return self.local.embed_sync(texts)
+
+
+def percentile(values: List[float], p: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * p), len(ordered) - 1)] * 1000
+
+
+def make_queries(count: int, repeat_ratio: float, seed: int) -> List[str]:
+    rng = random.Random(seed)
+    queries: List[str] = []
+    for i in range(count):
+        if queries and rng.random() < repeat_ratio:
+            queries.append(rng.choice(queries))
+        else:
+            queries.append(f"질의 {i}: retry_policy 설정과 캐시 만료 시간 {rng.randint(0, 10**6)}")
+    return queries
+
+
+async def run(embedder: Embedder, queries: List[str], concurrency: int):
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+
+    async def call(text: str):
+        async with semaphore:
+            start = time.perf_counter()
+            await embedder.embed([text])
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(call(q) for q in queries))
+    elapsed = time.perf_counter() - start
+    return elapsed, latencies
+
+
+async def main(args):
+    queries = make_queries(args.callers, args.repeat_ratio, args.seed)
+    print(
+        f"callers={args.callers}, concurrency={args.concurrency}, backend call={args.call_ms}ms "
+        f"+ {args.per_text_ms}ms/text, max_inflight={args.max_inflight}, "
+        f"repeat_ratio={args.repeat_ratio}"
+    )
+    print(f"{'mode':>10} | {'calls':>6} | {'q/s':>8} | {'p50 ms':>8} | {'p95 ms':>8} | extra")
+    print("-" * 72)
+
+    def backend():
+        return SimulatedBackend(args.dim, args.call_ms, args.per_text_ms, args.max_inflight)
+
+    direct = backend()
+    elapsed, latencies = await run(direct, queries, args.concurrency)
+    print(
+        f"{'direct':>10} | {direct.calls:>6} | {len(queries) / elapsed:>8.0f} | "
+        f"{percentile(latencies, 0.5):>8.1f} | {percentile(latencies, 0.95):>8.1f} |"
+    )
+
+    batched = backend()
+    service = EmbeddingService(
+        batched, max_batch_size=args.batch_size, max_wait_ms=args.wait_ms, cache_size=args.cache_size
+    )
+    elapsed, latencies = await run(service, queries, args.concurrency)
+    stats = service.get_stats()
+    print(
+        f"{'batched':>10} | {batched.calls:>6} | {len(queries) / elapsed:>8.0f} | "
+        f"{percentile(latencies, 0.5):>8.1f} | {percentile(latencies, 0.95):>8.1f} | "
+        f"avg batch {stats['avg_batch_size']:.1f}, cache hit {stats['cache_hit_rate']:.1%}, "
+        f"coalesced {stats['coalesced']}"
+    )
+    await service.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="EmbeddingService micro-batching benchmark")
+    parser.add_argument("--callers", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--call-ms", type=float, default=40.0)
+    parser.add_argument("--per-text-ms", type=float, default=0.2)
+    parser.add_argument("--max-inflight", type=int, default=16)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--wait-ms", type=float, default=5.0)
+    parser.add_argument("--cache-size", type=int, default=10000)
+    parser.add_argument("--repeat-ratio", type=float, default=0.2)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    asyncio.run(main(args))
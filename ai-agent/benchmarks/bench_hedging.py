@@ -0,0 +1,123 @@
+"""
+헤지 요청 p99 지연 벤치마크
+
+지연 꼬리가 긴 로컬 가짜 OpenAI 서버에 대해 OpenAIClient를
+헤지 없이 / 헤지 사용 / 헤지 + RateLimiter로 각각 호출하고 p50 / p95 / p99 지연과
+추가 요청 비율을 비교합니다. RateLimiter가 있으면 헤지 요청도 권한을 받아야 하므로
+동시 실행 여유(--limiter-concurrency)가 없을 때는 헤지를 건너뜁니다.
+
+실행:
+    cd ai-agent
+    python benchmarks/bench_hedging.py --requests 1000 --concurrency 8
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+from typing import List
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from fake_openai_server import FakeOpenAIServer, tail_latency  # noqa: E402
+from infrastructure.llm.hedging import RequestHedger  # noqa: E402
+from infrastructure.llm.openai_client import OpenAIClient  # noqa: E402
+from infrastructure.llm.rate_limiter import RateLimiter  # noqa: E402
+
+
+def percentile(values: List[float], p: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * p), len(ordered) - 1)] * 1000
+
+
+async def run(client: OpenAIClient, total: int, concurrency: int) -> List[float]:
+    """total건을 concurrency 동시성으로 호출하고 호출별 지연(초) 반환"""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one(i: int):
+        async with semaphore:
+            start = time.perf_counter()
+            # 요청마다 프롬프트를 달리해 single-flight 합치기 영향 제거
+            await client.generate(prompt=f"benchmark request {i}", model="gpt-4o-mini")
+            latencies.append(time.perf_counter() - start)
+
+    await asyncio.gather(*(one(i) for i in range(total)))
+    return latencies
+
+
+async def main(args):
+    random.seed(args.seed)
+    server = FakeOpenAIServer(
+        port=args.port,
+        latency=tail_latency(
+            base_ms=args.base_ms, slow_ms=args.slow_ms, slow_ratio=args.slow_ratio
+        ),
+    )
+    await server.start()
+
+    print(
+        f"fake server latency: {args.base_ms:.0f}ms, "
+        f"{args.slow_ratio * 100:.1f}% at {args.slow_ms:.0f}ms"
+    )
+    print(
+        f"{'mode':>14} | {'p50 ms':>8} | {'p95 ms':>8} | {'p99 ms':>8} | "
+        f"{'extra req':>9} | {'skipped':>7}"
+    )
+    print("-" * 72)
+
+    try:
+        for mode in ("baseline", "hedged", "hedged+limiter"):
+            hedger = (
+                RequestHedger(percentile=args.percentile, max_hedge_ratio=args.max_ratio)
+                if mode != "baseline"
+                else None
+            )
+            limiter = (
+                RateLimiter(
+                    requests_per_minute=1_000_000,
+                    tokens_per_minute=1_000_000_000,
+                    max_concurrency=args.limiter_concurrency,
+                )
+                if mode == "hedged+limiter"
+                else None
+            )
+            client = OpenAIClient(
+                api_key="sk-benchmark",
+                base_url=server.base_url,
+                coalesce_requests=False,
+                hedger=hedger,
+                rate_limiter=limiter,
+            )
+
+            before = server.requests
+            latencies = await run(client, args.requests, args.concurrency)
+            extra = (server.requests - before - args.requests) / args.requests
+
+            skipped = hedger.hedge_skipped if hedger else 0
+            print(
+                f"{mode:>14} | {percentile(latencies, 0.5):>8.1f} | "
+                f"{percentile(latencies, 0.95):>8.1f} | {percentile(latencies, 0.99):>8.1f} | "
+                f"{extra * 100:>8.1f}% | {skipped:>7}"
+            )
+            await client.aclose()
+    finally:
+        await server.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Hedged request tail latency benchmark")
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--base-ms", type=float, default=50)
+    parser.add_argument("--slow-ms", type=float, default=1500)
+    parser.add_argument("--slow-ratio", type=float, default=0.03)
+    parser.add_argument("--percentile", type=float, default=0.95)
+    parser.add_argument("--max-ratio", type=float, default=0.1)
+    parser.add_argument("--limiter-concurrency", type=int, default=10)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--seed", type=int, default=42)
+    asyncio.run(main(parser.parse_args()))
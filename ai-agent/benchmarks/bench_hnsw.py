@@ -0,0 +1,143 @@
+"""
+HNSW 그래프 검색 벤치마크
+
+군집 구조가 있는 합성 임베딩으로 HNSWGraph를 만들고 float32 전수 탐색(정확 기준) 대비
+- 그래프 생성 시간 / 초당 삽입 수 / 그래프 메모리
+- ef_search별 질의 지연(p50 / p95)과 recall@k
+- 증분 삽입(--inserts개)과 삭제(tombstone, --deletes개) 후 recall
+- 저장 후 mmap 로드 시간
+을 측정합니다.
+
+실행:
+    cd ai-agent
+    python benchmarks/bench_hnsw.py --size 20000 --dim 128 --k 10
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from typing import List
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from domain.models.document import DocumentChunk  # noqa: E402
+from infrastructure.retrieval.hnsw_index import HNSWGraph  # noqa: E402
+from infrastructure.retrieval.vector_index import VectorIndex  # noqa: E402
+
+
+def percentile(values: List[float], p: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * p), len(ordered) - 1)] * 1000
+
+
+def clustered_vectors(
+    size: int, dim: int, clusters: int, noise: float, rng: np.random.Generator
+) -> np.ndarray:
+    centers = rng.standard_normal((clusters, dim), dtype=np.float32)
+    vectors = centers[rng.integers(0, clusters, size)]
+    vectors += noise * rng.standard_normal((size, dim), dtype=np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors
+
+
+def run(index: VectorIndex, queries: np.ndarray, k: int):
+    index.search(queries[0], k)  # 워밍업
+    latencies, results = [], []
+    for query in queries:
+        start = time.perf_counter()
+        results.append([row for row, _ in index.search(query, k)])
+        latencies.append(time.perf_counter() - start)
+    return percentile(latencies, 0.5), percentile(latencies, 0.95), results
+
+
+def recall(approx: List[List[int]], exact: List[List[int]], k: int) -> float:
+    return float(np.mean([len(set(a) & set(e)) / k for a, e in zip(approx, exact)]))
+
+
+def main(args):
+    rng = np.random.default_rng(args.seed)
+    total = args.size + args.inserts
+    vectors = clustered_vectors(total, args.dim, args.clusters, args.noise, rng)
+    noise = args.noise / np.sqrt(args.dim) * rng.standard_normal((args.queries, args.dim), dtype=np.float32)
+    queries = vectors[rng.integers(0, total, args.queries)] + noise
+    chunks = [
+        DocumentChunk(chunk_id=f"doc{i}#0", doc_id=f"doc{i}", title="", content="")
+        for i in range(total)
+    ]
+
+    base = vectors[:args.size]
+    start = time.perf_counter()
+    graph = HNSWGraph.build(base, args.m, args.ef_construction)
+    build_s = time.perf_counter() - start
+    print(
+        f"size={args.size}, dim={args.dim}, k={args.k}, queries={args.queries}, "
+        f"M={args.m}, ef_construction={args.ef_construction}"
+    )
+    print(
+        f"build {build_s:.1f}s ({args.size / build_s:.0f} inserts/s), "
+        f"graph {graph.nbytes / 1024 / 1024:.1f} MB, max level {graph.max_level}\n"
+    )
+
+    exact_index = VectorIndex(base, chunks[:args.size], "synthetic")
+    p50, p95, exact = run(exact_index, queries, args.k)
+    print(f"{'mode':>12} | {'p50 ms':>8} | {'p95 ms':>8} | {'recall@' + str(args.k):>10}")
+    print("-" * 50)
+    print(f"{'flat':>12} | {p50:>8.2f} | {p95:>8.2f} | {1:>10.3f}")
+
+    index = VectorIndex(base, chunks[:args.size], "synthetic", graph=graph)
+    for ef in args.ef:
+        index.ef_search = ef
+        p50, p95, approx = run(index, queries, args.k)
+        print(f"{'hnsw ef=' + str(ef):>12} | {p50:>8.2f} | {p95:>8.2f} | {recall(approx, exact, args.k):>10.3f}")
+
+    # 증분: 새 행 삽입 + 일부 행 삭제(tombstone) 후 같은 ef로 비교
+    updated = graph.copy()
+    start = time.perf_counter()
+    for row in range(args.size, total):
+        updated.insert(vectors, row)
+    insert_s = time.perf_counter() - start
+    tombstones = np.zeros(total, dtype=bool)
+    tombstones[rng.choice(args.size, args.deletes, replace=False)] = True
+
+    exact_index = VectorIndex(vectors, chunks, "synthetic", tombstones=tombstones)
+    _, _, exact = run(exact_index, queries, args.k)
+    index = VectorIndex(vectors, chunks, "synthetic", tombstones=tombstones, graph=updated)
+    index.ef_search = args.ef[-1]
+    p50, p95, approx = run(index, queries, args.k)
+    print(
+        f"\nincremental: +{args.inserts} rows in {insert_s:.1f}s "
+        f"({args.inserts / max(insert_s, 1e-9):.0f} inserts/s), -{args.deletes} tombstoned -> "
+        f"ef={args.ef[-1]} p50 {p50:.2f}ms, recall@{args.k} {recall(approx, exact, args.k):.3f}"
+    )
+
+    with tempfile.TemporaryDirectory() as directory:
+        index.write_files(directory)
+        start = time.perf_counter()
+        loaded = VectorIndex.load(directory, mmap=True)
+        load_ms = (time.perf_counter() - start) * 1000
+        loaded.ef_search = args.ef[-1]
+        _, _, approx = run(loaded, queries, args.k)
+        print(f"mmap load: {load_ms:.1f}ms, recall@{args.k} after load {recall(approx, exact, args.k):.3f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="HNSW graph index benchmark")
+    parser.add_argument("--size", type=int, default=20_000)
+    parser.add_argument("--dim", type=int, default=128)
+    parser.add_argument("--clusters", type=int, default=200)
+    parser.add_argument("--noise", type=float, default=0.5, help="군집 내 잡음 (클수록 무작위 벡터에 가까움)")
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--m", type=int, default=16)
+    parser.add_argument("--ef-construction", type=int, default=100)
+    parser.add_argument("--ef", type=int, nargs="+", default=[16, 32, 64, 128])
+    parser.add_argument("--inserts", type=int, default=1000)
+    parser.add_argument("--deletes", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    main(args)
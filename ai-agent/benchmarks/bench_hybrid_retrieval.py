@@ -0,0 +1,130 @@
+"""
+RAG 검색 모드별(dense / sparse / hybrid) 지연 및 recall@k 벤치마크
+
+한국어 설명 + 코드 식별자가 섞인 합성 마크다운 문서를 만들어 DocumentRetriever로
+색인한 뒤, 각 문서에서 뽑은 질의(일부 단어 + 식별자 일부)로 검색하여
+정답 문서가 상위 k개 안에 들어오는 비율(recall@k)과 질의 지연(p50 / p95)을 측정합니다.
+
+실행:
+    cd ai-agent
+    python benchmarks/bench_hybrid_retrieval.py --docs 5000 --queries 300 --k 5
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+from typing import List, Tuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from infrastructure.retrieval.embeddings import HashingEmbedder  # noqa: E402
+from service.rag.retriever import RETRIEVAL_MODES, DocumentRetriever  # noqa: E402
+
+
+KOREAN_WORDS = [
+    "설정", "파일", "서버", "클라이언트", "요청", "응답", "캐시", "인덱스", "검색", "문서",
+    "배포", "컨테이너", "로그", "오류", "재시도", "연결", "세션", "토큰", "모델", "에이전트",
+    "스트리밍", "메시지", "사용자", "권한", "저장소", "브랜치", "커밋", "테스트", "빌드", "환경",
+]
+CODE_PARTS = [
+    "load", "parse", "build", "fetch", "stream", "retry", "cache", "index", "token", "session",
+    "config", "client", "server", "agent", "router", "handler", "chunk", "vector", "query", "graph",
+]
+
+
+def make_corpus(num_docs: int, seed: int) -> List[Tuple[str, str, str]]:
+    """(doc_id, 본문, 질의) 목록"""
+    rng = random.Random(seed)
+    docs = []
+    for i in range(num_docs):
+        words = rng.sample(KOREAN_WORDS, 6)
+        parts = rng.sample(CODE_PARTS, 2)
+        identifier = f"{parts[0]}_{parts[1]}_{i}"
+        camel = f"{parts[0].title()}{parts[1].title()}{i}"
+        body = (
+            f"# {words[0]} {words[1]} 가이드 {i}\n\n"
+            f"{words[0]}와 {words[1]}을 다루는 방법을 설명합니다. "
+            f"`{identifier}()` 함수는 {words[2]} {words[3]}을 처리하고 "
+            f"`{camel}` 클래스가 {words[4]} {words[5]}을 관리합니다.\n"
+        )
+        query = f"{words[2]} {words[4]} {identifier} 사용법"
+        docs.append((f"doc{i}", body, query))
+    return docs
+
+
+def percentile(values: List[float], p: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * p), len(ordered) - 1)] * 1000
+
+
+async def run_mode(
+    retriever: DocumentRetriever, mode: str, queries: List[Tuple[str, str]], k: int
+) -> Tuple[float, float, float]:
+    retriever.mode = mode
+    await retriever.retrieve(queries[0][1], k)  # 워밍업
+
+    latencies = []
+    hits = 0
+    for doc_id, query in queries:
+        start = time.perf_counter()
+        results = await retriever.retrieve(query, k)
+        latencies.append(time.perf_counter() - start)
+        if any(os.path.basename(r.chunk.doc_id) == f"{doc_id}.md" for r in results):
+            hits += 1
+
+    return percentile(latencies, 0.5), percentile(latencies, 0.95), hits / len(queries)
+
+
+async def main(args):
+    corpus = make_corpus(args.docs, args.seed)
+    queries = [(doc_id, query) for doc_id, _, query in random.Random(args.seed).sample(
+        corpus, min(args.queries, len(corpus))
+    )]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        source_dir = os.path.join(tmp, "docs")
+        os.makedirs(source_dir)
+        for doc_id, body, _ in corpus:
+            with open(os.path.join(source_dir, f"{doc_id}.md"), "w", encoding="utf-8") as f:
+                f.write(body)
+
+        retriever = DocumentRetriever(
+            embedder=HashingEmbedder(dim=args.dim),
+            index_dir=os.path.join(tmp, "index"),
+            source_paths=[source_dir],
+            dense_weight=args.dense_weight,
+            sparse_weight=args.sparse_weight,
+            rrf_k=args.rrf_k,
+        )
+        start = time.perf_counter()
+        await retriever.initialize()
+        build_s = time.perf_counter() - start
+
+        print(
+            f"docs={args.docs}, chunks={retriever.index.size}, queries={len(queries)}, "
+            f"k={args.k}, build={build_s:.2f}s"
+        )
+        print(f"{'mode':>8} | {'p50 ms':>8} | {'p95 ms':>8} | {'recall@' + str(args.k):>10}")
+        print("-" * 44)
+        for mode in RETRIEVAL_MODES:
+            p50, p95, recall = await run_mode(retriever, mode, queries, args.k)
+            print(f"{mode:>8} | {p50:>8.2f} | {p95:>8.2f} | {recall:>10.3f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Dense / BM25 / hybrid retrieval benchmark")
+    parser.add_argument("--docs", type=int, default=5000)
+    parser.add_argument("--queries", type=int, default=300)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--dense-weight", type=float, default=1.0)
+    parser.add_argument("--sparse-weight", type=float, default=1.0)
+    parser.add_argument("--rrf-k", type=int, default=60)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    asyncio.run(main(args))
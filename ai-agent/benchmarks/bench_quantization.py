@@ -0,0 +1,119 @@
+"""
+벡터 양자화(int8 / PQ) 벤치마크
+
+군집 구조가 있는 합성 임베딩(중심 + 잡음)으로 VectorIndex를 만들고
+float32 전수 탐색(정확 기준) 대비 양자화 모드별로
+- 100만 청크당 상주 메모리(압축 코드 + 파라미터)
+- 학습/인코딩 시간
+- 질의 지연(p50 / p95)
+- recall@k (정확 top-k와 겹치는 비율)
+을 측정합니다. 재정렬 후보 수는 k * --rerank-multiplier 입니다.
+
+실행:
+    cd ai-agent
+    python benchmarks/bench_quantization.py --size 200000 --dim 384 --k 10
+"""
+
+import argparse
+import os
+import sys
+import time
+from typing import List
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from domain.models.document import DocumentChunk  # noqa: E402
+from infrastructure.retrieval.quantization import train_quantizer  # noqa: E402
+from infrastructure.retrieval.vector_index import VectorIndex  # noqa: E402
+
+
+def percentile(values: List[float], p: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * p), len(ordered) - 1)] * 1000
+
+
+def clustered_vectors(
+    size: int, dim: int, clusters: int, noise: float, rng: np.random.Generator
+) -> np.ndarray:
+    centers = rng.standard_normal((clusters, dim), dtype=np.float32)
+    vectors = centers[rng.integers(0, clusters, size)]
+    vectors += noise * rng.standard_normal((size, dim), dtype=np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors
+
+
+def run(index: VectorIndex, queries: np.ndarray, k: int):
+    index.search(queries[0], k)  # 워밍업
+    latencies, results = [], []
+    for query in queries:
+        start = time.perf_counter()
+        results.append([row for row, _ in index.search(query, k)])
+        latencies.append(time.perf_counter() - start)
+    return percentile(latencies, 0.5), percentile(latencies, 0.95), results
+
+
+def main(args):
+    rng = np.random.default_rng(args.seed)
+    vectors = clustered_vectors(args.size, args.dim, args.clusters, args.noise, rng)
+    # 질의는 코퍼스 벡터 근처 (정규화 벡터 기준 잡음)
+    noise = args.noise / np.sqrt(args.dim) * rng.standard_normal((args.queries, args.dim), dtype=np.float32)
+    queries = vectors[rng.integers(0, args.size, args.queries)] + noise
+    chunks = [
+        DocumentChunk(chunk_id=f"doc{i}#0", doc_id=f"doc{i}", title="", content="")
+        for i in range(args.size)
+    ]
+
+    exact_index = VectorIndex(vectors, chunks, "synthetic")
+    p50, p95, exact = run(exact_index, queries, args.k)
+    float_mb = vectors.nbytes / args.size * 1_000_000 / 1024 / 1024
+
+    print(
+        f"size={args.size}, dim={args.dim}, k={args.k}, queries={args.queries}, "
+        f"rerank candidates={args.k * args.rerank_multiplier}"
+    )
+    print(
+        f"{'mode':>8} | {'MB / 1M':>8} | {'build s':>8} | {'p50 ms':>8} | "
+        f"{'p95 ms':>8} | {'recall@' + str(args.k):>10}"
+    )
+    print("-" * 66)
+    print(f"{'float32':>8} | {float_mb:>8.0f} | {0:>8.2f} | {p50:>8.2f} | {p95:>8.2f} | {1:>10.3f}")
+
+    for kind in ("int8", "pq"):
+        start = time.perf_counter()
+        quantizer = train_quantizer(kind, vectors, args.pq_subspaces)
+        build_s = time.perf_counter() - start
+
+        index = VectorIndex(
+            vectors, chunks, "synthetic",
+            quantizer=quantizer, rerank_multiplier=args.rerank_multiplier,
+        )
+        p50, p95, approx = run(index, queries, args.k)
+        recall = np.mean([len(set(a) & set(e)) / args.k for a, e in zip(approx, exact)])
+        memory_mb = quantizer.nbytes / args.size * 1_000_000 / 1024 / 1024
+        print(
+            f"{kind:>8} | {memory_mb:>8.0f} | {build_s:>8.2f} | {p50:>8.2f} | "
+            f"{p95:>8.2f} | {recall:>10.3f}"
+        )
+
+    print(
+        "\nMB / 1M는 질의 시 상주하는 코드 크기입니다. 재정렬용 float32 벡터는 mmap 파일에서 "
+        "후보 행만 읽습니다."
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Quantized vector index benchmark")
+    parser.add_argument("--size", type=int, default=200_000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--clusters", type=int, default=1000)
+    parser.add_argument("--noise", type=float, default=0.5, help="군집 내 잡음 (클수록 무작위 벡터에 가까움)")
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--pq-subspaces", type=int, default=48)
+    parser.add_argument("--rerank-multiplier", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    main(args)
@@ -0,0 +1,99 @@
+"""
+retrieval 서버 동시 질의 묶음 처리 벤치마크
+
+합성 dense 인덱스에서 동시 호출자 N명이 각자 질의 1개씩 검색할 때
+(1) DocumentRetriever.retrieve를 질의마다 호출 (질의당 행렬-벡터 곱)
+(2) RetrievalBatcher로 묶어 retrieve_batch 호출 (배치당 행렬 곱 한 번)
+의 처리량과 호출자 지연(p50 / p95)을 비교합니다.
+서버 프로세스 안에서 요청이 처리되는 경로와 같으며 HTTP 왕복은 포함하지 않습니다.
+
+실행:
+    cd ai-agent
+    python benchmarks/bench_retrieval_server.py --size 200000 --dim 384 --callers 512
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from typing import List
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from domain.models.document import DocumentChunk  # noqa: E402
+from infrastructure.retrieval.embeddings import HashingEmbedder  # noqa: E402
+from infrastructure.retrieval.vector_index import VectorIndex  # noqa: E402
+from service.rag.retrieval_batcher import RetrievalBatcher  # noqa: E402
+from service.rag.retriever import DocumentRetriever  # noqa: E402
+
+
+def percentile(values: List[float], p: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * p), len(ordered) - 1)] * 1000
+
+
+async def run(search, queries: List[str], concurrency: int, k: int):
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+
+    async def call(query: str):
+        async with semaphore:
+            start = time.perf_counter()
+            await search(query, k)
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(call(query) for query in queries))
+    elapsed = time.perf_counter() - start
+    return len(queries) / elapsed, percentile(latencies, 0.5), percentile(latencies, 0.95)
+
+
+async def main(args):
+    rng = np.random.default_rng(args.seed)
+    vectors = rng.standard_normal((args.size, args.dim), dtype=np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    chunks = [
+        DocumentChunk(chunk_id=f"{i}", doc_id=f"doc{i}.md", title="", content="")
+        for i in range(args.size)
+    ]
+
+    # 인덱스 파일 없이 메모리 인덱스를 직접 연결 (결과 캐시는 끔)
+    retriever = DocumentRetriever(
+        embedder=HashingEmbedder(dim=args.dim), index_dir="", source_paths=[], mode="dense"
+    )
+    retriever.index = VectorIndex(vectors, chunks, "synthetic")
+    queries = [f"query {i} token{i % 97} word{i % 31}" for i in range(args.callers)]
+
+    print(
+        f"size={args.size}, dim={args.dim}, callers={args.callers}, "
+        f"concurrency={args.concurrency}, k={args.k}"
+    )
+    print(f"{'mode':>10} | {'qps':>8} | {'p50 ms':>8} | {'p95 ms':>8} | {'avg batch':>9}")
+    print("-" * 56)
+
+    qps, p50, p95 = await run(retriever.retrieve, queries, args.concurrency, args.k)
+    print(f"{'unbatched':>10} | {qps:>8.1f} | {p50:>8.2f} | {p95:>8.2f} | {1.0:>9.1f}")
+
+    batcher = RetrievalBatcher(retriever, args.max_batch_size, args.max_wait_ms)
+    qps, p50, p95 = await run(batcher.retrieve, queries, args.concurrency, args.k)
+    avg_batch = batcher.get_stats()["avg_batch_size"]
+    print(f"{'batched':>10} | {qps:>8.1f} | {p50:>8.2f} | {p95:>8.2f} | {avg_batch:>9.1f}")
+    await batcher.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Retrieval server micro-batching benchmark")
+    parser.add_argument("--size", type=int, default=200_000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--callers", type=int, default=512)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--max-batch-size", type=int, default=32)
+    parser.add_argument("--max-wait-ms", type=float, default=2.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    asyncio.run(main(args))
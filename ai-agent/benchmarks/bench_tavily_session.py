@@ -0,0 +1,155 @@
+"""
+Tavily 세션 재사용 벤치마크
+
+로컬 가짜 Tavily 서버에 대해
+- 검색마다 새 aiohttp.ClientSession을 여는 기존 방식
+- 하나의 세션(커넥션 풀)을 재사용하는 TavilyClient
+의 검색당 지연(p50 / p95)과 처리량을 비교합니다.
+
+로컬 서버는 평문 HTTP이므로 실제 API에서 추가로 절약되는
+DNS 조회 / TLS 핸드셰이크 비용은 이 수치에 포함되지 않습니다.
+
+실행:
+    cd ai-agent
+    python benchmarks/bench_tavily_session.py --requests 500 --concurrency 1 8
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from typing import Awaitable, Callable, List
+
+import aiohttp
+from aiohttp import web
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from infrastructure.external.tavily_client import TavilyClient  # noqa: E402
+
+
+class FakeTavilyServer:
+    """aiohttp 기반 가짜 Tavily /search 서버"""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 8766, latency_ms: float = 5):
+        self.host = host
+        self.port = port
+        self.latency = latency_ms / 1000
+        self.requests = 0
+        self.connections = set()
+        self._runner = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    async def _search(self, request: web.Request) -> web.Response:
+        self.requests += 1
+        self.connections.add(request.transport.get_extra_info("peername"))
+        body = await request.json()
+        await asyncio.sleep(self.latency)
+        return web.json_response(
+            {
+                "query": body["query"],
+                "results": [
+                    {
+                        "title": f"result {i} for {body['query']}",
+                        "url": f"https://example.com/{i}",
+                        "content": "benchmark content " * 20,
+                        "score": 1.0 - i * 0.1,
+                        "published_date": "2024-01-01",
+                    }
+                    for i in range(body.get("max_results", 5))
+                ],
+            }
+        )
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_post("/search", self._search)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+
+    async def stop(self):
+        if self._runner:
+            await self._runner.cleanup()
+
+
+async def legacy_search(base_url: str, query: str) -> List[dict]:
+    """기존 구현과 동일: 검색마다 새 세션 (새 커넥터, 새 연결)"""
+    async with aiohttp.ClientSession() as session:
+        async with session.post(
+            f"{base_url}/search", json={"api_key": "tvly-benchmark", "query": query}
+        ) as response:
+            data = await response.json()
+            return data.get("results", [])
+
+
+def percentile(values: List[float], p: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * p), len(ordered) - 1)] * 1000
+
+
+async def run(
+    search: Callable[[str], Awaitable[List[dict]]], total: int, concurrency: int
+) -> tuple:
+    """total건을 concurrency 동시성으로 검색하고 (지연 목록, 처리량) 반환"""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one(i: int):
+        async with semaphore:
+            start = time.perf_counter()
+            await search(f"benchmark query {i}")
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(total)))
+    return latencies, total / (time.perf_counter() - start)
+
+
+async def main(args):
+    server = FakeTavilyServer(port=args.port, latency_ms=args.latency_ms)
+    await server.start()
+
+    client = TavilyClient(api_key="tvly-benchmark", base_url=server.base_url)
+    await client.start()
+
+    modes = {
+        "per-search": lambda q: legacy_search(server.base_url, q),
+        "pooled": client.search,
+    }
+
+    print(f"stub server latency: {args.latency_ms:.0f}ms, requests: {args.requests}")
+    print(
+        f"{'mode':>10} | {'conc':>4} | {'p50 ms':>8} | {'p95 ms':>8} | "
+        f"{'req/s':>8} | {'conns':>5}"
+    )
+    print("-" * 60)
+
+    try:
+        for concurrency in args.concurrency:
+            for mode, search in modes.items():
+                server.connections.clear()
+                latencies, throughput = await run(search, args.requests, concurrency)
+                print(
+                    f"{mode:>10} | {concurrency:>4} | {percentile(latencies, 0.5):>8.2f} | "
+                    f"{percentile(latencies, 0.95):>8.2f} | {throughput:>8.1f} | "
+                    f"{len(server.connections):>5}"
+                )
+    finally:
+        await client.close()
+        await server.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Tavily session reuse benchmark")
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8])
+    parser.add_argument("--latency-ms", type=float, default=5)
+    parser.add_argument("--port", type=int, default=8766)
+    args = parser.parse_args()
+
+    asyncio.run(main(args))
@@ -0,0 +1,116 @@
+"""
+VectorIndex 질의 지연 벤치마크
+
+무작위 정규화 벡터로 코퍼스 크기별(기본 10k / 100k / 1M) 인덱스를 만들어
+mmap으로 로드한 뒤 top-k 질의 지연(p50 / p95)과 배치 질의 처리량을 측정합니다.
+
+메모리/디스크 사용량은 N x dim x 4 bytes 입니다 (1M x 384 = 약 1.5GB).
+
+실행:
+    cd ai-agent
+    python benchmarks/bench_vector_index.py --sizes 10000 100000 1000000 --dim 384
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from typing import List
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from domain.models.document import DocumentChunk  # noqa: E402
+from infrastructure.retrieval.index_store import resolve_index_dir  # noqa: E402
+from infrastructure.retrieval.vector_index import VECTORS_FILE, VectorIndex  # noqa: E402
+
+
+def percentile(values: List[float], p: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * p), len(ordered) - 1)] * 1000
+
+
+def write_random_index(path: str, size: int, dim: int, seed: int) -> VectorIndex:
+    """블록 단위로 무작위 벡터를 만들어 저장 (전체 크기의 두 배 메모리를 쓰지 않도록)"""
+    rng = np.random.default_rng(seed)
+    chunks = [
+        DocumentChunk(chunk_id=f"doc{i}#0", doc_id=f"doc{i}", title=f"doc {i}", content="")
+        for i in range(size)
+    ]
+    # 저장 포맷(manifest, chunks)은 VectorIndex.save로 만들고 벡터만 블록 단위로 채움
+    VectorIndex(np.zeros((size, 0), dtype=np.float32), chunks, "random").save(path)
+
+    vectors = np.lib.format.open_memmap(
+        os.path.join(resolve_index_dir(path), VECTORS_FILE), mode="w+", dtype=np.float32, shape=(size, dim)
+    )
+    block = 65536
+    for start in range(0, size, block):
+        rows = rng.standard_normal((min(block, size - start), dim), dtype=np.float32)
+        rows /= np.linalg.norm(rows, axis=1, keepdims=True)
+        vectors[start:start + len(rows)] = rows
+    vectors.flush()
+    del vectors
+
+    return VectorIndex.load(path, mmap=True)
+
+
+def run(index: VectorIndex, dim: int, queries: int, k: int, batch: int, seed: int):
+    rng = np.random.default_rng(seed + 1)
+    query_vectors = rng.standard_normal((queries, dim), dtype=np.float32)
+
+    # 첫 질의로 페이지 캐시 적재
+    index.search(query_vectors[0], k)
+
+    latencies = []
+    for query in query_vectors:
+        start = time.perf_counter()
+        index.search(query, k)
+        latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for i in range(0, queries, batch):
+        index.search_batch(query_vectors[i:i + batch], k)
+    batch_qps = queries / (time.perf_counter() - start)
+
+    return percentile(latencies, 0.5), percentile(latencies, 0.95), batch_qps
+
+
+def main(args):
+    print(f"dim={args.dim}, k={args.k}, queries={args.queries}, batch={args.batch}")
+    print(
+        f"{'chunks':>10} | {'size MB':>8} | {'load ms':>8} | {'p50 ms':>8} | "
+        f"{'p95 ms':>8} | {'batch q/s':>10}"
+    )
+    print("-" * 68)
+
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "index")
+            write_random_index(path, size, args.dim, args.seed)
+
+            start = time.perf_counter()
+            index = VectorIndex.load(path, mmap=True)
+            load_ms = (time.perf_counter() - start) * 1000
+
+            p50, p95, batch_qps = run(index, args.dim, args.queries, args.k, args.batch, args.seed)
+            size_mb = index.vectors.nbytes / 1024 / 1024
+            print(
+                f"{size:>10} | {size_mb:>8.1f} | {load_ms:>8.1f} | {p50:>8.2f} | "
+                f"{p95:>8.2f} | {batch_qps:>10.1f}"
+            )
+            del index
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="VectorIndex query latency benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--batch", type=int, default=32)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    main(args)
@@ -0,0 +1,85 @@
+"""
+로컬 가짜 OpenAI 서버 (벤치마크용)
+
+/v1/chat/completions 요청에 대해 주입된 지연 후 고정 응답을 돌려줍니다.
+"""
+
+import asyncio
+import random
+import time
+from typing import Callable, Optional
+
+from aiohttp import web
+
+
+def tail_latency(
+    base_ms: float = 50, jitter_ms: float = 20, slow_ms: float = 1500, slow_ratio: float = 0.03
+) -> Callable[[], float]:
+    """대부분은 빠르고 일부(slow_ratio)만 매우 느린 지연 분포 (초 단위 반환)"""
+
+    def sample() -> float:
+        if random.random() < slow_ratio:
+            return slow_ms / 1000
+        return max(base_ms + random.uniform(-jitter_ms, jitter_ms), 1) / 1000
+
+    return sample
+
+
+class FakeOpenAIServer:
+    """aiohttp 기반 가짜 Chat Completions 서버"""
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 8765,
+        latency: Optional[Callable[[], float]] = None,
+    ):
+        self.host = host
+        self.port = port
+        self.latency = latency or tail_latency()
+        self.requests = 0
+        self.cancelled = 0
+        self._runner: Optional[web.AppRunner] = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}/v1"
+
+    async def _chat_completions(self, request: web.Request) -> web.Response:
+        self.requests += 1
+        body = await request.json()
+
+        try:
+            await asyncio.sleep(self.latency())
+        except asyncio.CancelledError:
+            # 클라이언트가 헤지 패자 요청을 취소한 경우
+            self.cancelled += 1
+            raise
+
+        return web.json_response(
+            {
+                "id": f"chatcmpl-{self.requests}",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": body.get("model", "gpt-4o-mini"),
+                "choices": [
+                    {
+                        "index": 0,
+                        "message": {"role": "assistant", "content": "fake completion"},
+                        "finish_reason": "stop",
+                    }
+                ],
+                "usage": {"prompt_tokens": 10, "completion_tokens": 2, "total_tokens": 12},
+            }
+        )
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_post("/v1/chat/completions", self._chat_completions)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+
+    async def stop(self):
+        if self._runner:
+            await self._runner.cleanup()
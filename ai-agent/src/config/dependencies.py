@@ -1,17 +1,194 @@
-from functools import lru_cache
-from infrastructure.llm.openai_client import OpenAIClient
+from functools import lru_cache, partial
+from typing import Optional, Union
+from infrastructure.llm.openai_client import OpenAIClient, build_http_client
+from infrastructure.llm.completion_cache import CompletionCache
+from infrastructure.llm.rate_limiter import RateLimiter
+from infrastructure.llm.hedging import RequestHedger
+from infrastructure.external.tavily_client import TavilyClient
+from infrastructure.external.search_cache import SearchCache
+from infrastructure.retrieval.embeddings import Embedder, HashingEmbedder, OpenAIEmbedder
+from infrastructure.retrieval.embedding_service import EmbeddingService
+from infrastructure.retrieval.result_cache import RetrievalCache
+from infrastructure.retrieval.retrieval_client import RetrievalClient
+from service.rag.chunker import MarkdownChunker
+from service.rag.retrieval_batcher import RetrievalBatcher
+from service.rag.retriever import DocumentRetriever
 from service.chat_service import ChatService
 from config.settings import settings
 
 
+@lru_cache()
+def get_completion_cache() -> Optional[CompletionCache]:
+    """LLM 응답 캐시 의존성 (설정에서 활성화한 경우만)"""
+    if not settings.llm_cache_enabled:
+        return None
+    return CompletionCache(
+        db_path=settings.llm_cache_path,
+        ttl_seconds=settings.llm_cache_ttl_seconds,
+        max_memory_entries=settings.llm_cache_memory_entries,
+    )
+
+
+@lru_cache()
+def get_rate_limiter() -> Optional[RateLimiter]:
+    """LLM 호출 제한기 의존성"""
+    if not settings.llm_rate_limit_enabled:
+        return None
+    return RateLimiter(
+        requests_per_minute=settings.llm_requests_per_minute,
+        tokens_per_minute=settings.llm_tokens_per_minute,
+        max_concurrency=settings.llm_max_concurrency,
+        min_concurrency=settings.llm_min_concurrency,
+    )
+
+
+@lru_cache()
+def get_request_hedger() -> Optional[RequestHedger]:
+    """LLM 헤지 요청 실행기 의존성"""
+    if not settings.llm_hedging_enabled:
+        return None
+    return RequestHedger(
+        percentile=settings.llm_hedging_percentile,
+        max_hedge_ratio=settings.llm_hedging_max_ratio,
+    )
+
+
 @lru_cache()
 def get_openai_client() -> OpenAIClient:
     """OpenAI 클라이언트 의존성"""
-    return OpenAIClient(api_key=settings.openai_api_key)
+    return OpenAIClient(
+        api_key=settings.openai_api_key,
+        cache=get_completion_cache(),
+        coalesce_requests=settings.llm_coalesce_requests,
+        default_model=settings.openai_model,
+        default_max_tokens=settings.openai_max_tokens,
+        rate_limiter=get_rate_limiter(),
+        rate_limit_retries=settings.llm_rate_limit_retries,
+        transient_retries=settings.llm_transient_retries,
+        hedger=get_request_hedger(),
+        http_client_factory=partial(
+            build_http_client,
+            max_connections=settings.openai_max_connections,
+            max_keepalive_connections=settings.openai_max_keepalive_connections,
+            keepalive_expiry=settings.openai_keepalive_expiry_seconds,
+            connect_timeout=settings.openai_connect_timeout_seconds,
+            read_timeout=settings.openai_read_timeout_seconds,
+            http2=settings.openai_http2,
+        ),
+    )
+
+
+@lru_cache()
+def get_search_cache() -> Optional[SearchCache]:
+    """웹 검색 결과 캐시 의존성"""
+    if not settings.search_cache_enabled:
+        return None
+    return SearchCache(
+        db_path=settings.search_cache_path,
+        realtime_ttl_seconds=settings.search_cache_realtime_ttl_seconds,
+        default_ttl_seconds=settings.search_cache_default_ttl_seconds,
+        evergreen_ttl_seconds=settings.search_cache_evergreen_ttl_seconds,
+        stale_ratio=settings.search_cache_stale_ratio,
+    )
+
+
+@lru_cache()
+def get_tavily_client() -> TavilyClient:
+    """Tavily 검색 클라이언트 의존성 (앱 전체에서 하나의 세션 공유)"""
+    return TavilyClient(
+        api_key=settings.tavily_api_key,
+        pool_size=settings.tavily_pool_size,
+        pool_size_per_host=settings.tavily_pool_size_per_host,
+        dns_cache_ttl_seconds=settings.tavily_dns_cache_ttl_seconds,
+        keepalive_seconds=settings.tavily_keepalive_seconds,
+        connect_timeout_seconds=settings.tavily_connect_timeout_seconds,
+        read_timeout_seconds=settings.tavily_read_timeout_seconds,
+        cache=get_search_cache(),
+    )
+
+
+@lru_cache()
+def get_embedding_service() -> EmbeddingService:
+    """임베딩 서비스 의존성 (동시 요청 묶음 처리 + LRU)"""
+    backend: Embedder
+    if settings.embedding_backend == "openai":
+        backend = OpenAIEmbedder(
+            client=get_openai_client().client,
+            model=settings.embedding_model,
+            dim=settings.rag_embedding_dim,
+        )
+    else:
+        backend = HashingEmbedder(dim=settings.rag_embedding_dim)
+
+    return EmbeddingService(
+        backend=backend,
+        max_batch_size=settings.embedding_max_batch_size,
+        max_wait_ms=settings.embedding_max_wait_ms,
+        cache_size=settings.embedding_cache_size,
+        max_concurrent_batches=settings.embedding_max_concurrent_batches,
+    )
+
+
+@lru_cache()
+def get_document_retriever() -> DocumentRetriever:
+    """프로세스 내 RAG 인덱스 검색기 (인덱스는 시작 시 로드)"""
+    return DocumentRetriever(
+        embedder=get_embedding_service(),
+        index_dir=settings.rag_index_dir,
+        source_paths=settings.rag_source_paths,
+        chunker=MarkdownChunker(max_chars=settings.rag_chunk_max_chars),
+        mode=settings.rag_retrieval_mode,
+        dense_weight=settings.rag_dense_weight,
+        sparse_weight=settings.rag_sparse_weight,
+        rrf_k=settings.rag_rrf_k,
+        candidate_multiplier=settings.rag_candidate_multiplier,
+        compact_ratio=settings.rag_compact_ratio,
+        quantization=settings.rag_quantization,
+        pq_subspaces=settings.rag_pq_subspaces,
+        rerank_multiplier=settings.rag_rerank_multiplier,
+        ann_index=settings.rag_ann_index,
+        hnsw_m=settings.rag_hnsw_m,
+        hnsw_ef_construction=settings.rag_hnsw_ef_construction,
+        hnsw_ef_search=settings.rag_hnsw_ef_search,
+        hnsw_min_chunks=settings.rag_hnsw_min_chunks,
+        result_cache=(
+            RetrievalCache(max_bytes=settings.rag_result_cache_max_bytes)
+            if settings.rag_result_cache_enabled
+            else None
+        ),
+    )
+
+
+@lru_cache()
+def get_retrieval_batcher() -> RetrievalBatcher:
+    """retrieval 서버의 동시 검색 요청 묶음 처리기"""
+    return RetrievalBatcher(
+        get_document_retriever(),
+        max_batch_size=settings.rag_server_max_batch_size,
+        max_wait_ms=settings.rag_server_max_wait_ms,
+    )
+
+
+@lru_cache()
+def get_rag_retriever() -> Union[DocumentRetriever, RetrievalClient]:
+    """
+    RAG 문서 검색기 의존성
+
+    rag_server_url이 있으면 로컬 retrieval 서버 클라이언트 (인덱스를 프로세스마다 로드하지 않음),
+    없으면 프로세스 내 인덱스
+    """
+    if settings.rag_server_url:
+        return RetrievalClient(settings.rag_server_url, settings.rag_server_timeout_seconds)
+    return get_document_retriever()
 
 
 @lru_cache()
 def get_chat_service() -> ChatService:
     """채팅 서비스 의존성"""
     openai_client = get_openai_client()
-    return ChatService(openai_client=openai_client)
\ No newline at end of file
+    return ChatService(
+        openai_client=openai_client,
+        heartbeat_interval=settings.stream_heartbeat_seconds,
+        tavily_client=get_tavily_client(),
+        rag_retriever=get_rag_retriever(),
+    )
\ No newline at end of file
@@ -39,10 +39,168 @@ class Settings(BaseSettings):
     openai_temperature: float = 0.7
     openai_max_tokens: int = 2000
 
+    # Agent Model Policy (에이전트별 모델 티어 / 에스컬레이션)
+    # 지정하지 않은 에이전트는 openai_model / openai_max_tokens 사용
+    agent_model_policies: dict = {
+        "rag": {
+            "primary": {"model": "gpt-4o-mini", "max_tokens": 1000, "timeout_seconds": 20},
+            "escalation": {"model": "gpt-4", "max_tokens": 2000, "timeout_seconds": 60},
+        },
+        "search": {
+            "primary": {"model": "gpt-4o-mini", "max_tokens": 600, "timeout_seconds": 20},
+            "escalation": {"model": "gpt-4", "max_tokens": 1000, "timeout_seconds": 60},
+        },
+        "general": {
+            "primary": {"model": "gpt-4o-mini", "max_tokens": 1000, "timeout_seconds": 20},
+            "escalation": {"model": "gpt-4", "max_tokens": 2000, "timeout_seconds": 60},
+        },
+    }
+    complex_query_token_threshold: int = 150
+
+    # Supervisor 의도 분석 규칙 (에이전트 -> {키워드: 가중치}, 점수 합이 가장 큰 에이전트로 라우팅)
+    intent_rules: dict = {
+        "rag": {
+            "문서": 1.0, "api": 1.0, "가이드": 1.0, "매뉴얼": 1.0, "설명서": 1.0,
+            "사용법": 1.0, "찾아": 0.5, "검색": 0.5, "방법": 0.5, "어떻게": 0.5,
+        },
+        "code": {
+            "코드": 1.0, "실행": 1.0, "프로그램": 1.0, "계산": 1.0, "함수": 1.0,
+            "python": 0.5, "javascript": 0.5,
+        },
+        "search": {
+            "최신": 1.0, "뉴스": 1.0, "검색": 1.0, "인터넷": 1.0, "웹": 0.5,
+            "현재": 0.5, "오늘": 1.0, "요즘": 1.0, "트렌드": 1.0,
+        },
+    }
+    # 규칙 JSON 파일 (같은 형식, 설정되면 intent_rules 대신 사용하고 변경 시 자동 재로드)
+    intent_rules_path: str = ""
+    intent_rules_reload_seconds: float = 5.0
+    # 2순위 의도 점수가 1순위의 이 비율 이상이고 최소 점수 이상이면 다중 의도
+    intent_multi_agent_ratio: float = 0.6
+    intent_min_score: float = 1.0
+
+    # LLM Completion Cache (opt-in)
+    llm_cache_enabled: bool = False
+    llm_cache_path: str = "./.cache/llm_completions.sqlite3"
+    llm_cache_ttl_seconds: int = 86400
+    llm_cache_memory_entries: int = 1024
+
+    # 동일 LLM 요청 동시 호출 합치기 (single-flight)
+    llm_coalesce_requests: bool = True
+
+    # LLM Rate Limiter (RPM / TPM / 동시 실행 수)
+    llm_rate_limit_enabled: bool = True
+    llm_requests_per_minute: int = 500
+    llm_tokens_per_minute: int = 80000
+    llm_max_concurrency: int = 32
+    llm_min_concurrency: int = 2
+    llm_rate_limit_retries: int = 2
+    llm_transient_retries: int = 2  # 연결 오류 / 타임아웃 / 5xx 재시도 횟수
+
+    # LLM Hedged Requests (p 백분위 지연 초과 시 중복 요청, 추가 요청 비율 상한)
+    llm_hedging_enabled: bool = False
+    llm_hedging_percentile: float = 0.95
+    llm_hedging_max_ratio: float = 0.05
+
+    # OpenAI HTTP 커넥션 풀 (keep-alive, HTTP/2, 시작 시 예열, 종료 시 drain)
+    openai_http2: bool = True
+    openai_max_connections: int = 100
+    openai_max_keepalive_connections: int = 20
+    openai_keepalive_expiry_seconds: float = 60.0
+    openai_connect_timeout_seconds: float = 5.0
+    openai_read_timeout_seconds: float = 120.0
+    openai_warmup_connections: int = 4
+    openai_shutdown_drain_seconds: float = 10.0
+
+    # Tavily HTTP 세션 (커넥션 풀, DNS 캐시, 타임아웃)
+    tavily_pool_size: int = 20
+    tavily_pool_size_per_host: int = 10
+    tavily_dns_cache_ttl_seconds: int = 300
+    tavily_keepalive_seconds: float = 30.0
+    tavily_connect_timeout_seconds: float = 5.0
+    tavily_read_timeout_seconds: float = 15.0
+
+    # 웹 검색 결과 캐시 (질의 유형별 TTL, stale 기간 동안 즉시 반환 후 백그라운드 갱신)
+    search_cache_enabled: bool = True
+    search_cache_path: str = "./.cache/search_results.sqlite3"
+    search_cache_realtime_ttl_seconds: int = 900
+    search_cache_default_ttl_seconds: int = 21600
+    search_cache_evergreen_ttl_seconds: int = 604800
+    search_cache_stale_ratio: float = 1.0
+
+    # SearchAgent 하위 질의 병렬 검색 (동시 검색 수, 검색별 마감 시간)
+    search_max_sub_queries: int = 3
+    search_max_concurrency: int = 4
+    search_timeout_seconds: float = 4.0
+
+    # 검색 결과 요약 전 로컬 정리 (프롬프트 토큰 예산, 결과당 문장 수, 근사 중복 기준)
+    search_context_token_budget: int = 1500
+    search_sentences_per_result: int = 3
+    search_duplicate_threshold: float = 0.7
+
+    # 임베딩 (backend: "local" = 결정적 해싱 임베딩, "openai" = 임베딩 API)
+    embedding_backend: str = "local"
+    embedding_model: str = "text-embedding-3-small"
+    embedding_max_batch_size: int = 64
+    embedding_max_wait_ms: float = 5.0
+    embedding_cache_size: int = 10000
+    embedding_max_concurrent_batches: int = 4
+
+    # RAG 문서 검색 (프로세스 내 벡터 인덱스, mmap 파일로 워커 간 공유)
+    rag_source_paths: list = ["../README.md", "../../client/README.md"]
+    rag_index_dir: str = "./.cache/rag_index"
+    rag_embedding_dim: int = 384
+    rag_chunk_max_chars: int = 1200
+    rag_top_k: int = 5
+    # 검색 모드: dense / sparse(BM25) / hybrid(RRF 병합)
+    rag_retrieval_mode: str = "hybrid"
+    rag_dense_weight: float = 1.0
+    rag_sparse_weight: float = 1.0
+    rag_rrf_k: int = 60
+    rag_candidate_multiplier: int = 4
+    # 증분 수집: tombstone 행 비율이 이 값을 넘으면 인덱스 재배치
+    rag_compact_ratio: float = 0.3
+    # 벡터 압축 저장: none / int8 / pq (근사 점수로 k * rerank_multiplier개 후보 후 정확 재정렬)
+    rag_quantization: str = "none"
+    rag_pq_subspaces: int = 48
+    rag_rerank_multiplier: int = 10
+    # dense 검색 방식: flat(전수 탐색) / hnsw(그래프) / auto(청크 수가 rag_hnsw_min_chunks 이상이면 hnsw)
+    rag_ann_index: str = "auto"
+    rag_hnsw_m: int = 16
+    rag_hnsw_ef_construction: int = 100
+    rag_hnsw_ef_search: int = 64
+    rag_hnsw_min_chunks: int = 50000
+    # 검색 결과 캐시 (정규화 질의 + 인덱스 버전 키, 새 인덱스 버전 교체 시 무효화)
+    rag_result_cache_enabled: bool = True
+    rag_result_cache_max_bytes: int = 16 * 1024 * 1024
+    # 로컬 retrieval 서버 (python retrieval_server.py)
+    # rag_server_url이 있으면 채팅 앱은 인덱스를 직접 로드하지 않고 서버를 호출
+    # 예: "unix:///tmp/rag-retrieval.sock" 또는 "http://127.0.0.1:8100"
+    rag_server_url: str = ""
+    rag_server_timeout_seconds: float = 5.0
+    rag_server_socket: str = ""  # 서버 측: 설정되면 TCP 대신 Unix 도메인 소켓으로 listen
+    rag_server_host: str = "127.0.0.1"
+    rag_server_port: int = 8100
+    rag_server_max_batch_size: int = 32
+    rag_server_max_wait_ms: float = 2.0
+    # RAG 문서 컨텍스트 (모델별 토큰 예산, 근사 중복 청크 기준)
+    rag_context_default_token_budget: int = 3000
+    rag_context_token_budgets: dict = {"gpt-4": 3000, "gpt-4o": 8000, "gpt-4o-mini": 8000}
+    rag_context_duplicate_threshold: float = 0.8
+
     # Agent Settings
     max_message_length: int = 10000
     session_timeout_minutes: int = 30
 
+    # Conversation Context Window (모델별 대화 히스토리 토큰 예산)
+    context_default_token_budget: int = 2000
+    context_token_budgets: dict = {"gpt-4": 2000, "gpt-4o": 6000, "gpt-4o-mini": 6000}
+    context_summary_model: str = "gpt-4o-mini"
+    context_summary_max_tokens: int = 300
+
+    # Streaming Settings
+    stream_heartbeat_seconds: float = 10.0
+
     model_config = ConfigDict(
         env_file=str(Path(__file__).parent.parent.parent / ".env"),
         env_file_encoding="utf-8",
@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
 from typing import List, Dict, Any
 
 from domain.models.chat import ChatRequest, ChatResponse, ChatMessage
@@ -9,12 +10,23 @@ from utils.logger import logger
 
 router = APIRouter(prefix="/api/chat", tags=["Multi-Agent Chat"])
 
+# SSE 응답 헤더 (프록시 버퍼링 방지)
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "Connection": "keep-alive",
+    "X-Accel-Buffering": "no",
+}
+
 
 @router.post("/", response_model=ChatResponse)
 async def chat(
     request: ChatRequest, chat_service: ChatService = Depends(get_chat_service)
 ) -> ChatResponse:
 
+    # stream 요청은 스트리밍 엔드포인트와 동일하게 처리
+    if request.stream:
+        return await chat_stream(request, chat_service)
+
     try:
         logger.info(f"Chat Request - Session: {request.session_id}")
 
@@ -31,6 +43,23 @@ async def chat(
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 
+@router.post("/stream")
+async def chat_stream(
+    request: ChatRequest, chat_service: ChatService = Depends(get_chat_service)
+) -> StreamingResponse:
+    """
+    스트리밍 채팅 (Server-Sent Events)
+    token / status / heartbeat / done 이벤트를 순서대로 전송
+    """
+    logger.info(f"Chat Stream Request - Session: {request.session_id}")
+
+    return StreamingResponse(
+        chat_service.chat_stream(request),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS,
+    )
+
+
 @router.get("/history/{session_id}", response_model=List[ChatMessage])
 async def get_chat_history(
     session_id: str, chat_service: ChatService = Depends(get_chat_service)
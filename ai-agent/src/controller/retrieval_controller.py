@@ -0,0 +1,57 @@
+import time
+
+from fastapi import APIRouter, Depends
+
+from config.dependencies import get_document_retriever, get_retrieval_batcher
+from domain.models.document import RetrievalRequest, RetrievalResponse
+from service.rag.retrieval_batcher import RetrievalBatcher
+from service.rag.retriever import DocumentRetriever
+
+
+router = APIRouter(prefix="/api/retrieval", tags=["retrieval"])
+
+
+@router.post("/search", response_model=RetrievalResponse)
+async def search(
+    request: RetrievalRequest,
+    batcher: RetrievalBatcher = Depends(get_retrieval_batcher),
+    retriever: DocumentRetriever = Depends(get_document_retriever),
+):
+    """
+    문서 검색 (동시 요청은 필터별로 묶어 행렬 곱 한 번으로 처리)
+    """
+    start = time.monotonic()
+    results = await batcher.retrieve(request.query, request.k, request.filters)
+    return RetrievalResponse(
+        results=results,
+        index_version=retriever.index.version if retriever.index else 0,
+        latency_ms=(time.monotonic() - start) * 1000,
+    )
+
+
+@router.post("/refresh")
+async def refresh(retriever: DocumentRetriever = Depends(get_document_retriever)):
+    """
+    소스 문서 변경분 재수집 (새 버전 인덱스로 교체)
+    """
+    stats = await retriever.refresh()
+    return {
+        "index_version": retriever.index.version if retriever.index else 0,
+        "ingestion": stats.model_dump(),
+    }
+
+
+@router.get("/health")
+async def health(retriever: DocumentRetriever = Depends(get_document_retriever)):
+    return {
+        "status": "healthy" if retriever.index is not None else "initializing",
+        "index_version": retriever.index.version if retriever.index else 0,
+    }
+
+
+@router.get("/stats")
+async def stats(
+    batcher: RetrievalBatcher = Depends(get_retrieval_batcher),
+    retriever: DocumentRetriever = Depends(get_document_retriever),
+):
+    return {**retriever.get_stats(), "batching": batcher.get_stats()}
@@ -1,6 +1,6 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from enum import Enum
-from typing import List, Optional, Dict
+from typing import List, Optional, Dict, Callable
 
 class AgentType(str, Enum):
     "에이전트 타입"
@@ -41,11 +41,27 @@ class Classification(BaseModel):
     reasoning: str
     
 
+class ModelTier(BaseModel):
+    """모델 티어 설정"""
+    model: str
+    max_tokens: Optional[int] = None
+    timeout_seconds: Optional[float] = None
+
+
+class ModelPolicy(BaseModel):
+    """에이전트별 모델 정책 (빠른 모델로 시작, 필요 시 상위 모델로 에스컬레이션)"""
+    primary: ModelTier
+    escalation: Optional[ModelTier] = None
+    min_response_chars: int = 20  # 이보다 짧은 응답은 검증 실패로 간주
+
+
 class AgentRequest(BaseModel):
     """에이전트 요청시 모델"""
     query: str
     context: Optional[Dict] = None
     session_id: Optional[str] = None
+    # 스트리밍 모드에서 생성 토큰을 전달받는 콜백 (직렬화 제외)
+    on_token: Optional[Callable[[str], None]] = Field(default=None, exclude=True)
 
 class AgentResponse(BaseModel):
     """에이전트 응답시 사용되는 모델"""
@@ -1,6 +1,7 @@
 from pydantic import BaseModel, Field
-from typing import Optional, List, Dict
+from typing import Any, Optional, List, Dict
 from datetime import datetime
+from utils.token_counter import count_tokens, MESSAGE_OVERHEAD_TOKENS
 import uuid
 
 
@@ -12,6 +13,13 @@ class ChatMessage(BaseModel):
     agent_type: Optional[str] = None
     metadata: Dict = Field(default_factory=dict)
     timestamp: datetime = Field(default_factory=datetime.now)
+    token_count: Optional[int] = None  # 메시지 토큰 수 캐시 (role 오버헤드 포함)
+
+    def get_token_count(self) -> int:
+        """메시지 토큰 수 (최초 계산 후 메시지에 캐시)"""
+        if self.token_count is None:
+            self.token_count = count_tokens(self.content) + MESSAGE_OVERHEAD_TOKENS
+        return self.token_count
 
     def validate_content(self):
         """기본적인 예외처리"""
@@ -32,6 +40,8 @@ class ChatRequest(BaseModel):
     message: str
     session_id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     stream: bool = False
+    # RAG 검색 메타데이터 필터 (예: {"path": "server/*", "language": "java"})
+    filters: Optional[Dict[str, Any]] = None
 
 
 class ChatResponse(BaseModel):
@@ -42,6 +52,25 @@ class ChatResponse(BaseModel):
     metadata: Dict = Field(default_factory=dict)
 
 
+class ConversationWindow(BaseModel):
+    """토큰 예산 안에 맞춘 대화 컨텍스트"""
+    messages: List[ChatMessage] = Field(default_factory=list)
+    summary: Optional[str] = None  # 예산 밖으로 밀려난 이전 대화 요약
+    token_count: int = 0
+    token_budget: int = 0
+    summarized_count: int = 0
+
+    def to_prompt(self) -> str:
+        """프롬프트에 넣을 대화 텍스트"""
+        parts = []
+        if self.summary:
+            parts.append(f"[이전 대화 요약]\n{self.summary}")
+        if self.messages:
+            lines = [f"{message.role}: {message.content}" for message in self.messages]
+            parts.append("[최근 대화]\n" + "\n".join(lines))
+        return "\n\n".join(parts)
+
+
 class Conversation(BaseModel):
     session_id: str
     messages: List[ChatMessage] = Field(default_factory=list)
@@ -0,0 +1,34 @@
+from pydantic import BaseModel, Field
+from typing import Any, Dict, List, Optional
+
+
+class DocumentChunk(BaseModel):
+    """검색 단위로 나눈 문서 조각"""
+    chunk_id: str               # "{doc_id}#{position}"
+    doc_id: str                 # 원본 문서 식별자 (상대 경로)
+    title: str
+    section: str = ""           # 헤딩 경로 (예: "설치 > 환경 변수")
+    content: str
+    position: int = 0           # 문서 내 순서
+    content_hash: str = ""      # 임베딩 입력 해시 (변경되지 않은 청크는 재임베딩 생략)
+    metadata: Dict[str, Any] = Field(default_factory=dict)
+
+
+class RetrievedChunk(BaseModel):
+    """검색된 문서 조각과 점수"""
+    chunk: DocumentChunk
+    score: float
+
+
+class RetrievalRequest(BaseModel):
+    """retrieval 서버 검색 요청"""
+    query: str
+    k: int = Field(default=5, ge=1, le=100)
+    filters: Optional[Dict[str, Any]] = None
+
+
+class RetrievalResponse(BaseModel):
+    """retrieval 서버 검색 응답"""
+    results: List[RetrievedChunk] = Field(default_factory=list)
+    index_version: int = 0
+    latency_ms: float = 0.0
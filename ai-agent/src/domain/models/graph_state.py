@@ -10,6 +10,11 @@ class GraphState(BaseModel):
     query: str = Field(description="사용자 질문")
     session_id: str = Field(description="세션 ID")
 
+    # RAG 검색 메타데이터 필터 (필드 -> 값 / 값 목록, '*'로 끝나면 접두사 일치)
+    filters: Dict[str, Any] = Field(
+        default_factory=dict, description="문서 검색 필터"
+    )
+
     # 대화 히스토리
     history: List[ChatMessage] = Field(
         default_factory=list, description="대화 히스토리"
@@ -42,6 +47,7 @@ class GraphState(BaseModel):
         default=False, description="다중 에이전트 필요 여부"
     )
     is_complete: bool = Field(default=False, description="처리 완료 여부")
+    stream: bool = Field(default=False, description="토큰 스트리밍 여부")
     needs_human_review: bool = Field(default=False, description="인간 검토 필요 여부")
 
     class Config:
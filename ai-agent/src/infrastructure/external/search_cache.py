@@ -0,0 +1,265 @@
+"""
+Freshness-aware persistent cache for web search results
+"""
+import asyncio
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel
+
+from utils.logger import logger
+
+
+# 실시간성이 중요한 질의 (짧은 TTL)
+REALTIME_QUERY_PATTERN = re.compile(
+    r"(오늘|지금|현재|최신|최근|속보|뉴스|실시간|이번\s?주|어제|요즘|"
+    r"\b(?:today|now|latest|recent|breaking|news|current|this week|yesterday|price|score)\b)",
+    re.IGNORECASE,
+)
+
+# 시간이 지나도 답이 잘 변하지 않는 질의 (긴 TTL)
+EVERGREEN_QUERY_PATTERN = re.compile(
+    r"(이란|란\s?무엇|뜻|정의|개념|원리|사용법|방법|튜토리얼|예제|문법|차이|"
+    r"\b(?:what is|definition|meaning|how to|tutorial|example|syntax|difference|guide)\b)",
+    re.IGNORECASE,
+)
+
+# 질의 정규화 시 제거할 문자 (문장부호, 따옴표 등 / 버전 번호의 점은 유지)
+_PUNCTUATION = re.compile(r"[?!,;:'\"`~()\[\]{}<>？！。、]+|(?<!\d)\.|\.(?!\d)")
+
+
+class CachedSearch(BaseModel):
+    """캐시 조회 결과"""
+    results: List[Dict[str, Any]]
+    fresh: bool
+    age_seconds: float
+
+
+class SearchCache:
+    """
+    웹 검색 결과 캐시 (SQLite)
+
+    - 키: 정규화된 질의 + search_depth + max_results
+    - TTL: 질의 유형(실시간 / 일반 / 상시)과 결과의 published_date로 결정
+      (최근 발행된 결과가 섞여 있으면 짧게, 모두 오래된 결과면 길게)
+    - fresh 기간이 지나도 stale 기간 동안은 결과를 반환하고
+      호출자가 백그라운드에서 갱신 (stale-while-revalidate)
+    - 디스크 오류는 미스 / 쓰기 생략으로 처리하고, close() 후에 다시 쓰이면 연결을 새로 엶
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        realtime_ttl_seconds: float = 900,
+        default_ttl_seconds: float = 21600,
+        evergreen_ttl_seconds: float = 604800,
+        stale_ratio: float = 1.0,
+    ):
+        self.db_path = db_path
+        self.realtime_ttl_seconds = realtime_ttl_seconds
+        self.default_ttl_seconds = default_ttl_seconds
+        self.evergreen_ttl_seconds = evergreen_ttl_seconds
+        self.stale_ratio = stale_ratio
+
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = self._connect()
+
+        self.fresh_hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.writes = 0
+
+        logger.info(f"Search cache initialized: {db_path}")
+
+    def _connect(self) -> sqlite3.Connection:
+        """SQLite 연결 및 스키마 생성"""
+        directory = os.path.dirname(self.db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=5.0)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS search_results (
+                key TEXT PRIMARY KEY,
+                query TEXT NOT NULL,
+                results TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                fresh_until REAL NOT NULL,
+                stale_until REAL NOT NULL
+            )
+            """
+        )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_search_results_stale ON search_results(stale_until)"
+        )
+        conn.commit()
+        return conn
+
+    @staticmethod
+    def normalize_query(query: str) -> str:
+        """대소문자, 전각/반각, 문장부호, 공백 차이를 없앤 질의"""
+        normalized = unicodedata.normalize("NFKC", query).lower()
+        normalized = _PUNCTUATION.sub(" ", normalized)
+        return " ".join(normalized.split())
+
+    @classmethod
+    def make_key(cls, query: str, search_depth: str, max_results: int) -> str:
+        raw = json.dumps(
+            {
+                "query": cls.normalize_query(query),
+                "search_depth": search_depth,
+                "max_results": max_results,
+            },
+            ensure_ascii=False,
+            sort_keys=True,
+        )
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def compute_ttl(self, query: str, results: List[Dict[str, Any]]) -> float:
+        """질의 유형과 결과 발행일로 fresh TTL(초) 결정"""
+        if REALTIME_QUERY_PATTERN.search(query):
+            return self.realtime_ttl_seconds
+
+        ttl = (
+            self.evergreen_ttl_seconds
+            if EVERGREEN_QUERY_PATTERN.search(query)
+            else self.default_ttl_seconds
+        )
+
+        newest_age = self._newest_result_age(results)
+        if newest_age is None:
+            return ttl
+
+        # 발행된 지 얼마 안 된 결과가 있으면 그 나이만큼만 유지 (빠르게 바뀌는 주제)
+        if newest_age < 2 * 86400:
+            return max(self.realtime_ttl_seconds, min(ttl, newest_age / 2))
+        # 모든 결과가 1년 이상 된 자료면 상시 질의로 취급
+        if newest_age > 365 * 86400:
+            return max(ttl, self.evergreen_ttl_seconds)
+        return ttl
+
+    @staticmethod
+    def _newest_result_age(results: List[Dict[str, Any]]) -> Optional[float]:
+        """가장 최근 published_date 기준 경과 시간 (초, 날짜가 없으면 None)"""
+        now = datetime.now(timezone.utc)
+        ages = []
+        for result in results:
+            published = result.get("published_date")
+            if not published:
+                continue
+            try:
+                parsed = datetime.fromisoformat(str(published).replace("Z", "+00:00"))
+            except ValueError:
+                # Tavily 뉴스 결과는 RFC 1123 형식 ("Thu, 13 Jun 2024 10:00:43 GMT")
+                try:
+                    parsed = parsedate_to_datetime(str(published))
+                except (TypeError, ValueError):
+                    continue
+            if parsed.tzinfo is None:
+                parsed = parsed.replace(tzinfo=timezone.utc)
+            ages.append(max((now - parsed).total_seconds(), 0.0))
+        return min(ages) if ages else None
+
+    async def get(self, key: str) -> Optional[CachedSearch]:
+        """캐시 조회 (stale 기간이 지난 항목은 None)"""
+        try:
+            row = await asyncio.to_thread(self._disk_get, key)
+            if row is not None:
+                results, created_at, fresh_until = row
+                results = json.loads(results)
+        except (sqlite3.Error, OSError, ValueError) as e:
+            logger.warning(f"Search cache read failed: {e}")
+            row = None
+        if row is None:
+            self.misses += 1
+            return None
+
+        now = time.time()
+        fresh = now < fresh_until
+        if fresh:
+            self.fresh_hits += 1
+        else:
+            self.stale_hits += 1
+
+        return CachedSearch(results=results, fresh=fresh, age_seconds=now - created_at)
+
+    async def set(self, key: str, query: str, results: List[Dict[str, Any]]):
+        """검색 결과 저장 (TTL은 질의와 결과로 계산)"""
+        ttl = self.compute_ttl(query, results)
+        try:
+            await asyncio.to_thread(self._disk_set, key, query, results, ttl)
+        except (sqlite3.Error, OSError, TypeError, ValueError) as e:
+            # 캐시 쓰기 실패로 검색이 실패하지 않도록 건너뜀
+            logger.warning(f"Search cache write skipped: {e}")
+            return
+        self.writes += 1
+
+    def _connection(self) -> sqlite3.Connection:
+        """현재 연결 (close() 이후면 다시 연결, self._lock 안에서 호출)"""
+        if self._conn is None:
+            self._conn = self._connect()
+        return self._conn
+
+    def _disk_get(self, key: str) -> Optional[tuple]:
+        with self._lock:
+            cursor = self._connection().execute(
+                "SELECT results, created_at, fresh_until FROM search_results "
+                "WHERE key = ? AND stale_until > ?",
+                (key, time.time()),
+            )
+            return cursor.fetchone()
+
+    def _disk_set(self, key: str, query: str, results: List[Dict[str, Any]], ttl: float):
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            try:
+                conn.execute(
+                    "INSERT OR REPLACE INTO search_results "
+                    "(key, query, results, created_at, fresh_until, stale_until) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (
+                        key,
+                        query,
+                        json.dumps(results, ensure_ascii=False),
+                        now,
+                        now + ttl,
+                        now + ttl * (1 + self.stale_ratio),
+                    ),
+                )
+                conn.execute("DELETE FROM search_results WHERE stale_until <= ?", (now,))
+                conn.commit()
+            except sqlite3.OperationalError as e:
+                conn.rollback()
+                logger.warning(f"Search cache write skipped: {e}")
+
+    def close(self):
+        """SQLite 연결 종료 (lru_cache로 공유되는 인스턴스이므로 이후 호출 시 다시 연결)"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """캐시 히트/미스 통계"""
+        lookups = self.fresh_hits + self.stale_hits + self.misses
+        return {
+            "fresh_hits": self.fresh_hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "writes": self.writes,
+            "hit_rate": (self.fresh_hits + self.stale_hits) / lookups if lookups else 0.0,
+            "db_path": self.db_path,
+        }
@@ -1,9 +1,11 @@
 """
 Tavily Search API Client
 """
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Any
 import aiohttp
+import asyncio
 import os
+from infrastructure.external.search_cache import SearchCache
 from utils.logger import logger
 
 
@@ -13,47 +15,188 @@ class TavilyClient:
     
     책임:
     - Tavily API 호출만 담당
+    - 하나의 장기 세션(커넥션 풀 + DNS 캐시)을 재사용해 검색마다
+      커넥터 생성, DNS 조회, TLS 핸드셰이크 비용이 들지 않도록 함
+    - (선택) 검색 결과 캐시: 만료된(stale) 결과는 즉시 반환하고 백그라운드에서 갱신
     """
     
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        base_url: str = "https://api.tavily.com",
+        pool_size: int = 20,
+        pool_size_per_host: int = 10,
+        dns_cache_ttl_seconds: int = 300,
+        keepalive_seconds: float = 30.0,
+        connect_timeout_seconds: float = 5.0,
+        read_timeout_seconds: float = 15.0,
+        cache: Optional[SearchCache] = None
+    ):
         self.api_key = api_key or os.getenv("TAVILY_API_KEY")
-        self.base_url = "https://api.tavily.com"
+        self.base_url = base_url.rstrip("/")
+        
+        self.pool_size = pool_size
+        self.pool_size_per_host = pool_size_per_host
+        self.dns_cache_ttl_seconds = dns_cache_ttl_seconds
+        self.keepalive_seconds = keepalive_seconds
+        self.timeout = aiohttp.ClientTimeout(
+            total=None,
+            connect=connect_timeout_seconds,
+            sock_read=read_timeout_seconds
+        )
+        
+        self._session: Optional[aiohttp.ClientSession] = None
+        
+        self.cache = cache
+        # 캐시 키 -> 진행 중인 백그라운드 갱신 작업
+        self._refreshing: Dict[str, asyncio.Task] = {}
+    
+    async def start(self):
+        """세션 생성 (앱 시작 시 호출, 이미 열려 있으면 무시)"""
+        if self._session is not None and not self._session.closed:
+            return
+        
+        connector = aiohttp.TCPConnector(
+            limit=self.pool_size,
+            limit_per_host=self.pool_size_per_host,
+            ttl_dns_cache=self.dns_cache_ttl_seconds,
+            keepalive_timeout=self.keepalive_seconds
+        )
+        self._session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=self.timeout
+        )
+        logger.info(
+            f"Tavily session opened (pool={self.pool_size}, "
+            f"per_host={self.pool_size_per_host})"
+        )
+    
+    async def close(self):
+        """세션 종료 (앱 종료 시 호출)"""
+        for task in list(self._refreshing.values()):
+            task.cancel()
+        if self._refreshing:
+            await asyncio.gather(*self._refreshing.values(), return_exceptions=True)
+        
+        if self.cache:
+            self.cache.close()
+        
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+    
+    async def _get_session(self) -> aiohttp.ClientSession:
+        # start() 없이 사용하는 경우(스크립트 등)에도 동작하도록 지연 생성
+        if self._session is None or self._session.closed:
+            await self.start()
+        return self._session
     
     async def search(
         self,
         query: str,
         max_results: int = 5,
-        search_depth: str = "basic"
+        search_depth: str = "basic",
+        mock_on_error: bool = True
     ) -> List[Dict]:
-        """웹 검색"""
+        """
+        웹 검색
+        
+        Args:
+            mock_on_error: API 오류 시 Mock 결과 대신 빈 목록을 받으려면 False
+        """
         if not self.api_key:
             logger.warning("Tavily API key not provided, using mock data")
             return self._get_mock_results(query)
         
+        if self.cache is None:
+            results = await self._fetch(query, max_results, search_depth)
+        else:
+            results = await self._cached_fetch(query, max_results, search_depth)
+        
+        if results is None:
+            return self._get_mock_results(query) if mock_on_error else []
+        return self._format_results(results)
+    
+    async def _cached_fetch(
+        self,
+        query: str,
+        max_results: int,
+        search_depth: str
+    ) -> Optional[List[Dict[str, Any]]]:
+        """캐시 조회 후 미스면 API 호출, stale이면 즉시 반환 + 백그라운드 갱신"""
+        key = SearchCache.make_key(query, search_depth, max_results)
+        cached = await self.cache.get(key)
+        
+        if cached is not None:
+            if not cached.fresh:
+                self._schedule_refresh(key, query, max_results, search_depth)
+            return cached.results
+        
+        return await self._fetch_and_store(key, query, max_results, search_depth)
+    
+    def _schedule_refresh(self, key: str, query: str, max_results: int, search_depth: str):
+        """같은 키에 대한 갱신은 한 번만 진행"""
+        if key in self._refreshing:
+            return
+        
+        task = asyncio.create_task(
+            self._fetch_and_store(key, query, max_results, search_depth)
+        )
+        self._refreshing[key] = task
+        task.add_done_callback(lambda _: self._refreshing.pop(key, None))
+        logger.debug(f"Revalidating stale search results: {query}")
+    
+    async def _fetch_and_store(
+        self,
+        key: str,
+        query: str,
+        max_results: int,
+        search_depth: str
+    ) -> Optional[List[Dict[str, Any]]]:
+        results = await self._fetch(query, max_results, search_depth)
+        # 실패 응답(None)이나 빈 결과는 캐시하지 않음
+        if results:
+            await self.cache.set(key, query, results)
+        return results
+    
+    async def _fetch(
+        self,
+        query: str,
+        max_results: int,
+        search_depth: str
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Tavily API 호출 (원본 결과 반환, 실패 시 None)"""
         try:
-            async with aiohttp.ClientSession() as session:
-                payload = {
-                    "api_key": self.api_key,
-                    "query": query,
-                    "search_depth": search_depth,
-                    "max_results": max_results,
-                    "include_answer": True,
-                    "include_images": False
-                }
-                
-                async with session.post(
-                    f"{self.base_url}/search",
-                    json=payload
-                ) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        return self._format_results(data.get("results", []))
-                    else:
-                        logger.error(f"Tavily API error: {response.status}")
-                        return self._get_mock_results(query)
+            session = await self._get_session()
+            payload = {
+                "api_key": self.api_key,
+                "query": query,
+                "search_depth": search_depth,
+                "max_results": max_results,
+                "include_answer": True,
+                "include_images": False
+            }
+            
+            async with session.post(
+                f"{self.base_url}/search",
+                json=payload
+            ) as response:
+                if response.status == 200:
+                    data = await response.json()
+                    return data.get("results", [])
+                else:
+                    logger.error(f"Tavily API error: {response.status}")
+                    return None
         except Exception as e:
-            logger.error(f"Tavily search error: {e}")
-            return self._get_mock_results(query)
+            logger.error(f"Tavily search error: {e!r}")
+            return None
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """캐시 및 백그라운드 갱신 통계"""
+        return {
+            "cache": self.cache.get_stats() if self.cache else None,
+            "refreshing": len(self._refreshing)
+        }
     
     def _format_results(self, results: List[Dict]) -> List[Dict]:
         """검색 결과 포맷팅"""
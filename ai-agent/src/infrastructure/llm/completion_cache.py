@@ -0,0 +1,196 @@
+"""
+Two-tier LLM completion cache
+"""
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from enum import Enum
+from typing import Any, Dict, Optional
+
+from utils.cache import TTLCache
+from utils.logger import logger
+
+
+class CachePolicy(str, Enum):
+    """호출 단위 캐시 정책"""
+    AUTO = "auto"        # temperature == 0 인 결정적 호출만 캐시
+    ALWAYS = "always"    # temperature와 무관하게 캐시 허용
+    BYPASS = "bypass"    # 캐시 조회/저장 모두 생략
+
+    def allows(self, temperature: float) -> bool:
+        if self == CachePolicy.BYPASS:
+            return False
+        if self == CachePolicy.ALWAYS:
+            return True
+        return temperature == 0.0
+
+
+class CompletionCache:
+    """
+    LLM 응답 캐시
+
+    구조:
+    - 1차: 프로세스 메모리 LRU (TTL)
+    - 2차: SQLite 파일 (WAL 모드) - 재시작 후에도 유지되고
+      여러 uvicorn 워커 프로세스가 같은 파일을 공유
+
+    SQLite 접근은 블로킹이므로 스레드에서 실행하여 이벤트 루프를 막지 않음
+    디스크 오류는 미스 / 쓰기 생략으로 처리하고, close() 후에 다시 쓰이면 연결을 새로 엶
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        ttl_seconds: float = 86400,
+        max_memory_entries: int = 1024,
+    ):
+        self.db_path = db_path
+        self.ttl_seconds = ttl_seconds
+        self.memory = TTLCache(max_entries=max_memory_entries, ttl_seconds=ttl_seconds)
+
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = self._connect()
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.writes = 0
+
+        logger.info(f"Completion cache initialized: {db_path}")
+
+    def _connect(self) -> sqlite3.Connection:
+        """SQLite 연결 및 스키마 생성"""
+        directory = os.path.dirname(self.db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=5.0)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS completions (
+                key TEXT PRIMARY KEY,
+                model TEXT NOT NULL,
+                value TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                expires_at REAL NOT NULL
+            )
+            """
+        )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_completions_expires ON completions(expires_at)"
+        )
+        conn.commit()
+        return conn
+
+    @staticmethod
+    def make_key(
+        model: str,
+        system_prompt: Optional[str],
+        prompt: str,
+        temperature: float,
+        max_tokens: Optional[int],
+    ) -> str:
+        """모델, 프롬프트, 샘플링 파라미터로 캐시 키 생성"""
+        raw = json.dumps(
+            {
+                "model": model,
+                "system_prompt": system_prompt or "",
+                "prompt": prompt,
+                "temperature": temperature,
+                "max_tokens": max_tokens,
+            },
+            ensure_ascii=False,
+            sort_keys=True,
+        )
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    async def get(self, key: str) -> Optional[str]:
+        """캐시 조회 (메모리 -> 디스크 순)"""
+        value = self.memory.get(key)
+        if value is not None:
+            self.memory_hits += 1
+            return value
+
+        try:
+            row = await asyncio.to_thread(self._disk_get, key)
+        except (sqlite3.Error, OSError) as e:
+            logger.warning(f"Completion cache read failed: {e}")
+            row = None
+        if row is None:
+            self.misses += 1
+            return None
+
+        value, expires_at = row
+        # 디스크 히트는 남은 TTL만큼 메모리로 승격
+        self.memory.set(key, value, ttl_seconds=max(expires_at - time.time(), 0))
+        self.disk_hits += 1
+        return value
+
+    async def set(self, key: str, model: str, value: str):
+        """캐시 저장 (메모리 + 디스크)"""
+        self.memory.set(key, value)
+        try:
+            await asyncio.to_thread(self._disk_set, key, model, value)
+        except (sqlite3.Error, OSError) as e:
+            # 캐시 쓰기 실패로 요청이 실패하지 않도록 건너뜀
+            logger.warning(f"Completion cache write skipped: {e}")
+            return
+        self.writes += 1
+
+    def _connection(self) -> sqlite3.Connection:
+        """현재 연결 (close() 이후면 다시 연결, self._lock 안에서 호출)"""
+        if self._conn is None:
+            self._conn = self._connect()
+        return self._conn
+
+    def _disk_get(self, key: str) -> Optional[tuple]:
+        with self._lock:
+            cursor = self._connection().execute(
+                "SELECT value, expires_at FROM completions WHERE key = ? AND expires_at > ?",
+                (key, time.time()),
+            )
+            return cursor.fetchone()
+
+    def _disk_set(self, key: str, model: str, value: str):
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            try:
+                conn.execute(
+                    "INSERT OR REPLACE INTO completions "
+                    "(key, model, value, created_at, expires_at) VALUES (?, ?, ?, ?, ?)",
+                    (key, model, value, now, now + self.ttl_seconds),
+                )
+                # 만료 항목은 쓰기 시점에 정리
+                conn.execute("DELETE FROM completions WHERE expires_at <= ?", (now,))
+                conn.commit()
+            except sqlite3.OperationalError as e:
+                # 다른 워커가 잠금을 잡고 있는 경우 캐시 쓰기는 건너뜀
+                conn.rollback()
+                logger.warning(f"Completion cache write skipped: {e}")
+
+    def close(self):
+        """SQLite 연결 종료 (lru_cache로 공유되는 인스턴스이므로 이후 호출 시 다시 연결)"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """캐시 히트/미스 통계"""
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "writes": self.writes,
+            "hit_rate": (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0,
+            "memory_entries": len(self.memory),
+            "db_path": self.db_path,
+        }
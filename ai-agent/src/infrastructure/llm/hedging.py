@@ -0,0 +1,147 @@
+"""
+Hedged requests for LLM tail-latency reduction
+"""
+import asyncio
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, TypeVar
+
+from utils.logger import logger
+
+
+T = TypeVar("T")
+
+
+class LatencyTracker:
+    """모델별 최근 지연 시간 기록 및 백분위 계산"""
+
+    def __init__(self, window: int = 200, min_samples: int = 20):
+        self.window = window
+        self.min_samples = min_samples
+        self._samples: Dict[str, Deque[float]] = {}
+
+    def record(self, model: str, seconds: float):
+        self._samples.setdefault(model, deque(maxlen=self.window)).append(seconds)
+
+    def percentile(self, model: str, p: float) -> Optional[float]:
+        """p 백분위 지연 (표본이 부족하면 None)"""
+        samples = self._samples.get(model)
+        if not samples or len(samples) < self.min_samples:
+            return None
+        ordered = sorted(samples)
+        return ordered[min(int(len(ordered) * p), len(ordered) - 1)]
+
+
+class RequestHedger:
+    """
+    헤지 요청 실행기
+
+    - 호출이 모델별 최근 지연의 p 백분위를 넘기면 같은 요청을 한 번 더 보냄
+    - 먼저 성공한 결과를 사용하고 나머지는 취소
+    - 추가 요청 비율은 예산으로 제한: 요청마다 max_hedge_ratio 만큼 예산이 쌓이고
+      헤지 1회에 1을 소모 (예: 0.05 -> 장기적으로 요청의 5% 이하만 헤지)
+    - reserve_hedge가 주어지면 헤지 직전에 호출해 실행 권한(rate limit 등)을 확보
+      여유가 없으면(None) 헤지하지 않고, 확보했으면 반환된 콜백을 헤지 작업 종료 시 호출
+    """
+
+    def __init__(
+        self,
+        percentile: float = 0.95,
+        window: int = 200,
+        min_samples: int = 20,
+        max_hedge_ratio: float = 0.05,
+        max_budget: float = 10.0,
+        min_delay_seconds: float = 0.05,
+    ):
+        self.percentile = percentile
+        self.tracker = LatencyTracker(window=window, min_samples=min_samples)
+        self.max_hedge_ratio = max_hedge_ratio
+        self.max_budget = max_budget
+        self.min_delay_seconds = min_delay_seconds
+
+        self._budget = 0.0
+
+        self.requests = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+        self.hedge_skipped = 0  # 지연이 길었지만 실행 권한 여유가 없어 헤지하지 않은 수
+
+    async def run(
+        self,
+        model: str,
+        fn: Callable[[], Awaitable[T]],
+        reserve_hedge: Optional[Callable[[], Optional[Callable[[asyncio.Task], None]]]] = None,
+    ) -> T:
+        """fn()을 실행하고 지연이 길어지면 헤지 요청을 보냄"""
+        self.requests += 1
+        self._budget = min(self.max_budget, self._budget + self.max_hedge_ratio)
+
+        threshold = self.tracker.percentile(model, self.percentile)
+        primary = asyncio.create_task(self._timed(model, fn))
+
+        # 표본이 충분히 쌓이기 전에는 헤지하지 않음
+        if threshold is None:
+            return await primary
+
+        delay = max(threshold, self.min_delay_seconds)
+        tasks = {primary}
+
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if done:
+                return primary.result()
+
+            if self._budget < 1.0:
+                return await primary
+
+            on_hedge_done = reserve_hedge() if reserve_hedge is not None else None
+            if reserve_hedge is not None and on_hedge_done is None:
+                self.hedge_skipped += 1
+                return await primary
+
+            self._budget -= 1.0
+            self.hedged += 1
+            hedge = asyncio.create_task(self._timed(model, fn))
+            if on_hedge_done is not None:
+                # 시작 전에 취소되어도 호출되도록 작업 완료 콜백으로 권한 반환
+                hedge.add_done_callback(on_hedge_done)
+            tasks.add(hedge)
+            logger.debug(f"Hedging {model} request after {delay * 1000:.0f}ms")
+
+            # 먼저 성공한 결과 사용 (하나가 실패하면 나머지를 기다림)
+            pending = tasks
+            error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            self.hedge_wins += 1
+                        return task.result()
+                    error = task.exception()
+            raise error
+
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    async def _timed(self, model: str, fn: Callable[[], Awaitable[T]]) -> T:
+        """성공한 호출의 지연만 기록 (취소/실패는 제외)"""
+        start = time.monotonic()
+        result = await fn()
+        self.tracker.record(model, time.monotonic() - start)
+        return result
+
+    def get_stats(self) -> Dict[str, Any]:
+        """헤지 통계"""
+        return {
+            "requests": self.requests,
+            "hedged": self.hedged,
+            "hedge_wins": self.hedge_wins,
+            "hedge_skipped": self.hedge_skipped,
+            "hedge_ratio": self.hedged / self.requests if self.requests else 0.0,
+            "budget": round(self._budget, 2),
+        }
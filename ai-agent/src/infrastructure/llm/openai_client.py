@@ -1,10 +1,58 @@
 """
 OpenAI API Client
 """
-from openai import AsyncOpenAI
-from typing import Optional, AsyncIterator
+from openai import AsyncOpenAI, APIConnectionError, InternalServerError, RateLimitError
+from typing import Optional, AsyncIterator, Callable, Dict, Any
+import asyncio
 import os
+import httpx
+from infrastructure.llm.completion_cache import CompletionCache, CachePolicy
+from infrastructure.llm.single_flight import SingleFlight
+from infrastructure.llm.hedging import RequestHedger
+from infrastructure.llm.rate_limiter import (
+    RateLimiter, RateLimitPermit, Priority, UNLIMITED_PERMIT
+)
 from utils.logger import logger
+from utils.token_counter import count_tokens
+
+try:
+    import h2  # noqa: F401  httpx HTTP/2 지원에 필요
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# SDK 기본 재시도 대상 중 429 외의 일시적 오류 (연결 실패 / 타임아웃 / 5xx)
+TRANSIENT_ERRORS = (APIConnectionError, InternalServerError)
+
+
+def build_http_client(
+    max_connections: int = 100,
+    max_keepalive_connections: int = 20,
+    keepalive_expiry: float = 60.0,
+    connect_timeout: float = 5.0,
+    read_timeout: float = 120.0,
+    http2: bool = True
+) -> httpx.AsyncClient:
+    """
+    OpenAI 호출용 공유 HTTP 커넥션 풀 생성
+
+    http2=True여도 h2 패키지가 없으면 HTTP/1.1 keep-alive 풀로 동작
+    """
+    use_http2 = http2 and HTTP2_AVAILABLE
+    if http2 and not HTTP2_AVAILABLE:
+        logger.warning("h2 package not installed, OpenAI pool falls back to HTTP/1.1")
+    
+    return httpx.AsyncClient(
+        http2=use_http2,
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry
+        ),
+        timeout=httpx.Timeout(
+            read_timeout, connect=connect_timeout
+        )
+    )
 
 
 class OpenAIClient:
@@ -13,56 +61,366 @@ class OpenAIClient:
     
     책임:
     - OpenAI API 호출만 담당
+    - (선택) 응답 캐시 조회/저장
+    - (선택) 동일 요청 동시 호출 합치기 (single-flight)
+    - (선택) RPM/TPM 제한 및 429 대응 동시성 조절
+    - (선택) 지연이 긴 호출에 대한 헤지 요청
+    - HTTP 커넥션 풀 수명 관리 (시작 시 warmup, 종료 시 drain 후 close)
     """
     
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        cache: Optional[CompletionCache] = None,
+        coalesce_requests: bool = True,
+        default_model: str = "gpt-4",
+        default_max_tokens: Optional[int] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        rate_limit_retries: int = 2,
+        transient_retries: int = 2,
+        hedger: Optional[RequestHedger] = None,
+        base_url: Optional[str] = None,
+        http_client: Optional[httpx.AsyncClient] = None,
+        http_client_factory: Optional[Callable[[], httpx.AsyncClient]] = None
+    ):
         self.api_key = api_key or os.getenv("OPENAI_API_KEY")
         if not self.api_key:
             raise ValueError("OPENAI_API_KEY is required")
-        self.client = AsyncOpenAI(api_key=self.api_key)
+        
+        self.base_url = base_url
+        self.cache = cache
+        self.single_flight = SingleFlight() if coalesce_requests else None
+        self.rate_limiter = rate_limiter
+        self.rate_limit_retries = rate_limit_retries
+        self.transient_retries = transient_retries
+        self.hedger = hedger
+        
+        # model / max_tokens 미지정 호출에 사용할 기본값
+        self.default_model = default_model
+        self.default_max_tokens = default_max_tokens
+        
+        # 종료 시 drain을 위한 진행 중 호출 추적
+        self._inflight = 0
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._warm_connections = 0
+        
+        # 공유 커넥션 풀 (지정하지 않으면 factory, 기본 설정 순으로 생성)
+        # aclose() 후 다시 쓰이면 factory로 새 풀을 만듦
+        self._http_client_factory = http_client_factory or build_http_client
+        self._closed = False
+        self._open(http_client)
+    
+    def _open(self, http_client: Optional[httpx.AsyncClient] = None):
+        """커넥션 풀과 SDK 클라이언트 생성"""
+        self.http_client = http_client or self._http_client_factory()
+        
+        # RateLimiter가 429를 관찰할 수 있도록 SDK 내부 재시도 대신 직접 재시도
+        # (429는 rate_limit_retries, 연결 오류 / 타임아웃 / 5xx는 transient_retries회)
+        self.client = AsyncOpenAI(
+            api_key=self.api_key,
+            base_url=self.base_url,
+            max_retries=0 if self.rate_limiter else 2,
+            http_client=self.http_client
+        )
+        self._closed = False
+    
+    def _ensure_open(self):
+        """aclose() 이후 다시 호출되면 재연결 (lru_cache로 공유되는 인스턴스, 앱 lifespan 재시작 등)"""
+        if self._closed:
+            logger.info("Reopening OpenAI connection pool after close")
+            self._open()
     
     async def generate(
         self,
         prompt: str,
         system_prompt: Optional[str] = None,
-        model: str = "gpt-4",
+        model: Optional[str] = None,
         temperature: float = 0.7,
-        max_tokens: Optional[int] = None
+        max_tokens: Optional[int] = None,
+        on_token: Optional[Callable[[str], None]] = None,
+        cache_policy: CachePolicy = CachePolicy.AUTO,
+        timeout: Optional[float] = None,
+        priority: Priority = Priority.INTERACTIVE,
+        hedge: bool = True
     ) -> str:
-        """텍스트 생성"""
-        messages = []
+        """
+        텍스트 생성
+
+        on_token이 주어지면 스트리밍으로 호출하여 토큰이 도착할 때마다
+        콜백으로 전달하고, 전체 텍스트를 합쳐서 반환합니다.
+
+        캐시가 설정되어 있으면 cache_policy에 따라 캐시를 먼저 조회합니다.
+        (기본값 AUTO: temperature == 0 인 호출만 캐시)
+
+        스트리밍이 아닌 호출은 같은 요청 키로 동시에 들어온 호출끼리
+        하나의 업스트림 호출을 공유합니다.
+
+        priority는 RateLimiter 대기열 순서에 사용됩니다.
+
+        hedger가 설정되어 있고 hedge=True면 스트리밍이 아닌 호출에 헤지를 적용합니다.
+        """
+        model = model or self.default_model
+        max_tokens = max_tokens or self.default_max_tokens
         
-        if system_prompt:
-            messages.append({
-                "role": "system",
-                "content": system_prompt
-            })
+        use_cache = self.cache is not None and cache_policy.allows(temperature)
+        request_key = CompletionCache.make_key(
+            model, system_prompt, prompt, temperature, max_tokens
+        )
         
-        messages.append({
-            "role": "user",
-            "content": prompt
-        })
+        if use_cache:
+            cached = await self.cache.get(request_key)
+            if cached is not None:
+                if on_token is not None:
+                    on_token(cached)
+                return cached
         
-        try:
-            response = await self.client.chat.completions.create(
+        async def call() -> str:
+            content = await self._complete(
+                prompt=prompt,
+                system_prompt=system_prompt,
+                model=model,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                on_token=on_token,
+                timeout=timeout,
+                priority=priority,
+                hedge=hedge
+            )
+            if use_cache and content:
+                await self.cache.set(request_key, model, content)
+            return content
+        
+        if self.single_flight is not None and on_token is None:
+            return await self.single_flight.do(request_key, call)
+        
+        return await call()
+    
+    async def _complete(
+        self,
+        prompt: str,
+        system_prompt: Optional[str],
+        model: str,
+        temperature: float,
+        max_tokens: Optional[int],
+        on_token: Optional[Callable[[str], None]],
+        timeout: Optional[float] = None,
+        priority: Priority = Priority.INTERACTIVE,
+        hedge: bool = True
+    ) -> str:
+        """실제 API 호출 (스트리밍 여부에 따라 분기)"""
+        if on_token is not None:
+            chunks = []
+            async for token in self.generate_stream(
+                prompt=prompt,
+                system_prompt=system_prompt,
+                model=model,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                timeout=timeout,
+                priority=priority
+            ):
+                on_token(token)
+                chunks.append(token)
+            return "".join(chunks)
+
+        messages = self._build_messages(prompt, system_prompt)
+        estimated_tokens = self._estimate_tokens(messages, max_tokens)
+        self._ensure_open()
+        
+        def create():
+            return self.client.chat.completions.create(
                 model=model,
                 messages=messages,
                 temperature=temperature,
-                max_tokens=max_tokens
+                max_tokens=max_tokens,
+                **self._request_options(timeout)
             )
-            return response.choices[0].message.content
-        except Exception as e:
-            logger.error(f"OpenAI API error: {e}")
-            raise
+        
+        attempts = {"rate_limited": 0, "transient": 0}
+        while True:
+            permit = await self._acquire(estimated_tokens, priority)
+            self._enter()
+            try:
+                # 헤지 요청은 대기열 대기 시간이 아닌 API 호출 지연만 기준으로 판단
+                if self.hedger is not None and hedge:
+                    response = await self.hedger.run(
+                        model, create, self._hedge_reserver(estimated_tokens)
+                    )
+                else:
+                    response = await create()
+            except RateLimitError as e:
+                permit.release(rate_limited=True, retry_after=self._retry_after(e))
+                delay = self._retry_delay(e, attempts)
+                if delay is None:
+                    logger.error(f"OpenAI API error: {e}")
+                    raise
+                logger.warning(f"OpenAI rate limited, retrying ({attempts['rate_limited']})")
+            except TRANSIENT_ERRORS as e:
+                permit.release()
+                delay = self._retry_delay(e, attempts)
+                if delay is None:
+                    logger.error(f"OpenAI API error: {e}")
+                    raise
+                logger.warning(f"OpenAI API error, retrying in {delay:.1f}s: {e}")
+            except BaseException as e:
+                permit.release()
+                if isinstance(e, Exception):
+                    logger.error(f"OpenAI API error: {e}")
+                raise
+            else:
+                permit.release(
+                    used_tokens=response.usage.total_tokens if response.usage else None
+                )
+                return response.choices[0].message.content
+            finally:
+                self._exit()
+            
+            await asyncio.sleep(delay)
     
     async def generate_stream(
         self,
         prompt: str,
         system_prompt: Optional[str] = None,
-        model: str = "gpt-4",
-        temperature: float = 0.7
+        model: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        timeout: Optional[float] = None,
+        priority: Priority = Priority.INTERACTIVE
     ) -> AsyncIterator[str]:
-        """스트리밍 생성"""
+        """
+        스트리밍 생성
+
+        429 / 일시적 오류는 아직 토큰을 하나도 내보내지 않은 경우에만 재시도
+        (이미 전달한 토큰 뒤에 새 응답이 이어 붙지 않도록)
+        """
+        model = model or self.default_model
+        max_tokens = max_tokens or self.default_max_tokens
+        messages = self._build_messages(prompt, system_prompt)
+        estimated_tokens = self._estimate_tokens(messages, max_tokens)
+        self._ensure_open()
+        
+        attempts = {"rate_limited": 0, "transient": 0}
+        while True:
+            permit = await self._acquire(estimated_tokens, priority)
+            rate_limited = False
+            retry_after = None
+            emitted = False
+            self._enter()
+            
+            try:
+                stream = await self.client.chat.completions.create(
+                    model=model,
+                    messages=messages,
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                    stream=True,
+                    **self._request_options(timeout)
+                )
+                
+                async for chunk in stream:
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        emitted = True
+                        yield chunk.choices[0].delta.content
+                return
+            except (RateLimitError, *TRANSIENT_ERRORS) as e:
+                if isinstance(e, RateLimitError):
+                    rate_limited = True
+                    retry_after = self._retry_after(e)
+                delay = None if emitted else self._retry_delay(e, attempts)
+                if delay is None:
+                    logger.error(f"OpenAI API streaming error: {e}")
+                    raise
+                logger.warning(f"OpenAI API streaming error, retrying in {delay:.1f}s: {e}")
+            except Exception as e:
+                logger.error(f"OpenAI API streaming error: {e}")
+                raise
+            finally:
+                self._exit()
+                permit.release(rate_limited=rate_limited, retry_after=retry_after)
+            
+            await asyncio.sleep(delay)
+    
+    async def _acquire(self, estimated_tokens: int, priority: Priority) -> RateLimitPermit:
+        """RateLimiter 실행 권한 획득 (비활성화 시 즉시 통과)"""
+        if self.rate_limiter is None:
+            return UNLIMITED_PERMIT
+        return await self.rate_limiter.acquire(estimated_tokens, priority)
+    
+    def _retry_delay(self, error: Exception, attempts: Dict[str, int]) -> Optional[float]:
+        """
+        재시도 전 대기 시간 (재시도하지 않으면 None)
+
+        - 429: 다음 acquire가 Retry-After / 동시성 감소를 반영해 대기하므로 바로 재시도
+        - 연결 오류 / 타임아웃 / 5xx: SDK 기본 재시도와 같은 지수 백오프 (0.5초부터, 최대 8초)
+        RateLimiter가 없으면 SDK가 재시도하므로 여기서는 재시도하지 않음
+        """
+        if self.rate_limiter is None:
+            return None
+        if isinstance(error, RateLimitError):
+            if attempts["rate_limited"] >= self.rate_limit_retries:
+                return None
+            attempts["rate_limited"] += 1
+            return 0.0
+        if attempts["transient"] >= self.transient_retries:
+            return None
+        attempts["transient"] += 1
+        return min(0.5 * 2 ** (attempts["transient"] - 1), 8.0)
+    
+    def _hedge_reserver(
+        self, estimated_tokens: int
+    ) -> Optional[Callable[[], Optional[Callable[[asyncio.Task], None]]]]:
+        """
+        헤지 요청용 실행 권한 확보 함수 (RateLimiter가 없으면 None)
+
+        헤지도 RPM/TPM/동시 실행 한도를 소비하며, 대기 없이 권한을 받을 수 없으면 헤지하지 않음
+        (429를 막기 위한 제한을 중복 요청이 우회하지 않도록)
+        """
+        if self.rate_limiter is None:
+            return None
+
+        def reserve() -> Optional[Callable[[asyncio.Task], None]]:
+            permit = self.rate_limiter.try_acquire(estimated_tokens)
+            if permit is None:
+                return None
+
+            def release(task: asyncio.Task):
+                if task.cancelled():
+                    permit.release()
+                    return
+                error = task.exception()
+                if isinstance(error, RateLimitError):
+                    permit.release(rate_limited=True, retry_after=self._retry_after(error))
+                elif error is not None:
+                    permit.release()
+                else:
+                    usage = task.result().usage
+                    permit.release(used_tokens=usage.total_tokens if usage else None)
+
+            return release
+
+        return reserve
+
+    def _estimate_tokens(self, messages: list, max_tokens: Optional[int]) -> int:
+        """TPM 제한용 요청 토큰 추정 (입력 + 최대 출력)"""
+        prompt_tokens = sum(count_tokens(message["content"]) for message in messages)
+        return prompt_tokens + (max_tokens or 500)
+    
+    @staticmethod
+    def _retry_after(error: RateLimitError) -> Optional[float]:
+        """429 응답의 Retry-After 헤더 (초)"""
+        headers = getattr(getattr(error, "response", None), "headers", None) or {}
+        try:
+            if headers.get("retry-after-ms"):
+                return float(headers["retry-after-ms"]) / 1000
+            if headers.get("retry-after"):
+                return float(headers["retry-after"])
+        except ValueError:
+            pass
+        return None
+    
+    def _build_messages(self, prompt: str, system_prompt: Optional[str]) -> list:
+        """Chat Completions 메시지 구성"""
         messages = []
         
         if system_prompt:
@@ -76,17 +434,92 @@ class OpenAIClient:
             "content": prompt
         })
         
-        try:
-            stream = await self.client.chat.completions.create(
-                model=model,
-                messages=messages,
-                temperature=temperature,
-                stream=True
-            )
-            
-            async for chunk in stream:
-                if chunk.choices[0].delta.content:
-                    yield chunk.choices[0].delta.content
-        except Exception as e:
-            logger.error(f"OpenAI API streaming error: {e}")
-            raise
\ No newline at end of file
+        return messages
+    
+    @staticmethod
+    def _request_options(timeout: Optional[float]) -> Dict[str, Any]:
+        """요청별 옵션 (None을 넘기면 타임아웃이 해제되므로 지정된 경우만 전달)"""
+        return {"timeout": timeout} if timeout else {}
+    
+    def _enter(self):
+        self._inflight += 1
+        self._idle.clear()
+    
+    def _exit(self):
+        self._inflight -= 1
+        if self._inflight == 0:
+            self._idle.set()
+    
+    async def warmup(self, connections: int = 4, timeout: float = 5.0) -> int:
+        """
+        커넥션 풀 예열
+
+        배포 직후 첫 요청들이 DNS/TCP/TLS 핸드셰이크 비용을 내지 않도록
+        API 호스트에 동시에 가벼운 요청을 보내 커넥션을 미리 열어 둠
+        (HTTP/2에서는 동시 요청이 하나의 커넥션으로 다중화됨)
+        
+        Returns:
+            성공한 예열 요청 수
+        """
+        if connections <= 0:
+            return 0
+        self._ensure_open()
+        url = str(self.client.base_url)
+        
+        async def touch():
+            # 응답 코드와 무관하게 TLS 연결만 맺으면 됨 (인증 불필요)
+            await self.http_client.head(url, timeout=timeout)
+        
+        results = await asyncio.gather(
+            *(touch() for _ in range(connections)), return_exceptions=True
+        )
+        self._warm_connections = sum(1 for r in results if not isinstance(r, Exception))
+        
+        failures = [r for r in results if isinstance(r, Exception)]
+        if failures:
+            logger.warning(f"OpenAI pool warmup partially failed: {failures[0]}")
+        logger.info(f"🔥 OpenAI connection pool warmed: {self._warm_connections}/{connections}")
+        return self._warm_connections
+    
+    async def aclose(self, drain_timeout: float = 10.0):
+        """
+        리소스 정리
+
+        진행 중인 호출이 끝날 때까지 최대 drain_timeout 동안 기다린 뒤
+        커넥션 풀과 캐시 DB 연결을 닫음 (이후 호출 시 다시 연결)
+        """
+        if self._inflight:
+            logger.info(f"Draining {self._inflight} in-flight OpenAI requests")
+            try:
+                await asyncio.wait_for(self._idle.wait(), timeout=drain_timeout)
+            except asyncio.TimeoutError:
+                logger.warning(
+                    f"Drain timed out, closing with {self._inflight} requests in flight"
+                )
+        
+        if not self._closed:
+            self._closed = True
+            await self.client.close()
+            await self.http_client.aclose()
+        
+        if self.cache:
+            self.cache.close()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """클라이언트 통계 (캐시 등)"""
+        return {
+            "inflight": self._inflight,
+            "warm_connections": self._warm_connections,
+            "cache": self.cache.get_stats() if self.cache else {"enabled": False},
+            "single_flight": (
+                self.single_flight.get_stats()
+                if self.single_flight
+                else {"enabled": False}
+            ),
+            "rate_limiter": (
+                self.rate_limiter.get_stats()
+                if self.rate_limiter
+                else {"enabled": False}
+            ),
+            "hedging": self.hedger.get_stats() if self.hedger else {"enabled": False},
+        }
\ No newline at end of file
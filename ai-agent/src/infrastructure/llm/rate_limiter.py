@@ -0,0 +1,277 @@
+"""
+Client-side rate limiter and adaptive concurrency governor for LLM calls
+"""
+import asyncio
+import heapq
+import itertools
+import time
+from collections import deque
+from enum import IntEnum
+from typing import Any, Dict, List, Optional
+
+from utils.logger import logger
+
+
+class Priority(IntEnum):
+    """요청 우선순위 (값이 작을수록 먼저 처리)"""
+    INTERACTIVE = 0  # 사용자 채팅
+
+
+class TokenBucket:
+    """분당 허용량 기반 토큰 버킷"""
+
+    def __init__(self, per_minute: float, capacity: Optional[float] = None):
+        self.rate = per_minute / 60.0
+        self.capacity = capacity or per_minute
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """amount만큼 소비하려면 기다려야 하는 시간 (초)"""
+        self._refill()
+        # 버킷보다 큰 요청이 영원히 대기하지 않도록 capacity로 제한
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.rate
+
+    def consume(self, amount: float):
+        self._refill()
+        self.tokens -= min(amount, self.capacity)
+
+    def adjust(self, delta: float):
+        """예상치와 실제 사용량의 차이 보정 (음수 잔량 허용)"""
+        self.tokens = min(self.capacity, self.tokens - delta)
+
+
+class RateLimitPermit:
+    """RateLimiter가 발급한 실행 권한 (호출 종료 시 release 필수)"""
+
+    def __init__(self, limiter: Optional["RateLimiter"], tokens: int, wait_seconds: float):
+        self.limiter = limiter
+        self.tokens = tokens
+        self.wait_seconds = wait_seconds
+        self._released = False
+
+    def release(
+        self,
+        rate_limited: bool = False,
+        retry_after: Optional[float] = None,
+        used_tokens: Optional[int] = None,
+    ):
+        if self._released or self.limiter is None:
+            return
+        self._released = True
+        self.limiter._release(self, rate_limited, retry_after, used_tokens)
+
+
+class RateLimiter:
+    """
+    OpenAI 호출 제한기
+
+    - RPM / TPM 토큰 버킷으로 분당 요청 수와 (추정) 토큰 수 제한
+    - 동시 실행 수 상한을 AIMD 방식으로 조정
+      (성공 시 천천히 증가, 429 발생 시 절반으로 감소 + Retry-After 동안 일시 정지)
+    - 대기열은 우선순위 힙: 우선순위 값이 작은 요청부터, 같으면 도착 순서대로 실행
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: int,
+        tokens_per_minute: int,
+        max_concurrency: int = 32,
+        min_concurrency: int = 1,
+        backoff_factor: float = 0.5,
+        default_backoff_seconds: float = 1.0,
+    ):
+        self.rpm_bucket = TokenBucket(requests_per_minute)
+        self.tpm_bucket = TokenBucket(tokens_per_minute)
+
+        self.max_concurrency = max_concurrency
+        self.min_concurrency = min_concurrency
+        self.backoff_factor = backoff_factor
+        self.default_backoff_seconds = default_backoff_seconds
+
+        self.concurrency_limit = float(max_concurrency)
+        self.inflight = 0
+        self.paused_until = 0.0
+
+        # (priority, seq, tokens, future)
+        self._queue: List[tuple] = []
+        self._seq = itertools.count()
+        self._wakeup: Optional[asyncio.TimerHandle] = None
+
+        # 메트릭
+        self.granted = 0
+        self.rate_limited = 0
+        self._recent_waits: deque = deque(maxlen=1000)
+        self._wait_totals: Dict[str, Dict[str, float]] = {}
+
+    async def acquire(
+        self, tokens: int, priority: Priority = Priority.INTERACTIVE
+    ) -> RateLimitPermit:
+        """실행 권한 획득 (우선순위 순서로 대기)"""
+        future = asyncio.get_running_loop().create_future()
+        enqueued_at = time.monotonic()
+
+        heapq.heappush(self._queue, (int(priority), next(self._seq), tokens, future))
+        self._dispatch()
+
+        try:
+            await future
+        except asyncio.CancelledError:
+            # 권한을 받은 직후 취소된 경우 슬롯 반환
+            if future.done() and not future.cancelled():
+                self._release(RateLimitPermit(self, tokens, 0.0), False, None, 0)
+            raise
+
+        wait_seconds = time.monotonic() - enqueued_at
+        self._record_wait(Priority(priority), wait_seconds)
+        return RateLimitPermit(self, tokens, wait_seconds)
+
+    def try_acquire(self, tokens: int) -> Optional[RateLimitPermit]:
+        """
+        대기 없이 바로 실행 가능할 때만 권한 발급 (헤지 요청 등 선택적 호출용)
+
+        대기열에 요청이 있거나 동시 실행/RPM/TPM 여유가 없으면 None (대기열을 앞지르지 않음)
+        """
+        if self.queue_depth:
+            return None
+        if self.inflight >= max(int(self.concurrency_limit), self.min_concurrency):
+            return None
+        wait = max(
+            self.paused_until - time.monotonic(),
+            self.rpm_bucket.wait_time(1),
+            self.tpm_bucket.wait_time(tokens),
+        )
+        if wait > 0:
+            return None
+
+        self.rpm_bucket.consume(1)
+        self.tpm_bucket.consume(tokens)
+        self.inflight += 1
+        self.granted += 1
+        return RateLimitPermit(self, tokens, 0.0)
+
+    def _dispatch(self):
+        """대기열 앞에서부터 실행 가능한 요청에 권한 부여"""
+        while self._queue:
+            _, _, tokens, future = self._queue[0]
+
+            # 취소된 대기자는 제거
+            if future.done():
+                heapq.heappop(self._queue)
+                continue
+
+            # 동시 실행 상한 - release 시점에 다시 dispatch
+            if self.inflight >= max(int(self.concurrency_limit), self.min_concurrency):
+                return
+
+            wait = max(
+                self.paused_until - time.monotonic(),
+                self.rpm_bucket.wait_time(1),
+                self.tpm_bucket.wait_time(tokens),
+            )
+            if wait > 0:
+                self._schedule_wakeup(wait)
+                return
+
+            heapq.heappop(self._queue)
+            self.rpm_bucket.consume(1)
+            self.tpm_bucket.consume(tokens)
+            self.inflight += 1
+            self.granted += 1
+            future.set_result(None)
+
+    def _schedule_wakeup(self, delay: float):
+        if self._wakeup is not None:
+            self._wakeup.cancel()
+        self._wakeup = asyncio.get_running_loop().call_later(delay, self._on_wakeup)
+
+    def _on_wakeup(self):
+        self._wakeup = None
+        self._dispatch()
+
+    def _release(
+        self,
+        permit: RateLimitPermit,
+        rate_limited: bool,
+        retry_after: Optional[float],
+        used_tokens: Optional[int],
+    ):
+        self.inflight -= 1
+
+        if used_tokens is not None:
+            self.tpm_bucket.adjust(used_tokens - permit.tokens)
+
+        if rate_limited:
+            # 429: 동시 실행 상한 감소 + Retry-After 동안 신규 요청 정지
+            self.rate_limited += 1
+            self.concurrency_limit = max(
+                self.min_concurrency, self.concurrency_limit * self.backoff_factor
+            )
+            pause = retry_after if retry_after else self.default_backoff_seconds
+            self.paused_until = max(self.paused_until, time.monotonic() + pause)
+            logger.warning(
+                f"LLM rate limited: concurrency -> {self.concurrency_limit:.1f}, "
+                f"pausing {pause:.2f}s"
+            )
+        else:
+            # 성공: 상한을 천천히 회복 (동시 실행 수만큼 성공하면 +1)
+            self.concurrency_limit = min(
+                self.max_concurrency, self.concurrency_limit + 1 / self.concurrency_limit
+            )
+
+        self._dispatch()
+
+    def _record_wait(self, priority: Priority, wait_seconds: float):
+        self._recent_waits.append(wait_seconds)
+        totals = self._wait_totals.setdefault(
+            priority.name.lower(), {"count": 0, "total_ms": 0.0, "max_ms": 0.0}
+        )
+        totals["count"] += 1
+        totals["total_ms"] += wait_seconds * 1000
+        totals["max_ms"] = max(totals["max_ms"], wait_seconds * 1000)
+
+    @property
+    def queue_depth(self) -> int:
+        return sum(1 for _, _, _, future in self._queue if not future.done())
+
+    def get_stats(self) -> Dict[str, Any]:
+        """큐 깊이, 대기 시간, 동시성 상한 등 메트릭"""
+        waits = sorted(self._recent_waits)
+
+        def percentile(p: float) -> float:
+            if not waits:
+                return 0.0
+            return waits[min(int(len(waits) * p), len(waits) - 1)] * 1000
+
+        return {
+            "queue_depth": self.queue_depth,
+            "inflight": self.inflight,
+            "concurrency_limit": round(self.concurrency_limit, 2),
+            "paused_for_ms": max(self.paused_until - time.monotonic(), 0) * 1000,
+            "granted": self.granted,
+            "rate_limited": self.rate_limited,
+            "wait_p50_ms": percentile(0.5),
+            "wait_p95_ms": percentile(0.95),
+            "wait_by_priority": {
+                name: {
+                    "count": totals["count"],
+                    "avg_ms": totals["total_ms"] / totals["count"],
+                    "max_ms": totals["max_ms"],
+                }
+                for name, totals in self._wait_totals.items()
+            },
+            "rpm_available": round(self.rpm_bucket.tokens, 1),
+            "tpm_available": round(self.tpm_bucket.tokens, 1),
+        }
+
+
+# 제한기가 비활성화된 경우 사용하는 권한 (release 시 아무 것도 하지 않음)
+UNLIMITED_PERMIT = RateLimitPermit(None, 0, 0.0)
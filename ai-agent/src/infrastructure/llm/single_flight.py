@@ -0,0 +1,56 @@
+"""
+Single-flight request coalescing
+"""
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class SingleFlight:
+    """
+    동일 키의 동시 요청을 하나의 업스트림 호출로 합치는 컴포넌트
+
+    - 첫 호출자(leader)가 공유 Task를 생성하고, 이후 호출자는 같은 Task를 기다림
+    - 각 호출자는 asyncio.shield로 기다리므로 한 호출자가 취소되어도
+      공유 호출은 계속 진행되고 나머지 호출자는 결과를 받음
+    - Task가 끝나면 키를 제거하므로 결과를 보관하지 않음 (캐시 역할 아님)
+    """
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+
+        self.leaders = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """key에 대해 진행 중인 호출이 있으면 합류, 없으면 fn() 실행"""
+        task = self._inflight.get(key)
+
+        if task is None:
+            task = asyncio.create_task(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._on_done(key, t))
+            self.leaders += 1
+        else:
+            self.coalesced += 1
+
+        return await asyncio.shield(task)
+
+    def _on_done(self, key: Hashable, task: asyncio.Task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+
+        # 모든 호출자가 취소된 경우에도 예외가 "retrieve 되지 않음" 경고로 남지 않도록 소비
+        if not task.cancelled():
+            task.exception()
+
+    @property
+    def inflight(self) -> int:
+        return len(self._inflight)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """합류 통계"""
+        return {
+            "inflight": self.inflight,
+            "leaders": self.leaders,
+            "coalesced": self.coalesced,
+        }
@@ -0,0 +1,177 @@
+"""
+Micro-batching embedding service with an LRU in front
+"""
+import asyncio
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from infrastructure.retrieval.embeddings import Embedder
+from utils.logger import logger
+
+
+class EmbeddingService(Embedder):
+    """
+    임베딩 요청 묶음 처리 서비스
+
+    - 텍스트 해시 키 LRU에 있으면 백엔드 호출 없이 반환
+    - 없으면 큐에 넣고, 워커가 max_wait_ms 동안 또는 max_batch_size까지 모아
+      백엔드(OpenAI / 로컬)에 한 번에 요청한 뒤 결과를 호출자별로 나눠줌
+    - 같은 텍스트가 대기/처리 중이면 같은 Future를 공유 (중복 요청 없음)
+    - 백엔드 동시 호출은 max_concurrent_batches까지 (초과분은 큐에서 더 큰 배치로 모임)
+    - Embedder를 그대로 구현하므로 검색기/수집 파이프라인에 그대로 주입 가능
+    """
+
+    def __init__(
+        self,
+        backend: Embedder,
+        max_batch_size: int = 64,
+        max_wait_ms: float = 5.0,
+        cache_size: int = 10000,
+        max_concurrent_batches: int = 4,
+    ):
+        self.backend = backend
+        self.name = backend.name
+        self.dim = backend.dim
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.cache_size = cache_size
+        self.max_concurrent_batches = max_concurrent_batches
+
+        self._cache: "OrderedDict[bytes, np.ndarray]" = OrderedDict()
+        self._pending: Dict[bytes, asyncio.Future] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._flushes: Set[asyncio.Task] = set()
+
+        self.texts = 0
+        self.cache_hits = 0
+        self.coalesced = 0
+        self.batches = 0
+        self.batched_texts = 0
+        self.backend_ms = 0.0
+
+    @staticmethod
+    def _key(text: str) -> bytes:
+        return hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+
+    async def embed(self, texts: List[str]) -> np.ndarray:
+        vectors = np.empty((len(texts), self.dim), dtype=np.float32)
+        waiting: List[Tuple[int, asyncio.Future]] = []
+        self._ensure_worker()
+
+        for row, text in enumerate(texts):
+            self.texts += 1
+            key = self._key(text)
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                self.cache_hits += 1
+                vectors[row] = cached
+                continue
+
+            future = self._pending.get(key)
+            if future is None:
+                future = asyncio.get_running_loop().create_future()
+                self._pending[key] = future
+                self._queue.put_nowait((key, text, future))
+            else:
+                self.coalesced += 1
+            waiting.append((row, future))
+
+        if waiting:
+            # shield: 한 호출자가 취소되어도 같은 텍스트를 기다리는 다른 호출자에는 영향 없음
+            results = await asyncio.gather(*(asyncio.shield(f) for _, f in waiting))
+            for (row, _), vector in zip(waiting, results):
+                vectors[row] = vector
+        return vectors
+
+    def _ensure_worker(self):
+        loop = asyncio.get_running_loop()
+        if self._worker is None or self._worker.get_loop() is not loop:
+            # 다른 이벤트 루프에서 만든 큐/Future는 재사용할 수 없으므로 새로 생성
+            self._queue = asyncio.Queue()
+            self._slots = asyncio.Semaphore(self.max_concurrent_batches)
+            self._pending.clear()
+        elif not self._worker.done():
+            return
+        self._worker = loop.create_task(self._run())
+
+    async def _run(self):
+        while True:
+            await self._slots.acquire()
+            batch = [await self._queue.get()]
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            task = asyncio.create_task(self._flush(batch))
+            self._flushes.add(task)
+            task.add_done_callback(self._flush_done)
+
+    def _flush_done(self, task: asyncio.Task):
+        self._flushes.discard(task)
+        self._slots.release()
+
+    async def _flush(self, batch: List[Tuple[bytes, str, asyncio.Future]]):
+        start = time.monotonic()
+        try:
+            vectors = await self.backend.embed([text for _, text, _ in batch])
+        except Exception as e:
+            logger.error(f"Embedding batch failed ({len(batch)} texts): {e}")
+            for key, _, future in batch:
+                self._pending.pop(key, None)
+                if not future.done():
+                    future.set_exception(e)
+            return
+        finally:
+            self.batches += 1
+            self.batched_texts += len(batch)
+            self.backend_ms += (time.monotonic() - start) * 1000
+
+        for (key, _, future), vector in zip(batch, vectors):
+            self._pending.pop(key, None)
+            self._cache[key] = vector
+            if not future.done():
+                future.set_result(vector)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    async def close(self):
+        """워커 종료 (대기 중인 요청은 취소)"""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+        for task in list(self._flushes):
+            task.cancel()
+        for future in self._pending.values():
+            future.cancel()
+        self._pending.clear()
+        self._queue = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """캐시 적중률과 평균 배치 크기"""
+        return {
+            "backend": self.backend.name,
+            "texts": self.texts,
+            "cache_hits": self.cache_hits,
+            "cache_hit_rate": self.cache_hits / self.texts if self.texts else 0.0,
+            "coalesced": self.coalesced,
+            "cache_entries": len(self._cache),
+            "batches": self.batches,
+            "avg_batch_size": self.batched_texts / self.batches if self.batches else 0.0,
+            "avg_backend_ms": self.backend_ms / self.batches if self.batches else 0.0,
+        }
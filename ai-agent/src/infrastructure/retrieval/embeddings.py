@@ -0,0 +1,79 @@
+"""
+Text embedding backends for retrieval
+"""
+import hashlib
+from abc import ABC, abstractmethod
+from typing import List
+
+import numpy as np
+from openai import AsyncOpenAI
+
+from utils.text_tokenizer import tokenize
+
+
+class Embedder(ABC):
+    """텍스트 -> L2 정규화된 float32 벡터 (N, dim)"""
+
+    name: str
+    dim: int
+
+    @abstractmethod
+    async def embed(self, texts: List[str]) -> np.ndarray:
+        ...
+
+
+class HashingEmbedder(Embedder):
+    """
+    로컬 결정적 임베딩 (feature hashing)
+
+    토큰을 해시로 차원에 배정하고 부호를 붙여 합산
+    네트워크/모델 없이 동작하며 같은 입력은 항상 같은 벡터
+    (어휘 기반이므로 의미 유사도는 제한적 - 오프라인/개발/벤치마크용)
+    """
+
+    def __init__(self, dim: int = 384):
+        self.dim = dim
+        self.name = f"hashing-{dim}"
+
+    async def embed(self, texts: List[str]) -> np.ndarray:
+        return self.embed_sync(texts)
+
+    def embed_sync(self, texts: List[str]) -> np.ndarray:
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for token in tokenize(text):
+                digest = hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest()
+                value = int.from_bytes(digest, "little")
+                sign = 1.0 if value & 1 else -1.0
+                vectors[row, (value >> 1) % self.dim] += sign
+        return normalize(vectors)
+
+
+class OpenAIEmbedder(Embedder):
+    """
+    OpenAI 임베딩 API (text-embedding-3 계열은 dimensions로 차원 축소 지원)
+
+    OpenAIClient의 AsyncOpenAI 인스턴스를 받아 같은 커넥션 풀을 공유
+    """
+
+    def __init__(self, client: AsyncOpenAI, model: str = "text-embedding-3-small", dim: int = 384):
+        self.client = client
+        self.model = model
+        self.dim = dim
+        self.name = f"openai-{model}-{dim}"
+
+    async def embed(self, texts: List[str]) -> np.ndarray:
+        response = await self.client.embeddings.create(
+            model=self.model, input=texts, dimensions=self.dim
+        )
+        # 응답 순서는 index 필드 기준
+        data = sorted(response.data, key=lambda item: item.index)
+        return normalize(np.array([item.embedding for item in data], dtype=np.float32))
+
+
+def normalize(vectors: np.ndarray) -> np.ndarray:
+    """행 단위 L2 정규화 (영벡터는 그대로)"""
+    vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
@@ -0,0 +1,317 @@
+"""
+HNSW graph over the vector index rows (approximate nearest neighbour search)
+"""
+import heapq
+import json
+import math
+import os
+import random
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+HNSW_META_FILE = "hnsw_meta.json"
+HNSW_LEVELS_FILE = "hnsw_levels.npy"
+HNSW_LEVEL0_FILE = "hnsw_level0.npy"
+HNSW_UPPER_NODES_FILE = "hnsw_upper_nodes.npy"
+HNSW_UPPER_FILE = "hnsw_upper.npy"
+
+ANN_INDEX_KINDS = ("flat", "hnsw", "auto")
+
+Candidate = Tuple[float, int]  # (유사도, 행 번호)
+
+
+class HNSWGraph:
+    """
+    HNSW (Hierarchical Navigable Small World) 그래프
+
+    - 노드는 VectorIndex의 행 번호와 같고 벡터는 VectorIndex에서 빌려 씀
+      (그래프에는 이웃 목록만 저장)
+    - level 0 이웃은 (N, 2M) int32 배열 하나 -> .npy로 저장 후 mmap 로드,
+      질의가 방문한 노드의 페이지만 읽힘
+    - 상위 레벨 노드는 전체의 약 1/M 이므로 로드 시 dict로 올림
+    - 삭제는 VectorIndex tombstone으로 처리: 그래프에서는 경로로만 쓰이고
+      결과에서 제외 (compact 시 그래프 재생성)
+    - 이웃 선택은 논문의 heuristic (후보가 이미 고른 이웃보다 질의에 가까울 때만 연결)
+    """
+
+    def __init__(
+        self,
+        m: int = 16,
+        ef_construction: int = 100,
+        levels: Optional[np.ndarray] = None,
+        level0: Optional[np.ndarray] = None,
+        upper: Optional[Dict[int, np.ndarray]] = None,
+        entry_point: int = -1,
+        max_level: int = -1,
+        count: int = 0,
+        seed: int = 0,
+    ):
+        self.m = m
+        self.m0 = 2 * m
+        self.ef_construction = ef_construction
+        self.levels = levels if levels is not None else np.zeros(0, dtype=np.int8)
+        self.level0 = level0 if level0 is not None else np.full((0, self.m0), -1, dtype=np.int32)
+        self.upper: Dict[int, np.ndarray] = upper if upper is not None else {}
+        self.entry_point = entry_point
+        self.max_level = max_level
+        self.count = count
+        self._level_mult = 1 / math.log(m)
+        self._rng = random.Random(seed + count)
+
+    @classmethod
+    def build(
+        cls,
+        vectors: np.ndarray,
+        m: int = 16,
+        ef_construction: int = 100,
+        rows: Optional[Sequence[int]] = None,
+        seed: int = 0,
+    ) -> "HNSWGraph":
+        """rows(기본 전체)를 순서대로 삽입하여 그래프 생성"""
+        graph = cls(m=m, ef_construction=ef_construction, seed=seed)
+        graph._reserve(len(vectors))
+        for row in (range(len(vectors)) if rows is None else rows):
+            graph.insert(vectors, int(row))
+        return graph
+
+    def copy(self) -> "HNSWGraph":
+        """증분 삽입용 쓰기 가능한 복사본 (기존 인덱스를 읽는 질의에 영향 없음)"""
+        return HNSWGraph(
+            self.m,
+            self.ef_construction,
+            np.array(self.levels[:self.count]),
+            np.array(self.level0[:self.count]),
+            {node: links.copy() for node, links in self.upper.items()},
+            self.entry_point,
+            self.max_level,
+            self.count,
+        )
+
+    # ---- 삽입 ----
+
+    def insert(self, vectors: np.ndarray, row: int):
+        """행 하나를 그래프에 연결 (row는 기존 노드 수 이상이어야 함)"""
+        self._reserve(row + 1)
+        query = np.asarray(vectors[row], dtype=np.float32)
+        level = int(-math.log(1.0 - self._rng.random()) * self._level_mult)
+        self.levels[row] = level
+        self.count = max(self.count, row + 1)
+        if level > 0:
+            self.upper[row] = np.full((level, self.m), -1, dtype=np.int32)
+
+        if self.entry_point < 0:
+            self.entry_point, self.max_level = row, level
+            return
+
+        entry = [(self._similarity(vectors, query, self.entry_point), self.entry_point)]
+        for lvl in range(self.max_level, level, -1):
+            entry = self._search_layer(vectors, query, entry, 1, lvl)[:1]
+
+        for lvl in range(min(level, self.max_level), -1, -1):
+            found = self._search_layer(vectors, query, entry, self.ef_construction, lvl)
+            neighbours = self._select(vectors, found, self.m)
+            self._set_links(row, lvl, neighbours)
+            for node in neighbours:
+                self._connect(vectors, node, row, lvl)
+            entry = found
+
+        if level > self.max_level:
+            self.entry_point, self.max_level = row, level
+
+    def _reserve(self, size: int):
+        """배열 용량 확보 (mmap 읽기 전용 배열이면 메모리로 복사, 두 배씩 증가)"""
+        capacity = len(self.level0)
+        if size <= capacity and self.level0.flags.writeable and self.levels.flags.writeable:
+            return
+
+        capacity = max(size, capacity * 2 if size > capacity else capacity, 1024)
+        level0 = np.full((capacity, self.m0), -1, dtype=np.int32)
+        level0[:self.count] = self.level0[:self.count]
+        levels = np.zeros(capacity, dtype=np.int8)
+        levels[:self.count] = self.levels[:self.count]
+        self.level0, self.levels = level0, levels
+
+    def _connect(self, vectors: np.ndarray, node: int, new: int, level: int):
+        """node -> new 역방향 연결 (이웃 수 초과 시 heuristic으로 다시 선택)"""
+        links = self._links(node, level)
+        width = self.m0 if level == 0 else self.m
+        if len(links) < width:
+            self._set_links(node, level, list(links) + [new])
+            return
+
+        candidates = np.append(links, new)
+        base = np.asarray(vectors[node], dtype=np.float32)
+        sims = np.asarray(vectors[candidates]) @ base
+        ordered = sorted(zip(sims.tolist(), candidates.tolist()), reverse=True)
+        self._set_links(node, level, self._select(vectors, ordered, width))
+
+    def _select(self, vectors: np.ndarray, candidates: List[Candidate], limit: int) -> List[int]:
+        """
+        이웃 선택 heuristic
+
+        유사도 순으로 보면서, 이미 고른 이웃과의 유사도보다 기준점과의 유사도가
+        높은 후보만 선택 -> 한쪽 군집에 몰리지 않고 여러 방향으로 연결
+        (부족하면 남은 후보 중 가까운 순으로 채움)
+        """
+        if len(candidates) <= limit:
+            return [node for _, node in candidates]
+
+        nodes = [node for _, node in candidates]
+        block = np.asarray(vectors[nodes], dtype=np.float32)
+        pairwise = (block @ block.T).tolist()
+        # closest[i]: 후보 i와 지금까지 고른 이웃 중 가장 높은 유사도
+        closest = [-math.inf] * len(nodes)
+        chosen: List[int] = []
+        for i, (sim, _) in enumerate(candidates):
+            if len(chosen) >= limit:
+                break
+            if sim > closest[i]:
+                chosen.append(i)
+                closest = [max(a, b) for a, b in zip(closest, pairwise[i])]
+
+        if len(chosen) < limit:
+            chosen_set = set(chosen)
+            chosen += [i for i in range(len(nodes)) if i not in chosen_set][:limit - len(chosen)]
+        return [nodes[i] for i in chosen]
+
+    # ---- 검색 ----
+
+    def search(
+        self,
+        vectors: np.ndarray,
+        query: np.ndarray,
+        k: int,
+        ef: int = 64,
+        tombstones: Optional[np.ndarray] = None,
+    ) -> List[Tuple[int, float]]:
+        """근사 top-k (행 번호, 유사도) - tombstone 행은 결과에서 제외"""
+        if self.entry_point < 0:
+            return []
+
+        entry = [(self._similarity(vectors, query, self.entry_point), self.entry_point)]
+        for lvl in range(self.max_level, 0, -1):
+            entry = self._search_layer(vectors, query, entry, 1, lvl)[:1]
+        found = self._search_layer(vectors, query, entry, max(ef, k), 0)
+
+        results = []
+        for sim, node in found:
+            if tombstones is not None and tombstones[node]:
+                continue
+            results.append((node, sim))
+            if len(results) == k:
+                break
+        return results
+
+    def _search_layer(
+        self,
+        vectors: np.ndarray,
+        query: np.ndarray,
+        entry: List[Candidate],
+        ef: int,
+        level: int,
+    ) -> List[Candidate]:
+        """한 레벨에서 ef개 후보를 유지하며 탐색 (유사도 내림차순 반환)"""
+        visited = {node for _, node in entry}
+        candidates = [(-sim, node) for sim, node in entry]  # 가장 가까운 것부터 확장
+        heapq.heapify(candidates)
+        results = list(entry)  # 가장 먼 것이 맨 앞 (min-heap)
+        heapq.heapify(results)
+
+        heappush, heappop = heapq.heappush, heapq.heappop
+        links = self.level0 if level == 0 else None
+        while candidates:
+            neg_sim, node = heappop(candidates)
+            if -neg_sim < results[0][0] and len(results) >= ef:
+                break
+
+            row = links[node] if links is not None else self.upper[node][level - 1]
+            neighbours = [n for n in row.tolist() if n >= 0 and n not in visited]
+            if not neighbours:
+                continue
+            visited.update(neighbours)
+            sims = (np.asarray(vectors[neighbours]) @ query).tolist()
+
+            for sim, neighbour in zip(sims, neighbours):
+                if len(results) < ef or sim > results[0][0]:
+                    heappush(candidates, (-sim, neighbour))
+                    heappush(results, (sim, neighbour))
+                    if len(results) > ef:
+                        heappop(results)
+
+        return sorted(results, reverse=True)
+
+    def _links(self, node: int, level: int) -> np.ndarray:
+        row = self.level0[node] if level == 0 else self.upper[node][level - 1]
+        return row[row >= 0]
+
+    def _set_links(self, node: int, level: int, links: List[int]):
+        target = self.level0[node] if level == 0 else self.upper[node][level - 1]
+        target[:] = -1
+        target[:len(links)] = links
+
+    @staticmethod
+    def _similarity(vectors: np.ndarray, query: np.ndarray, node: int) -> float:
+        return float(np.asarray(vectors[node]) @ query)
+
+    # ---- 저장 ----
+
+    @property
+    def nbytes(self) -> int:
+        upper = sum(links.nbytes for links in self.upper.values())
+        return self.level0[:self.count].nbytes + self.levels[:self.count].nbytes + upper
+
+    def write_files(self, directory: str):
+        with open(os.path.join(directory, HNSW_META_FILE), "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "m": self.m,
+                    "ef_construction": self.ef_construction,
+                    "entry_point": self.entry_point,
+                    "max_level": self.max_level,
+                    "count": self.count,
+                },
+                f,
+            )
+        np.save(os.path.join(directory, HNSW_LEVELS_FILE), self.levels[:self.count])
+        np.save(os.path.join(directory, HNSW_LEVEL0_FILE), self.level0[:self.count])
+
+        # 상위 레벨은 (노드 수, 최대 레벨, M) 배열로 패딩하여 저장
+        nodes = np.array(sorted(self.upper), dtype=np.int32)
+        upper = np.full((len(nodes), max(self.max_level, 1), self.m), -1, dtype=np.int32)
+        for i, node in enumerate(nodes.tolist()):
+            links = self.upper[node]
+            upper[i, :len(links)] = links
+        np.save(os.path.join(directory, HNSW_UPPER_NODES_FILE), nodes)
+        np.save(os.path.join(directory, HNSW_UPPER_FILE), upper)
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> Optional["HNSWGraph"]:
+        """저장된 그래프 로드 (없으면 None) - level 0 이웃 배열은 mmap"""
+        meta_path = os.path.join(path, HNSW_META_FILE)
+        if not os.path.exists(meta_path):
+            return None
+
+        with open(meta_path, encoding="utf-8") as f:
+            meta = json.load(f)
+        mode = "r" if mmap else None
+        levels = np.load(os.path.join(path, HNSW_LEVELS_FILE), mmap_mode=mode)
+        level0 = np.load(os.path.join(path, HNSW_LEVEL0_FILE), mmap_mode=mode)
+        nodes = np.load(os.path.join(path, HNSW_UPPER_NODES_FILE))
+        upper_links = np.load(os.path.join(path, HNSW_UPPER_FILE))
+        upper = {
+            node: upper_links[i, :levels[node]].copy()
+            for i, node in enumerate(nodes.tolist())
+        }
+
+        return cls(
+            m=meta["m"],
+            ef_construction=meta["ef_construction"],
+            levels=levels,
+            level0=level0,
+            upper=upper,
+            entry_point=meta["entry_point"],
+            max_level=meta["max_level"],
+            count=meta["count"],
+        )
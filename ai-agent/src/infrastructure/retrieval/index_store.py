@@ -0,0 +1,124 @@
+"""
+Versioned on-disk layout for retrieval indexes
+"""
+import os
+import shutil
+import time
+import uuid
+from typing import Callable, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: msvcrt 잠금으로 대체
+    fcntl = None
+    import msvcrt
+
+
+CURRENT_FILE = "CURRENT"
+LOCK_FILE = ".lock"
+VERSION_PREFIX = "v-"
+# 교체 직후에도 이전 버전을 mmap으로 읽고 있는 프로세스가 있으므로 최근 버전 몇 개는 남김
+KEEP_VERSIONS = 3
+
+
+def atomic_write_dir(path: str, write: Callable[[str], None]) -> str:
+    """
+    새 버전 디렉터리(path/v-...)에 인덱스 파일을 모두 쓴 뒤 포인터 파일(path/CURRENT)을 교체
+
+    - 포인터는 임시 파일 + os.replace로 바꾸므로 읽는 쪽은 항상 완전한 이전/새 버전 중 하나를 봄
+    - 버전 디렉터리 이름은 프로세스마다 달라 동시에 저장해도 충돌하지 않음 (마지막 교체가 유효)
+
+    Returns:
+        새 버전 디렉터리 경로
+    """
+    os.makedirs(path, exist_ok=True)
+    name = f"{VERSION_PREFIX}{time.time_ns():020d}-{uuid.uuid4().hex[:8]}"
+    version_path = os.path.join(path, name)
+    os.makedirs(version_path)
+
+    try:
+        write(version_path)
+    except BaseException:
+        shutil.rmtree(version_path, ignore_errors=True)
+        raise
+
+    pointer_tmp = os.path.join(path, f"{CURRENT_FILE}.{name}.tmp")
+    with open(pointer_tmp, "w", encoding="utf-8") as f:
+        f.write(name)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(pointer_tmp, os.path.join(path, CURRENT_FILE))
+
+    _prune_versions(path, name)
+    return version_path
+
+
+def resolve_index_dir(path: str) -> Optional[str]:
+    """
+    현재 버전 디렉터리 경로 (없으면 None)
+
+    포인터가 없으면 path 자체 (버전 디렉터리를 직접 넘긴 경우 / 이전 단일 디렉터리 형식)
+    """
+    try:
+        with open(os.path.join(path, CURRENT_FILE), encoding="utf-8") as f:
+            name = f.read().strip()
+    except FileNotFoundError:
+        return path if os.path.isdir(path) else None
+
+    version_path = os.path.join(path, name)
+    return version_path if name and os.path.isdir(version_path) else None
+
+
+def _prune_versions(path: str, current: str):
+    """현재 버전 외 오래된 버전 디렉터리 정리 (최근 KEEP_VERSIONS개는 유지)"""
+    versions = sorted(
+        entry for entry in os.listdir(path)
+        if entry.startswith(VERSION_PREFIX) and entry != current
+    )
+    for entry in versions[:max(len(versions) - (KEEP_VERSIONS - 1), 0)]:
+        shutil.rmtree(os.path.join(path, entry), ignore_errors=True)
+
+
+class IndexLock:
+    """
+    인덱스 디렉터리 프로세스 간 배타 잠금 (path/.lock)
+
+    여러 uvicorn 워커가 동시에 시작해도 수집/저장은 한 번에 한 프로세스만 수행
+    acquire는 블로킹이므로 이벤트 루프에서는 asyncio.to_thread로 호출
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = None
+
+    def acquire(self):
+        os.makedirs(self.path, exist_ok=True)
+        file = open(os.path.join(self.path, LOCK_FILE), "a+")
+        try:
+            if fcntl is not None:
+                fcntl.flock(file.fileno(), fcntl.LOCK_EX)
+            else:
+                file.seek(0)
+                while True:
+                    try:
+                        msvcrt.locking(file.fileno(), msvcrt.LK_LOCK, 1)
+                        break
+                    except OSError:
+                        continue  # LK_LOCK은 약 10초 후 실패하므로 다시 대기
+        except BaseException:
+            file.close()
+            raise
+        self._file = file
+
+    def release(self):
+        if self._file is None:
+            return
+        try:
+            if fcntl is not None:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+            else:
+                self._file.seek(0)
+                msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+        finally:
+            self._file.close()
+            self._file = None
@@ -0,0 +1,132 @@
+"""
+Posting-list indexes over chunk metadata for pre-filtered retrieval
+"""
+import os
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from domain.models.document import DocumentChunk
+
+
+DOC_TYPES = {".md": "markdown", ".markdown": "markdown", ".txt": "text", ".rst": "rst"}
+
+EXTENSION_LANGUAGES = {
+    ".py": "python", ".java": "java", ".kt": "kotlin", ".go": "go", ".rs": "rust",
+    ".js": "javascript", ".jsx": "javascript", ".ts": "typescript", ".tsx": "typescript",
+    ".c": "c", ".h": "c", ".cpp": "cpp", ".cs": "csharp", ".rb": "ruby", ".php": "php",
+    ".swift": "swift", ".scala": "scala", ".sql": "sql", ".sh": "shell",
+}
+
+
+def chunk_attributes(chunk: DocumentChunk) -> Dict[str, str]:
+    """
+    필터 대상 속성 (값은 소문자 문자열)
+
+    - path / doc_type / language: doc_id(상대 경로)와 확장자에서 유도
+    - section / title: 청크 필드
+    - 그 외 chunk.metadata의 스칼라 값 (repo 등, 같은 키가 있으면 유도 값보다 우선)
+    """
+    extension = os.path.splitext(chunk.doc_id)[1].lower()
+    attributes = {
+        "path": chunk.doc_id.replace(os.sep, "/"),
+        "doc_type": DOC_TYPES.get(extension, extension.lstrip(".") or "text"),
+        "section": chunk.section,
+        "title": chunk.title,
+    }
+    if extension in EXTENSION_LANGUAGES:
+        attributes["language"] = EXTENSION_LANGUAGES[extension]
+    for key, value in chunk.metadata.items():
+        if isinstance(value, (str, int, float, bool)):
+            attributes[key] = str(value)
+    return {key: value.lower() for key, value in attributes.items() if value}
+
+
+class MetadataIndex:
+    """
+    청크 메타데이터 역색인 (필드 -> 값 -> 행 번호 posting list)
+
+    검색 전에 필터를 비트맵(행 수 길이 bool 배열)으로 만들어
+    조건을 만족하는 행만 유사도/BM25 점수를 계산하도록 전달
+
+    필터 형식 ({"path": "server/*", "language": ["java", "kotlin"]})
+    - 필드 사이는 AND, 값 목록은 OR
+    - 값이 '*'로 끝나면 접두사 일치 (경로 디렉터리, 상위 섹션 등)
+      path는 중간 디렉터리 경계에서 시작해도 일치
+    """
+
+    def __init__(
+        self,
+        postings: Dict[str, Dict[str, np.ndarray]],
+        size: int,
+        directories: Optional[Dict[str, np.ndarray]] = None,
+    ):
+        self.postings = postings
+        self.size = size
+        # "server/" -> 경로 중간 어디든 server/ 디렉터리를 지나는 행 (path 접두사 필터용)
+        self.directories = directories or {}
+
+    @classmethod
+    def build(
+        cls, chunks: List[DocumentChunk], tombstones: Optional[np.ndarray] = None
+    ) -> "MetadataIndex":
+        rows: Dict[str, Dict[str, List[int]]] = {}
+        directory_rows: Dict[str, List[int]] = {}
+        for row, chunk in enumerate(chunks):
+            if tombstones is not None and tombstones[row]:
+                continue
+            attributes = chunk_attributes(chunk)
+            for field, value in attributes.items():
+                rows.setdefault(field, {}).setdefault(value, []).append(row)
+            for directory in _directory_suffixes(attributes["path"]):
+                directory_rows.setdefault(directory, []).append(row)
+
+        postings = {
+            field: {value: np.array(ids, dtype=np.int32) for value, ids in values.items()}
+            for field, values in rows.items()
+        }
+        directories = {
+            directory: np.array(ids, dtype=np.int32) for directory, ids in directory_rows.items()
+        }
+        return cls(postings, len(chunks), directories)
+
+    def mask(self, filters: Optional[Dict[str, Any]]) -> Optional[np.ndarray]:
+        """필터를 만족하는 행 비트맵 (필터가 없으면 None, 없는 필드는 일치 없음)"""
+        if not filters:
+            return None
+
+        allowed = np.ones(self.size, dtype=bool)
+        for field, wanted in filters.items():
+            values = self.postings.get(field, {})
+            field_mask = np.zeros(self.size, dtype=bool)
+            for pattern in wanted if isinstance(wanted, (list, tuple, set)) else [wanted]:
+                pattern = str(pattern).lower()
+                if field == "path" and pattern.endswith("/*") and pattern[:-1] in self.directories:
+                    field_mask[self.directories[pattern[:-1]]] = True
+                elif pattern.endswith("*"):
+                    prefix = pattern[:-1]
+                    for value, ids in values.items():
+                        # 경로는 소스 루트가 달라도 디렉터리 경계에서 일치하면 포함 ("server/*")
+                        if value.startswith(prefix) or (field == "path" and f"/{prefix}" in value):
+                            field_mask[ids] = True
+                elif pattern in values:
+                    field_mask[values[pattern]] = True
+            allowed &= field_mask
+        return allowed
+
+    def get_stats(self) -> Dict[str, int]:
+        """필드별 서로 다른 값 수"""
+        return {
+            **{field: len(values) for field, values in self.postings.items()},
+            "directories": len(self.directories),
+        }
+
+
+def _directory_suffixes(path: str) -> List[str]:
+    """"a/b/c.py" -> ["a/", "a/b/", "b/"] (각 디렉터리 경계에서 시작하는 디렉터리 경로)"""
+    parts = path.split("/")[:-1]
+    return [
+        "/".join(parts[start:end]) + "/"
+        for start in range(len(parts))
+        for end in range(start + 1, len(parts) + 1)
+    ]
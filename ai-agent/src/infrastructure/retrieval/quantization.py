@@ -0,0 +1,230 @@
+"""
+Compressed vector codes for approximate scoring (int8 scalar / product quantization)
+"""
+import json
+import os
+from abc import ABC, abstractmethod
+from typing import Optional
+
+import numpy as np
+
+
+QUANT_META_FILE = "quant_meta.json"
+QUANT_CODES_FILE = "quant_codes.npy"
+QUANT_PARAMS_FILE = "quant_params.npy"
+
+QUANTIZATION_KINDS = ("none", "int8", "pq")
+
+# 블록 단위로 코드를 float로 풀어 점수를 계산 (변환 버퍼가 CPU 캐시에 머무는 크기)
+SCORE_BLOCK_ROWS = 4096
+
+
+class Quantizer(ABC):
+    """
+    압축 코드 + 복원 파라미터
+
+    근사 점수로 후보를 고른 뒤 원본 float 벡터(mmap)에서 후보 행만 읽어
+    정확한 점수로 재정렬하는 용도 (원본 전체를 메모리에 올리지 않음)
+    """
+
+    kind: str
+    codes: np.ndarray
+    params: np.ndarray
+
+    @classmethod
+    @abstractmethod
+    def train(cls, vectors: np.ndarray, **options) -> "Quantizer":
+        ...
+
+    @abstractmethod
+    def encode(self, vectors: np.ndarray) -> np.ndarray:
+        ...
+
+    @abstractmethod
+    def scores(self, queries: np.ndarray) -> np.ndarray:
+        """(Q, dim) 정규화 질의 -> (Q, N) 근사 내적"""
+
+    @abstractmethod
+    def with_codes(self, codes: np.ndarray) -> "Quantizer":
+        """같은 파라미터에 다른 코드 (증분 추가/compact 시 재학습 없이 사용)"""
+
+    def append(self, vectors: np.ndarray) -> "Quantizer":
+        return self.with_codes(np.concatenate([np.asarray(self.codes), self.encode(vectors)]))
+
+    def select(self, rows: np.ndarray) -> "Quantizer":
+        return self.with_codes(np.asarray(self.codes)[rows])
+
+    @property
+    def nbytes(self) -> int:
+        return self.codes.nbytes + self.params.nbytes
+
+    def write_files(self, directory: str):
+        with open(os.path.join(directory, QUANT_META_FILE), "w", encoding="utf-8") as f:
+            json.dump({"kind": self.kind}, f)
+        np.save(os.path.join(directory, QUANT_CODES_FILE), np.ascontiguousarray(self.codes))
+        np.save(os.path.join(directory, QUANT_PARAMS_FILE), self.params)
+
+
+class ScalarQuantizer(Quantizer):
+    """
+    int8 스칼라 양자화 (차원별 대칭 스케일)
+
+    벡터당 dim bytes (float32 대비 1/4), 질의에 스케일을 곱해 두면
+    점수 = int8 코드 @ (질의 * 스케일)
+    """
+
+    kind = "int8"
+
+    def __init__(self, scale: np.ndarray, codes: np.ndarray):
+        self.params = scale.astype(np.float32)
+        self.codes = codes
+
+    @classmethod
+    def train(cls, vectors: np.ndarray, **options) -> "ScalarQuantizer":
+        scale = np.abs(vectors).max(axis=0) / 127 if len(vectors) else np.ones(vectors.shape[1])
+        scale[scale == 0] = 1.0
+        quantizer = cls(scale, np.zeros((0, vectors.shape[1]), dtype=np.int8))
+        return quantizer.with_codes(quantizer.encode(vectors))
+
+    def encode(self, vectors: np.ndarray) -> np.ndarray:
+        return np.clip(np.rint(vectors / self.params), -127, 127).astype(np.int8)
+
+    def scores(self, queries: np.ndarray) -> np.ndarray:
+        scaled = (queries * self.params).T  # (dim, Q)
+        scores = np.empty((len(queries), len(self.codes)), dtype=np.float32)
+        for start in range(0, len(self.codes), SCORE_BLOCK_ROWS):
+            block = self.codes[start:start + SCORE_BLOCK_ROWS].astype(np.float32)
+            scores[:, start:start + len(block)] = (block @ scaled).T
+        return scores
+
+    def with_codes(self, codes: np.ndarray) -> "ScalarQuantizer":
+        return ScalarQuantizer(self.params, codes)
+
+
+class ProductQuantizer(Quantizer):
+    """
+    Product quantization
+
+    - 벡터를 subspaces개 부분 벡터로 나누고 부분 공간마다 256개 중심(k-means)으로 코드화
+      -> 벡터당 subspaces bytes (384차원, 48 subspaces면 float32 대비 1/32)
+    - 질의 시 부분 공간별 (질의 부분 벡터 · 중심) 표를 만들고 코드로 조회해 합산 (ADC)
+    """
+
+    kind = "pq"
+
+    def __init__(self, codebooks: np.ndarray, codes: np.ndarray):
+        self.params = codebooks.astype(np.float32)  # (subspaces, 256, sub_dim)
+        self.codes = codes
+
+    @classmethod
+    def train(
+        cls,
+        vectors: np.ndarray,
+        subspaces: int = 48,
+        iterations: int = 10,
+        sample_size: int = 256 * 40,  # 중심당 약 40개 표본이면 코드북 품질이 수렴
+        seed: int = 0,
+        **options,
+    ) -> "ProductQuantizer":
+        dim = vectors.shape[1]
+        if dim % subspaces:
+            raise ValueError(f"dim {dim} is not divisible by pq subspaces {subspaces}")
+
+        rng = np.random.default_rng(seed)
+        sample = np.asarray(vectors)
+        if len(sample) > sample_size:
+            sample = sample[np.sort(rng.choice(len(sample), sample_size, replace=False))]
+        sub_dim = dim // subspaces
+        codebooks = np.stack([
+            _kmeans(sample[:, j * sub_dim:(j + 1) * sub_dim], 256, iterations, rng)
+            for j in range(subspaces)
+        ])
+
+        quantizer = cls(codebooks, np.zeros((0, subspaces), dtype=np.uint8))
+        return quantizer.with_codes(quantizer.encode(vectors))
+
+    @property
+    def subspaces(self) -> int:
+        return self.params.shape[0]
+
+    def encode(self, vectors: np.ndarray) -> np.ndarray:
+        sub_dim = self.params.shape[2]
+        codes = np.empty((len(vectors), self.subspaces), dtype=np.uint8)
+        for start in range(0, len(vectors), SCORE_BLOCK_ROWS):
+            block = np.asarray(vectors[start:start + SCORE_BLOCK_ROWS], dtype=np.float32)
+            for j, centroids in enumerate(self.params):
+                codes[start:start + len(block), j] = _nearest(
+                    block[:, j * sub_dim:(j + 1) * sub_dim], centroids
+                )
+        return codes
+
+    def scores(self, queries: np.ndarray) -> np.ndarray:
+        sub_dim = self.params.shape[2]
+        # (Q, subspaces, 256) 질의 부분 벡터와 각 중심의 내적 표
+        tables = np.einsum(
+            "qjd,jkd->qjk", queries.reshape(len(queries), self.subspaces, sub_dim), self.params
+        )
+        scores = np.zeros((len(queries), len(self.codes)), dtype=np.float32)
+        for start in range(0, len(self.codes), SCORE_BLOCK_ROWS):
+            block = np.asarray(self.codes[start:start + SCORE_BLOCK_ROWS])
+            out = scores[:, start:start + len(block)]
+            for j in range(self.subspaces):
+                out += tables[:, j, block[:, j]]
+        return scores
+
+    def with_codes(self, codes: np.ndarray) -> "ProductQuantizer":
+        return ProductQuantizer(self.params, codes)
+
+
+def _nearest(vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    """L2 거리 최근접 중심 (||c||^2 - 2 x·c 최소)"""
+    distances = (centroids ** 2).sum(axis=1) - 2 * vectors @ centroids.T
+    return distances.argmin(axis=1)
+
+
+def _kmeans(
+    vectors: np.ndarray, clusters: int, iterations: int, rng: np.random.Generator
+) -> np.ndarray:
+    vectors = np.asarray(vectors, dtype=np.float32)
+    if len(vectors) == 0:
+        return np.zeros((clusters, vectors.shape[1]), dtype=np.float32)
+
+    # 표본이 중심 수보다 적으면 중복 허용 (빈 클러스터는 기존 중심 유지)
+    picks = rng.choice(len(vectors), clusters, replace=len(vectors) < clusters)
+    centroids = vectors[picks].copy()
+    for _ in range(iterations):
+        assignment = _nearest(vectors, centroids)
+        counts = np.bincount(assignment, minlength=clusters)
+        sums = np.stack(
+            [np.bincount(assignment, weights=vectors[:, d], minlength=clusters)
+             for d in range(vectors.shape[1])],
+            axis=1,
+        )
+        filled = counts > 0
+        centroids[filled] = sums[filled] / counts[filled, None]
+    return centroids
+
+
+QUANTIZERS = {"int8": ScalarQuantizer, "pq": ProductQuantizer}
+
+
+def train_quantizer(kind: str, vectors: np.ndarray, pq_subspaces: int = 48) -> Optional[Quantizer]:
+    """kind에 맞는 양자화기 학습 + 전체 벡터 인코딩 ("none"이면 None)"""
+    if kind == "none":
+        return None
+    if kind not in QUANTIZERS:
+        raise ValueError(f"Unknown quantization: {kind} (expected one of {QUANTIZATION_KINDS})")
+    return QUANTIZERS[kind].train(np.asarray(vectors, dtype=np.float32), subspaces=pq_subspaces)
+
+
+def load_quantizer(path: str, mmap: bool = True) -> Optional[Quantizer]:
+    """저장된 양자화 코드 로드 (없으면 None)"""
+    meta_path = os.path.join(path, QUANT_META_FILE)
+    if not os.path.exists(meta_path):
+        return None
+
+    with open(meta_path, encoding="utf-8") as f:
+        kind = json.load(f)["kind"]
+    codes = np.load(os.path.join(path, QUANT_CODES_FILE), mmap_mode="r" if mmap else None)
+    params = np.load(os.path.join(path, QUANT_PARAMS_FILE))
+    return QUANTIZERS[kind](params, codes)
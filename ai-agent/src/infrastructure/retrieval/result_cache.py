@@ -0,0 +1,116 @@
+"""
+Byte-bounded LRU cache of retrieval results keyed by index version
+"""
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from infrastructure.external.search_cache import SearchCache
+
+
+# 항목당 고정 비용 (키, OrderedDict 노드, 배열 헤더 등의 대략치)
+ENTRY_OVERHEAD_BYTES = 256
+
+
+class RetrievalCache:
+    """
+    RAG 검색 결과 캐시 (프로세스 메모리)
+
+    - 키: 정규화 질의 + 필터 + k + 인덱스 버전
+      (질의 임베딩과 검색을 모두 생략, 결과는 해당 버전 인덱스의 (행, 점수)로 저장)
+    - 증분 수집으로 새 버전이 교체되면 이전 버전 항목은 invalidate()로 한 번에 제거
+    - 저장된 결과의 바이트 합계가 max_bytes를 넘으면 가장 오래 사용되지 않은 항목부터 제거
+    """
+
+    def __init__(self, max_bytes: int = 16 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._data: "OrderedDict[str, Tuple[int, np.ndarray, np.ndarray]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def make_key(query: str, k: int, version: int, filters: Optional[Dict[str, Any]] = None) -> str:
+        raw = json.dumps(
+            {
+                "query": SearchCache.normalize_query(query),
+                "filters": filters or {},
+                "k": k,
+                "version": version,
+            },
+            ensure_ascii=False,
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[List[Tuple[int, float]]]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+        _, rows, scores = entry
+        return list(zip(rows.tolist(), scores.tolist()))
+
+    def set(self, key: str, version: int, hits: List[Tuple[int, float]]):
+        rows = np.array([row for row, _ in hits], dtype=np.int32)
+        scores = np.array([score for _, score in hits], dtype=np.float32)
+        size = self._entry_bytes(rows, scores)
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            previous = self._data.pop(key, None)
+            if previous is not None:
+                self._bytes -= self._entry_bytes(previous[1], previous[2])
+            self._data[key] = (version, rows, scores)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, (_, old_rows, old_scores) = self._data.popitem(last=False)
+                self._bytes -= self._entry_bytes(old_rows, old_scores)
+                self.evictions += 1
+
+    def invalidate(self, current_version: Optional[int] = None) -> int:
+        """current_version이 아닌 항목 제거, None이면 전체 제거 (제거된 항목 수)"""
+        with self._lock:
+            stale = [
+                key for key, (version, _, _) in self._data.items()
+                if current_version is None or version != current_version
+            ]
+            for key in stale:
+                _, rows, scores = self._data.pop(key)
+                self._bytes -= self._entry_bytes(rows, scores)
+            self.invalidations += len(stale)
+        return len(stale)
+
+    @staticmethod
+    def _entry_bytes(rows: np.ndarray, scores: np.ndarray) -> int:
+        return rows.nbytes + scores.nbytes + ENTRY_OVERHEAD_BYTES
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """캐시 통계"""
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._data),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
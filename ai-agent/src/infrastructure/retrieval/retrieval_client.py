@@ -0,0 +1,127 @@
+"""
+Client for the standalone local retrieval server (Unix socket or localhost HTTP)
+"""
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+from domain.models.document import RetrievalRequest, RetrievalResponse, RetrievedChunk
+from utils.logger import logger
+
+
+UNIX_SCHEME = "unix://"
+RETRIEVAL_API_PREFIX = "/api/retrieval"
+
+
+def parse_server_url(url: str) -> Tuple[str, Optional[str]]:
+    """
+    서버 주소 -> (base_url, Unix 소켓 경로)
+
+    - "unix:///tmp/rag.sock": Unix 도메인 소켓 (Host 헤더용 base_url은 고정값)
+    - "http://127.0.0.1:8100": localhost HTTP
+    """
+    if url.startswith(UNIX_SCHEME):
+        return "http://retrieval", url[len(UNIX_SCHEME):]
+    return url.rstrip("/"), None
+
+
+class RetrievalClient:
+    """
+    retrieval 서버 클라이언트
+
+    인덱스는 서버 프로세스 하나가 mmap으로 소유하고, 각 프로세스(uvicorn 워커, 에이전트)는
+    DocumentRetriever 대신 이 클라이언트로 같은 retrieve() 인터페이스를 사용
+    """
+
+    def __init__(self, url: str, timeout_seconds: float = 5.0):
+        self.url = url
+        self.base_url, self.socket_path = parse_server_url(url)
+        self.timeout_seconds = timeout_seconds
+        self._client: Optional[httpx.AsyncClient] = None
+
+        self.queries = 0
+        self.errors = 0
+        self.total_latency_ms = 0.0
+        self.index_version = 0
+
+    def _transport_kwargs(self) -> Dict[str, Any]:
+        return {"uds": self.socket_path} if self.socket_path else {}
+
+    def _async_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=self.timeout_seconds,
+                transport=httpx.AsyncHTTPTransport(**self._transport_kwargs()),
+            )
+        return self._client
+
+    async def initialize(self, rebuild: bool = False):
+        """서버 연결 확인 (인덱스 로드/수집은 서버가 담당)"""
+        try:
+            response = await self._async_client().get(f"{RETRIEVAL_API_PREFIX}/health")
+            response.raise_for_status()
+            self.index_version = response.json().get("index_version", 0)
+            logger.info(f"Retrieval server connected: {self.url} (v{self.index_version})")
+        except httpx.HTTPError as e:
+            # 서버가 늦게 뜰 수 있으므로 앱 시작은 막지 않음 (질의 시 다시 연결)
+            logger.warning(f"Retrieval server unavailable: {self.url} ({e})")
+
+    async def retrieve(
+        self, query: str, k: int = 5, filters: Optional[Dict[str, Any]] = None
+    ) -> List[RetrievedChunk]:
+        start = time.monotonic()
+        request = RetrievalRequest(query=query, k=k, filters=filters)
+        try:
+            response = await self._async_client().post(
+                f"{RETRIEVAL_API_PREFIX}/search", json=request.model_dump()
+            )
+            response.raise_for_status()
+        except httpx.HTTPError:
+            self.errors += 1
+            raise
+        finally:
+            self.queries += 1
+            self.total_latency_ms += (time.monotonic() - start) * 1000
+        return self._parse(response)
+
+    def retrieve_sync(
+        self, query: str, k: int = 5, filters: Optional[Dict[str, Any]] = None
+    ) -> List[RetrievedChunk]:
+        """동기 호출 (LangChain 도구 등 이벤트 루프 밖에서 사용)"""
+        request = RetrievalRequest(query=query, k=k, filters=filters)
+        with httpx.Client(
+            base_url=self.base_url,
+            timeout=self.timeout_seconds,
+            transport=httpx.HTTPTransport(**self._transport_kwargs()),
+        ) as client:
+            response = client.post(f"{RETRIEVAL_API_PREFIX}/search", json=request.model_dump())
+            response.raise_for_status()
+        return self._parse(response)
+
+    async def refresh(self) -> Dict[str, Any]:
+        """서버에 소스 변경분 재수집 요청"""
+        response = await self._async_client().post(f"{RETRIEVAL_API_PREFIX}/refresh")
+        response.raise_for_status()
+        return response.json()
+
+    def _parse(self, response: httpx.Response) -> List[RetrievedChunk]:
+        result = RetrievalResponse.model_validate(response.json())
+        self.index_version = result.index_version
+        return result.results
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """클라이언트 측 통계 (인덱스 통계는 서버 /stats)"""
+        return {
+            "server": self.url,
+            "index_version": self.index_version,
+            "queries": self.queries,
+            "errors": self.errors,
+            "avg_latency_ms": self.total_latency_ms / self.queries if self.queries else 0.0,
+        }
@@ -0,0 +1,152 @@
+"""
+In-process BM25 inverted index
+"""
+import json
+import os
+from collections import Counter
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from utils.bm25 import idf
+
+
+SPARSE_TERMS_FILE = "sparse_terms.json"
+SPARSE_OFFSETS_FILE = "sparse_offsets.npy"
+SPARSE_DOC_IDS_FILE = "sparse_doc_ids.npy"
+SPARSE_TFS_FILE = "sparse_tfs.npy"
+SPARSE_DOC_LENGTHS_FILE = "sparse_doc_lengths.npy"
+
+
+class SparseIndex:
+    """
+    BM25 역색인
+
+    - 용어별 posting(문서 행 번호, 빈도)을 하나의 연속 배열에 이어 붙이고
+      offsets로 구간을 찾음 (CSR 형태) -> .npy로 저장 후 mmap 로드
+    - 질의 시 질의 용어의 posting만 읽어 점수 배열에 벡터 연산으로 누적
+    - 토큰화는 utils.text_tokenizer (한글 bigram + 코드 식별자 분해)
+    - tombstone 처리된 행은 빈 토큰 목록으로 색인 (점수 0, 통계에서 제외)
+    """
+
+    def __init__(
+        self,
+        terms: Dict[str, int],
+        offsets: np.ndarray,
+        doc_ids: np.ndarray,
+        tfs: np.ndarray,
+        doc_lengths: np.ndarray,
+        k1: float = 1.5,
+        b: float = 0.75,
+    ):
+        self.terms = terms
+        self.offsets = offsets
+        self.doc_ids = doc_ids
+        self.tfs = tfs
+        self.doc_lengths = doc_lengths
+        self.k1 = k1
+        self.b = b
+
+        live = doc_lengths > 0
+        num_docs = int(live.sum())
+        avg_length = float(doc_lengths[live].mean()) if num_docs else 0.0
+        # 문서 길이 정규화 항은 질의와 무관하므로 미리 계산
+        self.length_norm = (
+            k1 * (1 - b + b * doc_lengths / (avg_length or 1.0))
+        ).astype(np.float32)
+        doc_freqs = np.diff(offsets)
+        self.idf = np.array(
+            [idf(num_docs, int(df)) for df in doc_freqs], dtype=np.float32
+        )
+
+    @classmethod
+    def build(cls, corpus: Sequence[List[str]], k1: float = 1.5, b: float = 0.75) -> "SparseIndex":
+        """토큰화된 문서 목록으로 역색인 생성"""
+        postings: Dict[str, List[Tuple[int, int]]] = {}
+        doc_lengths = np.zeros(len(corpus), dtype=np.float32)
+        for row, tokens in enumerate(corpus):
+            doc_lengths[row] = len(tokens)
+            for term, tf in Counter(tokens).items():
+                postings.setdefault(term, []).append((row, tf))
+
+        terms = {term: i for i, term in enumerate(sorted(postings))}
+        sizes = [len(postings[term]) for term in terms]
+        offsets = np.zeros(len(terms) + 1, dtype=np.int64)
+        np.cumsum(sizes, out=offsets[1:])
+
+        doc_ids = np.empty(int(offsets[-1]), dtype=np.int32)
+        tfs = np.empty(int(offsets[-1]), dtype=np.float32)
+        for term, i in terms.items():
+            start = offsets[i]
+            for j, (row, tf) in enumerate(postings[term]):
+                doc_ids[start + j] = row
+                tfs[start + j] = tf
+
+        return cls(terms, offsets, doc_ids, tfs, doc_lengths, k1, b)
+
+    @property
+    def size(self) -> int:
+        return len(self.doc_lengths)
+
+    def scores(self, query_tokens: List[str], allowed: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        전체 문서에 대한 BM25 점수 배열 (질의 용어가 없는 문서는 0)
+
+        allowed(행 비트맵)가 있으면 posting 중 허용된 행만 누적
+        """
+        scores = np.zeros(self.size, dtype=np.float32)
+        for term in set(query_tokens):
+            i = self.terms.get(term)
+            if i is None:
+                continue
+            start, end = self.offsets[i], self.offsets[i + 1]
+            rows = self.doc_ids[start:end]
+            tf = self.tfs[start:end]
+            if allowed is not None:
+                keep = allowed[rows]
+                rows, tf = rows[keep], tf[keep]
+            scores[rows] += self.idf[i] * tf * (self.k1 + 1) / (tf + self.length_norm[rows])
+        return scores
+
+    def search(
+        self, query_tokens: List[str], k: int = 5, allowed: Optional[np.ndarray] = None
+    ) -> List[Tuple[int, float]]:
+        """BM25 상위 k개 (행 번호, 점수) - 점수 0인 문서는 제외"""
+        scores = self.scores(query_tokens, allowed)
+        matched = np.flatnonzero(scores)
+        if len(matched) == 0:
+            return []
+
+        if len(matched) > k:
+            matched = matched[np.argpartition(-scores[matched], k - 1)[:k]]
+        order = np.argsort(-scores[matched])
+        return [(int(matched[i]), float(scores[matched[i]])) for i in order]
+
+    def write_files(self, directory: str):
+        """인덱스 파일을 디렉터리에 기록"""
+        with open(os.path.join(directory, SPARSE_TERMS_FILE), "w", encoding="utf-8") as f:
+            json.dump({"terms": list(self.terms), "k1": self.k1, "b": self.b}, f, ensure_ascii=False)
+        np.save(os.path.join(directory, SPARSE_OFFSETS_FILE), self.offsets)
+        np.save(os.path.join(directory, SPARSE_DOC_IDS_FILE), self.doc_ids)
+        np.save(os.path.join(directory, SPARSE_TFS_FILE), self.tfs)
+        np.save(os.path.join(directory, SPARSE_DOC_LENGTHS_FILE), self.doc_lengths)
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> Optional["SparseIndex"]:
+        """저장된 역색인 로드 (없으면 None)"""
+        terms_path = os.path.join(path, SPARSE_TERMS_FILE)
+        if not os.path.exists(terms_path):
+            return None
+
+        with open(terms_path, encoding="utf-8") as f:
+            meta = json.load(f)
+        mode = "r" if mmap else None
+        return cls(
+            terms={term: i for i, term in enumerate(meta["terms"])},
+            offsets=np.load(os.path.join(path, SPARSE_OFFSETS_FILE)),
+            doc_ids=np.load(os.path.join(path, SPARSE_DOC_IDS_FILE), mmap_mode=mode),
+            tfs=np.load(os.path.join(path, SPARSE_TFS_FILE), mmap_mode=mode),
+            doc_lengths=np.load(os.path.join(path, SPARSE_DOC_LENGTHS_FILE)),
+            k1=meta.get("k1", 1.5),
+            b=meta.get("b", 0.75),
+        )
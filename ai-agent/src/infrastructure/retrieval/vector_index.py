@@ -0,0 +1,269 @@
+"""
+In-process dense vector index backed by a contiguous NumPy matrix
+"""
+import json
+import os
+import time
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from domain.models.document import DocumentChunk
+from infrastructure.retrieval.embeddings import normalize
+from infrastructure.retrieval.hnsw_index import HNSWGraph
+from infrastructure.retrieval.index_store import atomic_write_dir, resolve_index_dir
+from infrastructure.retrieval.quantization import Quantizer, load_quantizer
+from utils.logger import logger
+
+
+VECTORS_FILE = "vectors.npy"
+TOMBSTONES_FILE = "tombstones.npy"
+CHUNKS_FILE = "chunks.jsonl"
+MANIFEST_FILE = "manifest.json"
+
+# 필터를 통과한 행이 이 비율보다 적으면 그래프 탐색이 후보를 충분히 못 찾으므로 전수 탐색
+FILTERED_GRAPH_MIN_FRACTION = 0.2
+
+# 필터 통과 행이 이 비율 이상이면 행을 모아 계산하는 것보다 전체 행렬 곱 + 마스크가 빠름
+# (비연속 행 복사 비용이 연속 행렬 곱보다 행당 몇 배 큼)
+FILTERED_FULL_SCAN_MIN_FRACTION = 0.2
+
+
+class VectorIndex:
+    """
+    Dense 벡터 인덱스
+
+    - 임베딩은 L2 정규화된 float32 (N, dim) 연속 배열 하나로 보관
+      -> 코사인 유사도 = 행렬-벡터 곱 한 번
+    - top-k는 argpartition으로 O(N) 선택 후 k개만 정렬
+    - 디스크에는 .npy로 저장하고 mmap으로 로드하여
+      여러 워커 프로세스가 같은 페이지 캐시를 복사 없이 공유
+    - 삭제/변경된 청크는 행을 지우지 않고 tombstone으로 표시하여
+      행 번호를 유지 (검색에서 제외, 비율이 커지면 compact)
+    - quantizer(int8 / PQ)가 있으면 압축 코드로 근사 점수를 계산해
+      k * rerank_multiplier개 후보만 원본 float 벡터에서 읽어 정확히 재정렬
+    - graph(HNSW)가 있으면 전수 탐색 대신 그래프 탐색 (ef_search개 후보 유지)
+    - 허용 행 목록(rows)을 받으면 해당 행만 점수 계산 (필터가 좁으면 그래프 대신 전수 탐색)
+    """
+
+    def __init__(
+        self,
+        vectors: np.ndarray,
+        chunks: List[DocumentChunk],
+        embedder_name: str = "",
+        tombstones: Optional[np.ndarray] = None,
+        version: int = 0,
+        quantizer: Optional[Quantizer] = None,
+        rerank_multiplier: int = 10,
+        graph: Optional[HNSWGraph] = None,
+        ef_search: int = 64,
+    ):
+        if len(vectors) != len(chunks):
+            raise ValueError(f"vectors ({len(vectors)}) and chunks ({len(chunks)}) size mismatch")
+        self.vectors = vectors
+        self.chunks = chunks
+        self.embedder_name = embedder_name
+        self.tombstones = (
+            tombstones if tombstones is not None else np.zeros(len(chunks), dtype=bool)
+        )
+        self.version = version
+        self.quantizer = quantizer
+        self.rerank_multiplier = rerank_multiplier
+        self.graph = graph
+        self.ef_search = ef_search
+
+    @classmethod
+    def build(
+        cls,
+        vectors: np.ndarray,
+        chunks: List[DocumentChunk],
+        embedder_name: str = "",
+        tombstones: Optional[np.ndarray] = None,
+        version: int = 0,
+    ) -> "VectorIndex":
+        """임베딩을 정규화된 연속 배열로 만들어 인덱스 생성"""
+        return cls(normalize(vectors), chunks, embedder_name, tombstones, version)
+
+    @property
+    def size(self) -> int:
+        return len(self.chunks)
+
+    @property
+    def live_count(self) -> int:
+        return self.size - int(self.tombstones.sum())
+
+    @property
+    def dim(self) -> int:
+        return self.vectors.shape[1] if self.vectors.ndim == 2 else 0
+
+    @property
+    def quantization(self) -> str:
+        return self.quantizer.kind if self.quantizer is not None else "none"
+
+    @property
+    def ann_index(self) -> str:
+        return "hnsw" if self.graph is not None else "flat"
+
+    def search(
+        self, query: np.ndarray, k: int = 5, rows: Optional[np.ndarray] = None
+    ) -> List[Tuple[int, float]]:
+        """코사인 유사도 상위 k개 (행 번호, 점수)"""
+        return self.search_batch(query.reshape(1, -1), k, rows)[0]
+
+    def search_batch(
+        self, queries: np.ndarray, k: int = 5, rows: Optional[np.ndarray] = None
+    ) -> List[List[Tuple[int, float]]]:
+        """
+        여러 질의를 행렬 곱 한 번으로 검색
+
+        rows가 있으면 해당 행만 점수 계산 (메타데이터 사전 필터)
+        """
+        if rows is not None:
+            rows = rows[~self.tombstones[rows]]
+        live_count = self.live_count if rows is None else len(rows)
+        if live_count == 0:
+            return [[] for _ in range(len(queries))]
+
+        queries = normalize(queries)
+        if self.graph is not None and (
+            rows is None or live_count >= FILTERED_GRAPH_MIN_FRACTION * self.size
+        ):
+            return self._search_graph(queries, k, rows)
+        if self.quantizer is not None:
+            return self._search_quantized(queries, k, live_count, rows)
+
+        excluded = self.tombstones if live_count < self.size else None
+        if rows is not None and live_count >= FILTERED_FULL_SCAN_MIN_FRACTION * self.size:
+            excluded = np.ones(self.size, dtype=bool)
+            excluded[rows] = False
+            rows = None
+
+        if rows is None:
+            scores = queries @ self.vectors.T  # (Q, N)
+            if excluded is not None:
+                scores[:, excluded] = -np.inf
+        else:
+            scores = queries @ np.asarray(self.vectors[rows]).T  # (Q, len(rows))
+        k = min(k, live_count)
+
+        if k < scores.shape[1]:
+            top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        else:
+            top = np.tile(np.arange(scores.shape[1]), (len(queries), 1))
+
+        results = []
+        for row, candidates in enumerate(top):
+            row_scores = scores[row, candidates]
+            order = np.argsort(-row_scores)
+            ids = candidates if rows is None else rows[candidates]
+            results.append(
+                [(int(ids[i]), float(row_scores[i])) for i in order]
+            )
+        return results
+
+    def _search_graph(
+        self, queries: np.ndarray, k: int, rows: Optional[np.ndarray]
+    ) -> List[List[Tuple[int, float]]]:
+        """그래프 탐색 (필터 밖 행은 tombstone처럼 건너뛰고 그만큼 ef를 늘림)"""
+        if rows is None:
+            excluded = self.tombstones if self.live_count < self.size else None
+            ef = self.ef_search
+        else:
+            excluded = np.ones(self.size, dtype=bool)
+            excluded[rows] = False
+            ef = int(np.ceil(self.ef_search * self.size / len(rows)))
+        return [
+            self.graph.search(self.vectors, query, k, ef, excluded)
+            for query in queries
+        ]
+
+    def _search_quantized(
+        self, queries: np.ndarray, k: int, live_count: int, rows: Optional[np.ndarray] = None
+    ) -> List[List[Tuple[int, float]]]:
+        """압축 코드 근사 점수로 후보 선택 -> 후보 행만 float 벡터로 정확 재정렬"""
+        if rows is None:
+            scores = self.quantizer.scores(queries)
+            if live_count < self.size:
+                scores[:, self.tombstones] = -np.inf
+        else:
+            scores = self.quantizer.select(rows).scores(queries)
+        num_candidates = min(max(k, k * self.rerank_multiplier), live_count)
+
+        if num_candidates < scores.shape[1]:
+            top = np.argpartition(-scores, num_candidates - 1, axis=1)[:, :num_candidates]
+        else:
+            top = np.tile(np.arange(scores.shape[1]), (len(queries), 1))
+
+        results = []
+        for row, candidates in enumerate(top):
+            # mmap에서 순서대로 읽도록 정렬 (rows도 오름차순이므로 순서 유지)
+            candidates = np.sort(candidates)
+            if rows is not None:
+                candidates = rows[candidates]
+            exact = np.asarray(self.vectors[candidates]) @ queries[row]
+            order = np.argsort(-exact)[:k]
+            results.append([(int(candidates[i]), float(exact[i])) for i in order])
+        return results
+
+    def save(self, path: str):
+        """새 버전 디렉터리에 저장 후 현재 버전으로 교체 (읽는 쪽은 반쯤 쓰인 파일을 보지 않음)"""
+        version_path = atomic_write_dir(path, self.write_files)
+        logger.info(f"Vector index saved: {version_path} ({self.size} chunks)")
+
+    def write_files(self, directory: str):
+        """인덱스 파일을 디렉터리에 기록 (교체는 호출자가 담당)"""
+        np.save(os.path.join(directory, VECTORS_FILE), np.ascontiguousarray(self.vectors))
+        np.save(os.path.join(directory, TOMBSTONES_FILE), self.tombstones)
+        if self.quantizer is not None:
+            self.quantizer.write_files(directory)
+        if self.graph is not None:
+            self.graph.write_files(directory)
+        with open(os.path.join(directory, CHUNKS_FILE), "w", encoding="utf-8") as f:
+            for chunk in self.chunks:
+                f.write(chunk.model_dump_json() + "\n")
+        with open(os.path.join(directory, MANIFEST_FILE), "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "count": self.size,
+                    "live": self.live_count,
+                    "dim": self.dim,
+                    "embedder": self.embedder_name,
+                    "version": self.version,
+                    "quantization": self.quantization,
+                    "ann_index": self.ann_index,
+                    "created_at": time.time(),
+                },
+                f,
+            )
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> Optional["VectorIndex"]:
+        """저장된 인덱스 로드 (현재 버전 디렉터리 기준, 없으면 None)"""
+        path = resolve_index_dir(path)
+        if path is None:
+            return None
+        manifest_path = os.path.join(path, MANIFEST_FILE)
+        if not os.path.exists(manifest_path):
+            return None
+
+        with open(manifest_path, encoding="utf-8") as f:
+            manifest = json.load(f)
+        vectors = np.load(os.path.join(path, VECTORS_FILE), mmap_mode="r" if mmap else None)
+        with open(os.path.join(path, CHUNKS_FILE), encoding="utf-8") as f:
+            chunks = [DocumentChunk.model_validate_json(line) for line in f if line.strip()]
+        tombstones_path = os.path.join(path, TOMBSTONES_FILE)
+        tombstones = np.load(tombstones_path) if os.path.exists(tombstones_path) else None
+
+        logger.info(
+            f"Vector index loaded: {path} (v{manifest.get('version', 0)}, "
+            f"{len(chunks)} chunks, mmap={mmap})"
+        )
+        return cls(
+            vectors,
+            chunks,
+            manifest.get("embedder", ""),
+            tombstones,
+            manifest.get("version", 0),
+            load_quantizer(path, mmap),
+            graph=HNSWGraph.load(path, mmap) if manifest.get("ann_index") == "hnsw" else None,
+        )
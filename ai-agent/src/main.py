@@ -3,6 +3,10 @@ from fastapi.middleware.cors import CORSMiddleware
 from controller.health_controller import router as health_router
 from controller.chat_controller import router as chat_router
 from config.settings import settings
+from config.dependencies import (
+    get_openai_client, get_tavily_client, get_rag_retriever, get_embedding_service
+)
+from infrastructure.retrieval.retrieval_client import RetrievalClient
 from utils.logger import logger
 
 
@@ -41,6 +45,15 @@ def create_app() -> FastAPI:
         # 의존성 검증
         # validate_dependencies()  # 추후 구현 필요
 
+        # OpenAI 커넥션 풀 예열 (첫 요청의 TLS 핸드셰이크 비용 제거)
+        await get_openai_client().warmup(settings.openai_warmup_connections)
+
+        # Tavily 검색 세션 생성 (요청 간 커넥션 재사용)
+        await get_tavily_client().start()
+
+        # RAG 벡터 인덱스 로드 (없으면 문서를 임베딩해 생성)
+        await get_rag_retriever().initialize()
+
         logger.info("✅ Application started successfully")
 
     # 종료 이벤트
@@ -48,6 +61,13 @@ def create_app() -> FastAPI:
     async def shutdown_event():
         logger.info("🛑 Shutting down application")
 
+        # 진행 중인 LLM 호출을 기다린 뒤 커넥션 풀과 캐시 DB 연결 정리
+        await get_openai_client().aclose(settings.openai_shutdown_drain_seconds)
+        await get_tavily_client().close()
+        await get_embedding_service().close()
+        if isinstance(get_rag_retriever(), RetrievalClient):
+            await get_rag_retriever().close()
+
     # 루트 엔드포인트
     @app.get("/")
     async def root():
@@ -58,6 +78,7 @@ def create_app() -> FastAPI:
             "docs": "/docs",
             "health": "/api/health",
             "chat": "/api/chat",
+            "chat_stream": "/api/chat/stream",
             "features": [
                 "LangGraph workflow orchestration",
                 "Multi-agent coordination",
@@ -0,0 +1,51 @@
+from fastapi import FastAPI
+from controller.retrieval_controller import router as retrieval_router
+from config.settings import settings
+from config.dependencies import (
+    get_document_retriever, get_embedding_service, get_retrieval_batcher
+)
+from utils.logger import logger
+
+
+def create_retrieval_app() -> FastAPI:
+    """
+    로컬 retrieval 서버 애플리케이션 팩토리
+
+    RAG 인덱스를 mmap으로 소유하는 단일 프로세스
+    채팅 앱의 uvicorn 워커와 이슈 분석 에이전트들은 rag_server_url로 이 서버를 호출
+    (프로세스마다 인덱스를 따로 로드하지 않음)
+    """
+    app = FastAPI(
+        title=f"{settings.app_name} Retrieval Server",
+        version=settings.app_version,
+        debug=settings.debug,
+    )
+    app.include_router(retrieval_router)
+
+    @app.on_event("startup")
+    async def startup_event():
+        # 인덱스 로드 (없으면 문서를 임베딩해 생성)
+        await get_document_retriever().initialize()
+        logger.info("✅ Retrieval server started")
+
+    @app.on_event("shutdown")
+    async def shutdown_event():
+        await get_retrieval_batcher().close()
+        await get_embedding_service().close()
+
+    return app
+
+
+app = create_retrieval_app()
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    # 소켓 경로가 있으면 Unix 도메인 소켓, 없으면 localhost TCP
+    if settings.rag_server_socket:
+        uvicorn.run("retrieval_server:app", uds=settings.rag_server_socket)
+    else:
+        uvicorn.run(
+            "retrieval_server:app", host=settings.rag_server_host, port=settings.rag_server_port
+        )
@@ -1,5 +1,6 @@
-from domain.models.agent import AgentRequest, AgentResponse, AgentType
+from domain.models.agent import AgentRequest, AgentResponse, AgentType, ModelPolicy
 from infrastructure.llm.openai_client import OpenAIClient
+from service.agent.model_cascade import ModelCascade, CascadeResult
 from utils.logger import logger
 
 
@@ -8,10 +9,19 @@ class GeneralAgent:
     일반 서비스 - 일반 대화 및 질의응답
     """
 
-    def __init__(self, llm_client: OpenAIClient):
+    # 대화 히스토리(토큰 예산 내 대화 창)를 프롬프트에 사용
+    uses_conversation = True
+
+    def __init__(
+        self,
+        llm_client: OpenAIClient,
+        model_policy: ModelPolicy,
+        complex_token_threshold: int = 150
+    ):
         self.llm_client = llm_client
+        self.cascade = ModelCascade(llm_client, model_policy, complex_token_threshold)
 
-    def process(self, request: AgentRequest) -> AgentResponse:
+    async def process(self, request: AgentRequest) -> AgentResponse:
         """
         일반 대화 처리 로직
         """
@@ -22,16 +32,17 @@ class GeneralAgent:
             is_error_fallback = request.context and request.context.get("error", False)
 
             if is_error_fallback:
-                response_content = self._handle_error_fallback(request.query)
+                result = CascadeResult(content=self._handle_error_fallback(request.query))
             else:
-                response_content = self._handle_general_conversation(request) 
+                result = await self._handle_general_conversation(request)
             
             return AgentResponse(
-                content=response_content,
+                content=result.content,
                 agent_type=AgentType.GENERAL,
                 metadata={
                     "conversation_type": "error_fallback" if is_error_fallback else "general",
-                    "query_length": len(request.query)
+                    "query_length": len(request.query),
+                    **result.to_metadata()
                 }
             )
         
@@ -43,7 +54,7 @@ class GeneralAgent:
                 metadata={"error": str(e)}
             )
 
-    def _handle_general_conversation(self, request: AgentRequest) -> str:
+    async def _handle_general_conversation(self, request: AgentRequest) -> CascadeResult:
         """
         일반 대화 처리
         """
@@ -51,10 +62,10 @@ class GeneralAgent:
         query_lower = request.query.lower()
         
         if any(keyword in query_lower for keyword in ["도움", "help", "사용법", "기능"]):
-            return self._get_help_message()
+            return CascadeResult(content=self._get_help_message())
         
         if any(keyword in query_lower for keyword in ["안녕", "hello", "hi", "처음"]):
-            return self._get_greeting_message()
+            return CascadeResult(content=self._get_greeting_message())
         
         # 일반 대화
         system_prompt = """당신은 도움이 되고 친근한 AI 어시스턴트입니다.
@@ -71,10 +82,18 @@ class GeneralAgent:
 - 필요시 다른 에이전트 기능 안내
 - 한국어로 응답"""
         
-        return self.llm_client.generate(
-            prompt=request.query,
+        # 이전 대화가 있으면 함께 전달 (토큰 예산은 ContextWindowBuilder가 보장)
+        prompt = request.query
+        conversation = request.context.get("conversation") if request.context else None
+        if conversation and (conversation.messages or conversation.summary):
+            prompt = f"{conversation.to_prompt()}\n\n[현재 질문]\n{request.query}"
+        
+        return await self.cascade.generate(
+            prompt=prompt,
             system_prompt=system_prompt,
-            temperature=0.7
+            temperature=0.7,
+            on_token=request.on_token,
+            query=request.query
         )
     
     def _handle_error_fallback(self, query: str) -> str:
@@ -0,0 +1,184 @@
+"""
+Model tiering with escalation cascade
+"""
+import re
+from typing import Callable, Dict, Optional
+
+from pydantic import BaseModel
+
+from domain.models.agent import AgentType, ModelPolicy, ModelTier
+from infrastructure.llm.completion_cache import CachePolicy
+from infrastructure.llm.openai_client import OpenAIClient
+from utils.logger import logger
+from utils.token_counter import count_tokens
+
+
+# 복잡한 질의로 판단하는 키워드 (분석/비교/설계 등)
+COMPLEX_QUERY_KEYWORDS = [
+    "비교", "분석", "설계", "아키텍처", "트레이드오프", "장단점", "최적화", "원인",
+    "compare", "analyze", "architecture", "design", "trade-off", "tradeoff", "optimize",
+]
+
+# 저렴한 모델이 답을 포기했다고 볼 수 있는 응답 패턴
+REFUSAL_PATTERNS = re.compile(
+    r"(잘 모르겠|알 수 없습니다|답변(을|하기) 어렵|i don't know|i'm not sure|i cannot|i can't)",
+    re.IGNORECASE,
+)
+
+
+class CascadeResult(BaseModel):
+    """캐스케이드 실행 결과"""
+    content: str
+    model: Optional[str] = None  # LLM을 거치지 않은 응답은 None
+    escalated: bool = False
+    escalation_reason: Optional[str] = None
+
+    def to_metadata(self) -> Dict:
+        """AgentResponse.metadata에 기록할 정보"""
+        return {
+            "model_used": self.model,
+            "model_escalated": self.escalated,
+            "escalation_reason": self.escalation_reason,
+        }
+
+
+def is_complex_query(query: str, token_threshold: int = 150) -> bool:
+    """질의 복잡도 분류 (길이, 다중 질문, 코드 블록, 분석 키워드)"""
+    query_lower = query.lower()
+
+    if count_tokens(query) > token_threshold:
+        return True
+    if query.count("?") + query.count("？") >= 2:
+        return True
+    if "```" in query:
+        return True
+    return any(keyword in query_lower for keyword in COMPLEX_QUERY_KEYWORDS)
+
+
+def load_model_policies(
+    raw_policies: Dict[str, Dict],
+    default_model: str,
+    default_max_tokens: Optional[int] = None,
+) -> Dict[AgentType, ModelPolicy]:
+    """Settings의 dict 설정을 AgentType별 ModelPolicy로 변환 (없으면 기본 모델 사용)"""
+    policies = {}
+    for agent_type in AgentType:
+        raw = raw_policies.get(agent_type.value)
+        if raw:
+            policies[agent_type] = ModelPolicy(**raw)
+        else:
+            policies[agent_type] = ModelPolicy(
+                primary=ModelTier(model=default_model, max_tokens=default_max_tokens)
+            )
+    return policies
+
+
+class ModelCascade:
+    """
+    에이전트별 모델 티어 실행기
+
+    - 기본은 primary(빠르고 저렴한 모델)로 호출
+    - 복잡한 질의는 바로 escalation 모델 사용
+    - primary 응답이 검증에 실패하면 escalation 모델로 한 번 더 호출
+      (스트리밍 호출은 이미 토큰이 전달되었으므로 검증 실패 에스컬레이션 생략)
+    """
+
+    def __init__(
+        self,
+        llm_client: OpenAIClient,
+        policy: ModelPolicy,
+        complex_token_threshold: int = 150,
+    ):
+        self.llm_client = llm_client
+        self.policy = policy
+        self.complex_token_threshold = complex_token_threshold
+
+    @property
+    def primary_model(self) -> str:
+        return self.policy.primary.model
+
+    async def generate(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        on_token: Optional[Callable[[str], None]] = None,
+        cache_policy: CachePolicy = CachePolicy.AUTO,
+        query: Optional[str] = None,
+        system_prompt_for: Optional[Callable[[str], str]] = None,
+    ) -> CascadeResult:
+        """
+        캐스케이드 생성
+
+        Args:
+            query: 복잡도 판단에 사용할 사용자 질의 (기본값: prompt)
+            system_prompt_for: 모델 이름 -> 시스템 프롬프트 (지정 시 system_prompt 대신 사용,
+                컨텍스트 윈도우가 다른 티어마다 문서 컨텍스트를 다시 맞출 때)
+        """
+        escalation = self.policy.escalation
+
+        def prompt_for(tier: ModelTier) -> Optional[str]:
+            return system_prompt_for(tier.model) if system_prompt_for else system_prompt
+
+        if escalation and is_complex_query(query or prompt, self.complex_token_threshold):
+            content = await self._call(
+                escalation, prompt, prompt_for(escalation), temperature, on_token, cache_policy
+            )
+            return CascadeResult(
+                content=content,
+                model=escalation.model,
+                escalated=True,
+                escalation_reason="complex_query",
+            )
+
+        content = await self._call(
+            self.policy.primary, prompt, prompt_for(self.policy.primary),
+            temperature, on_token, cache_policy
+        )
+
+        failure = self.check_output(content)
+        if failure and escalation and on_token is None:
+            logger.info(
+                f"Escalating {self.policy.primary.model} -> {escalation.model}: {failure}"
+            )
+            content = await self._call(
+                escalation, prompt, prompt_for(escalation), temperature, None, cache_policy
+            )
+            return CascadeResult(
+                content=content,
+                model=escalation.model,
+                escalated=True,
+                escalation_reason=failure,
+            )
+
+        return CascadeResult(content=content, model=self.policy.primary.model)
+
+    def check_output(self, content: Optional[str]) -> Optional[str]:
+        """저렴한 모델 응답 검증 (실패 사유 반환, 통과 시 None)"""
+        if not content or not content.strip():
+            return "empty_response"
+        if len(content.strip()) < self.policy.min_response_chars:
+            return "too_short"
+        if REFUSAL_PATTERNS.search(content[:200]):
+            return "refusal"
+        return None
+
+    async def _call(
+        self,
+        tier: ModelTier,
+        prompt: str,
+        system_prompt: Optional[str],
+        temperature: float,
+        on_token: Optional[Callable[[str], None]],
+        cache_policy: CachePolicy,
+    ) -> str:
+        return await self.llm_client.generate(
+            prompt=prompt,
+            system_prompt=system_prompt,
+            model=tier.model,
+            temperature=temperature,
+            max_tokens=tier.max_tokens,
+            on_token=on_token,
+            cache_policy=cache_policy,
+            timeout=tier.timeout_seconds,
+        )
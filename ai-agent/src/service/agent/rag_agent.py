@@ -1,6 +1,10 @@
-from typing import Dict, List
-from domain.models.agent import AgentRequest, AgentResponse, AgentType
+from typing import Dict, List, Optional
+from domain.models.agent import AgentRequest, AgentResponse, AgentType, ModelPolicy
+from domain.models.document import RetrievedChunk
 from infrastructure.llm.openai_client import OpenAIClient
+from service.agent.model_cascade import ModelCascade
+from service.rag.context_packer import ContextPacker, PackedContext
+from service.rag.retriever import DocumentRetriever
 from utils.logger import logger
 
 
@@ -8,26 +12,53 @@ class RAGAgent:
     """
     RAG agent (Retrieval Augmented Generation)
 
+    프로세스 내 하이브리드 인덱스(DocumentRetriever, dense + BM25)에서 관련 문서 청크를 찾아 답변
+
     추후 해당 agent는 MCP tool을 이용해 기존에 구축된
     https://github.com/riverfrot/advanced-rag-system
     repo를 tool로써 가져올 예정
     """
 
-    def __init__(self, llm_client: OpenAIClient):
+    uses_conversation = False
+
+    def __init__(
+        self,
+        llm_client: OpenAIClient,
+        model_policy: ModelPolicy,
+        complex_token_threshold: int = 150,
+        retriever: Optional[DocumentRetriever] = None,
+        top_k: int = 5,
+        context_packer: Optional[ContextPacker] = None
+    ):
         self.llm_client = llm_client
+        self.cascade = ModelCascade(llm_client, model_policy, complex_token_threshold)
+        self.retriever = retriever
+        self.top_k = top_k
+        self.context_packer = context_packer or ContextPacker()
         logger.info("RAG Agent initialized")
 
-    def process(self, request: AgentRequest) -> AgentResponse:
+    async def process(self, request: AgentRequest) -> AgentResponse:
         """
         RAG 처리 로직
         """
         logger.info(f"RAG Agent processing: {request.query}")
 
-        documents = self._get_mock_documents(request.query)
+        # 메타데이터 필터 (예: {"path": "server/*", "language": "java"})
+        filters = request.context.get("filters") if request.context else None
+        try:
+            documents = await self._retrieve(request.query, filters)
+        except Exception as e:
+            logger.error(f"RAG retrieval error: {e}")
+            documents = []
         
-        context = self._build_context(documents)
+        # 모델 티어마다 컨텍스트 윈도우가 다르므로 실제로 호출하는 모델의 예산으로 구성
+        packed_by_model: Dict[str, PackedContext] = {}
 
-        system_prompt = f"""당신은 내부 문서 검색 전문가입니다.
+        def system_prompt_for(model: str) -> str:
+            if model not in packed_by_model:
+                packed_by_model[model] = self._build_context(documents, model)
+            context = packed_by_model[model].text
+            return f"""당신은 내부 문서 검색 전문가입니다.
 
         아래 문서들을 참조하여 사용자의 질문에 정확하고 도움이 되는 답변을 제공하세요.
 
@@ -40,19 +71,26 @@ class RAGAgent:
 
 
         try:
-            response_content = self.llm_client.generate(
+            result = await self.cascade.generate(
                 prompt=request.query,
-                system_prompt=system_prompt,
-                temperature=0.0
+                temperature=0.0,
+                on_token=request.on_token,
+                system_prompt_for=system_prompt_for
             )
+            packed = packed_by_model[result.model]
+            context = packed.text
 
             return AgentResponse(
-                content=response_content,
+                content=result.content,
                 agent_type=AgentType.RAG,
                 metadata={
                     "documents_found": len(documents),
+                    "sources": packed.sources,
                     "search_query": request.query,
-                    "context_length": len(context)
+                    "filters": filters,
+                    "context_length": len(context),
+                    **packed.to_metadata(),
+                    **result.to_metadata()
                 }
             )
 
@@ -64,64 +102,17 @@ class RAGAgent:
                 metadata={"error": str(e)}
             )
 
-    def _get_mock_documents(self, query: str) -> List[Dict]:
-        """
-        Mock 문서 데이터 (실제로는 벡터 DB에서 검색)
-        """
-        if "api" in query.lower():
-            return [
-                {
-                    "title": "API 인증 가이드",
-                    "content": "API 사용을 위해서는 API 키가 필요합니다. 헤더에 'Authorization: Bearer {api_key}' 형식으로 포함하세요.",
-                    "section": "authentication",
-                    "relevance": 0.95
-                },
-                {
-                    "title": "API 엔드포인트 목록",
-                    "content": "주요 엔드포인트: POST /api/chat/message (채팅), GET /api/health (헬스체크)",
-                    "section": "endpoints",
-                    "relevance": 0.90
-                }
-            ]
-        elif "설정" in query.lower() or "config" in query.lower():
-            return [
-                {
-                    "title": "환경 설정 가이드",
-                    "content": ".env 파일을 생성하고 OPENAI_API_KEY를 설정하세요. 선택적으로 TAVILY_API_KEY도 설정할 수 있습니다.",
-                    "section": "configuration",
-                    "relevance": 0.92
-                }
-            ]
-        else:
-            return [
-                {
-                    "title": "시스템 개요",
-                    "content": "이 시스템은 Vue.js + FastAPI 기반의 멀티 에이전트 챗봇입니다. Supervisor가 사용자 의도를 분석하여 적절한 에이전트로 라우팅합니다.",
-                    "section": "overview",
-                    "relevance": 0.85
-                },
-                {
-                    "title": "에이전트 종류",
-                    "content": "4가지 전문 에이전트: RAG(문서검색), Code(코드실행), Search(웹검색), General(일반대화)",
-                    "section": "agents",
-                    "relevance": 0.80
-                }
-            ]
-        
-    def _build_context(self, documents: List[Dict]) -> str:
+    async def _retrieve(self, query: str, filters: Optional[Dict] = None) -> List[RetrievedChunk]:
+        """벡터 인덱스에서 관련 청크 검색 (filters: 메타데이터 사전 필터)"""
+        if self.retriever is None:
+            return []
+        return await self.retriever.retrieve(query, self.top_k, filters)
+
+    def _build_context(self, documents: List[RetrievedChunk], model: str) -> PackedContext:
         """
         문서들로부터 컨텍스트 구성
+
+        중복 제거, 인접 청크 병합 후 관련도 순으로 해당 모델의 토큰 예산 안에서 포함
+        (에스컬레이션 모델(gpt-4, 8k)은 primary보다 컨텍스트 윈도우가 작을 수 있으므로 티어별로 구성)
         """
-        if not documents:
-            return "관련 문서를 찾을 수 없습니다."
-        
-        context_parts = []
-        for i, doc in enumerate(documents, 1):
-            context_parts.append(
-                f"## 문서 {i}: {doc['title']}\n"
-                f"**섹션**: {doc['section']}\n"
-                f"**내용**: {doc['content']}\n"
-                f"**관련도**: {doc['relevance']:.2f}\n"
-            )
-        
-        return "\n".join(context_parts)
\ No newline at end of file
+        return self.context_packer.pack(documents, model)
\ No newline at end of file
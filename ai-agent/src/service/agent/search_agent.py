@@ -1,47 +1,146 @@
-from typing import List, Dict
-from domain.models.agent import AgentRequest, AgentResponse, AgentType
+import asyncio
+import time
+from typing import List, Dict, Optional, Callable
+from domain.models.agent import AgentRequest, AgentResponse, AgentType, ModelPolicy
 from infrastructure.llm.openai_client import OpenAIClient
+from infrastructure.external.tavily_client import TavilyClient
+from service.agent.model_cascade import ModelCascade, CascadeResult
+from service.agent.search_fanout import SearchFanout, SubQueryResult, canonicalize_url, merge_results
+from service.agent.search_context import SearchContext, SearchContextBuilder
 from utils.logger import logger
 
 
+PARTIAL_SUMMARY_PROMPT = """당신은 웹 검색 결과에서 핵심을 뽑아내는 도우미입니다.
+사용자 질문과 관련된 사실만 3문장 이내로 정리하세요.
+- 출처에 없는 내용은 추가하지 말 것
+- 날짜, 수치 등 구체적인 정보 우선"""
+
+
 class SearchAgent:
     """
     검색 서비스 - 웹 검색 및 정보 수집
 
-    Tavily API를 통해 필요한 웹검색을 진행 예정
+    질문을 하위 질의로 나눠 Tavily API로 병렬 검색 후 요약
+    (API 키가 없으면 TavilyClient의 Mock 결과 사용)
     """
 
-    def __init__(self, llm_client: OpenAIClient):
+    uses_conversation = False
+
+    def __init__(
+        self,
+        llm_client: OpenAIClient,
+        model_policy: ModelPolicy,
+        complex_token_threshold: int = 150,
+        search_client: Optional[TavilyClient] = None,
+        max_sub_queries: int = 3,
+        max_concurrent_searches: int = 4,
+        per_search_timeout: float = 4.0,
+        partial_summary_max_tokens: int = 200,
+        context_builder: Optional[SearchContextBuilder] = None
+    ):
         self.llm_client = llm_client
-        # Tavily 클라이언트는 일단 생략 (API 키 문제)
-        # self.tavily_client = TavilyClient()
+        self.cascade = ModelCascade(llm_client, model_policy, complex_token_threshold)
+        # 주입받지 않은 클라이언트는 에이전트가 소유하고 close()에서 정리
+        self._owns_search_client = search_client is None
+        self.search_client = search_client or TavilyClient()
+        self.fanout = SearchFanout(
+            self.search_client,
+            max_sub_queries=max_sub_queries,
+            max_concurrency=max_concurrent_searches,
+            per_search_timeout=per_search_timeout
+        )
+        self.partial_summary_max_tokens = partial_summary_max_tokens
+        # 요약 프롬프트 전 로컬 정리 (BM25 랭킹, 근사 중복 제거, 문장 압축)
+        self.context_builder = context_builder or SearchContextBuilder()
         logger.info("Search Service initialized")
 
-    def process(self, request: AgentRequest) -> AgentResponse:
+    async def process(self, request: AgentRequest) -> AgentResponse:
         """
         검색 처리 로직
+
+        하위 질의 결과가 도착하는 대로
+        1. 새 출처를 바로 스트리밍하고
+        2. 해당 배치의 부분 요약을 백그라운드로 시작한 뒤
+        3. 마지막에 부분 요약들만 짧게 병합해 최종 요약을 스트리밍
         """
         logger.info(f"Search Agent processing: {request.query}")
+        start_time = time.monotonic()
+        emit = request.on_token or (lambda _: None)
+
+        sub_queries: List[str] = []
+        timed_out: List[str] = []
+        search_results: List[Dict] = []
+        seen_urls = set()
+        sections: List[str] = []
+        batches: List[List[Dict]] = []
+        sub_query_results: List[SubQueryResult] = []
+        note_tasks: List[asyncio.Task] = []
+        contexts: List[SearchContext] = []
+        sources_ready_ms = None
 
         try:
-            # 현재는 Mock 데이터 사용 (Tavily API 키 미설정)
-            search_results = self._get_mock_search_results(request.query)
-            
+            async for batch in self.fanout.stream(request.query):
+                sub_queries.append(batch.sub_query)
+                if batch.timed_out:
+                    timed_out.append(batch.sub_query)
+                sub_query_results.append(batch)
+
+                # 앞선 배치에서 이미 나온 출처는 제외
+                new_results = []
+                for result in batch.results:
+                    url = canonicalize_url(result.get("url", ""))
+                    if url not in seen_urls:
+                        seen_urls.add(url)
+                        new_results.append(result)
+                if not new_results:
+                    continue
+
+                # 출처 목록은 도착 즉시 전달
+                section = self._format_search_results(
+                    new_results, start=len(search_results) + 1
+                )
+                if not search_results:
+                    section = f"**검색 결과**\n{section}"
+                    sources_ready_ms = (time.monotonic() - start_time) * 1000
+                sections.append(section)
+                emit(section + "\n")
+                search_results.extend(new_results)
+                batches.append(new_results)
+
+                # 배치가 둘 이상일 때부터 부분 요약 시작
+                # (배치가 하나뿐이면 기존처럼 한 번의 스트리밍 요약이 더 빠름)
+                if len(batches) == 2:
+                    note_tasks.append(self._start_note(request.query, batches[0], contexts))
+                if len(batches) >= 2:
+                    note_tasks.append(self._start_note(request.query, new_results, contexts))
+
             if not search_results:
                 return AgentResponse(
                     content="검색 결과를 찾을 수 없습니다.",
                     agent_type=AgentType.SEARCH,
-                    metadata={"results_count": 0}
+                    metadata={
+                        "results_count": 0,
+                        "sub_queries": sub_queries,
+                        "timed_out_sub_queries": timed_out
+                    }
                 )
 
-            summary = self._generate_summary(request.query, search_results)
+            header = "**검색 결과 요약**\n"
+            emit("\n" + header)
+
+            # 요약/출처 순서는 여러 하위 질의에서 나온 결과를 우선 (출처 스트리밍은 도착 순)
+            ranked_results = merge_results(sub_query_results)
 
-            # 응답 포매팅
-            response_content = f"""**검색 결과 요약**
-{summary}
+            notes = await self._collect_notes(note_tasks)
+            if notes:
+                summary = await self._merge_notes(request.query, notes, request.on_token)
+            else:
+                contexts = [self.context_builder.build(request.query, ranked_results)]
+                summary = await self._generate_summary(
+                    request.query, contexts[0], on_token=request.on_token
+                )
 
-**상세 검색 결과**
-{self._format_search_results(search_results)}"""
+            response_content = "\n".join(sections) + "\n\n" + header + summary.content
 
             return AgentResponse(
                 content=response_content,
@@ -49,7 +148,13 @@ class SearchAgent:
                 metadata={
                     "results_count": len(search_results),
                     "search_query": request.query,
-                    "sources": [result["url"] for result in search_results]
+                    "sources": [result["url"] for result in ranked_results],
+                    "sub_queries": sub_queries,
+                    "timed_out_sub_queries": timed_out,
+                    "partial_summaries": len(notes),
+                    "sources_ready_ms": sources_ready_ms,
+                    **self._context_metadata(contexts),
+                    **summary.to_metadata()
                 }
             )
             
@@ -60,48 +165,88 @@ class SearchAgent:
                 agent_type=AgentType.SEARCH,
                 metadata={"error": str(e)}
             )
+        finally:
+            for task in note_tasks:
+                if not task.done():
+                    task.cancel()
 
-    def _get_mock_search_results(self, query: str) -> List[Dict]:
-        """Mock 검색 결과 데이터"""
-        if "ai" in query.lower() or "인공지능" in query.lower():
-            return [
-                {
-                    "title": "2024년 AI 기술 동향",
-                    "url": "https://example.com/ai-trends-2024",
-                    "content": "2024년 AI 기술은 생성형 AI의 발전과 함께 산업 전반에 걸쳐 혁신을 이끌고 있습니다. ChatGPT, Claude와 같은 대화형 AI의 성능이 크게 향상되었으며..."
-                },
-                {
-                    "title": "생성형 AI 시장 전망",
-                    "url": "https://example.com/generative-ai-market",
-                    "content": "생성형 AI 시장은 2024년 현재 급속도로 성장하고 있으며, 특히 기업 영역에서의 도입이 활발해지고 있습니다. 문서 작성, 코드 생성, 이미지 및 영상 제작 등..."
-                }
-            ]
-        elif "python" in query.lower() or "파이썬" in query.lower():
-            return [
-                {
-                    "title": "Python 3.12 새로운 기능",
-                    "url": "https://example.com/python-312-features",
-                    "content": "Python 3.12는 성능 향상과 새로운 기능들을 제공합니다. f-string 개선, 타입 시스템 향상, 그리고 더 나은 에러 메시지 등이 주요 특징입니다..."
-                }
-            ]
-        else:
-            return [
-                {
-                    "title": "최신 기술 뉴스",
-                    "url": "https://example.com/tech-news",
-                    "content": "최신 기술 동향과 뉴스를 전해드립니다. 현재 기술 업계는 AI, 클라우드, 사이버보안 등 다양한 분야에서 혁신이 일어나고 있습니다..."
-                }
-            ]
+    async def close(self):
+        """직접 생성한 검색 클라이언트의 세션 정리 (주입받은 클라이언트는 소유자가 정리)"""
+        if self._owns_search_client:
+            await self.search_client.close()
 
-    def _generate_summary(self, query: str, search_results: List[Dict]) -> str:
+    def _start_note(
+        self,
+        query: str,
+        results: List[Dict],
+        contexts: List[SearchContext]
+    ) -> asyncio.Task:
+        """배치 하나에 대한 부분 요약을 백그라운드로 시작"""
+        context = self.context_builder.build(query, results)
+        contexts.append(context)
+        return asyncio.create_task(self._summarize_batch(query, context))
+
+    async def _summarize_batch(self, query: str, context: SearchContext) -> str:
+        """배치 부분 요약 (빠른 모델, 짧은 출력)"""
+        return await self.llm_client.generate(
+            prompt=f"질문: {query}\n\n검색 결과:\n{context.text}",
+            system_prompt=PARTIAL_SUMMARY_PROMPT,
+            model=self.cascade.primary_model,
+            temperature=0.3,
+            max_tokens=self.partial_summary_max_tokens
+        )
+
+    async def _collect_notes(self, note_tasks: List[asyncio.Task]) -> List[str]:
+        """완료된 부분 요약 수집 (실패한 배치는 제외)"""
+        if not note_tasks:
+            return []
+        notes = []
+        for result in await asyncio.gather(*note_tasks, return_exceptions=True):
+            if isinstance(result, Exception):
+                logger.warning(f"Partial summary failed: {result}")
+            elif result and result.strip():
+                notes.append(result.strip())
+        return notes
+
+    async def _merge_notes(
+        self,
+        query: str,
+        notes: List[str],
+        on_token: Optional[Callable[[str], None]] = None
+    ) -> CascadeResult:
+        """부분 요약들을 하나의 최종 요약으로 병합"""
+        notes_text = "\n\n".join(f"[요약 {i}]\n{note}" for i, note in enumerate(notes, 1))
+        system_prompt = f"""당신은 웹 검색 결과를 분석하고 요약하는 전문가입니다.
+
+사용자 질문: {query}
+
+아래는 검색 결과 묶음별로 미리 정리한 요약입니다.
+중복을 제거하고 하나의 답변으로 합치세요.
+
+{notes_text}
+
+핵심 정보, 최신 동향(있다면), 실용적인 인사이트를 포함하여 200-400자 내로 작성하세요."""
+
+        try:
+            return await self.cascade.generate(
+                prompt=f"위 요약들을 바탕으로 '{query}'에 대한 최종 요약을 작성해주세요.",
+                system_prompt=system_prompt,
+                temperature=0.3,
+                on_token=on_token,
+                query=query
+            )
+        except Exception as e:
+            logger.error(f"Summary merge error: {e}")
+            return CascadeResult(content="\n".join(notes))
+
+    async def _generate_summary(
+        self,
+        query: str,
+        context: SearchContext,
+        on_token: Optional[Callable[[str], None]] = None
+    ) -> CascadeResult:
         """검색 결과 요약 생성"""
-        # 검색 결과를 텍스트로 변환
-        results_text = "\n\n".join([
-            f"제목: {result['title']}\n"
-            f"출처: {result['url']}\n"
-            f"내용: {result['content']}"
-            for result in search_results[:3]  # 상위 3개만 사용
-        ])
+        results_text = context.text
 
         system_prompt = f"""당신은 웹 검색 결과를 분석하고 요약하는 전문가입니다.
 
@@ -121,23 +266,35 @@ class SearchAgent:
 간결하지만 유용한 정보로 구성하여 200-400자 내로 작성하세요."""
         
         try:
-            summary = self.llm_client.generate(
+            return await self.cascade.generate(
                 prompt=f"위 검색 결과를 바탕으로 '{query}'에 대한 요약을 작성해주세요.",
                 system_prompt=system_prompt,
-                temperature=0.3
+                temperature=0.3,
+                on_token=on_token,
+                query=query
             )
-            return summary
         except Exception as e:
             logger.error(f"Summary generation error: {e}")
-            return "검색 결과를 요약하는 중 오류가 발생했습니다."
+            return CascadeResult(content="검색 결과를 요약하는 중 오류가 발생했습니다.")
+
+    def _context_metadata(self, contexts: List[SearchContext]) -> Dict:
+        """로컬 정리로 줄인 프롬프트 토큰 수"""
+        raw_tokens = sum(context.raw_tokens for context in contexts)
+        tokens = sum(context.tokens for context in contexts)
+        return {
+            "prompt_tokens_raw": raw_tokens,
+            "prompt_tokens": tokens,
+            "prompt_token_reduction": round(1 - tokens / raw_tokens, 3) if raw_tokens else 0.0,
+            "duplicates_removed": sum(context.duplicates_removed for context in contexts),
+        }
 
-    def _format_search_results(self, search_results: List[Dict]) -> str:
+    def _format_search_results(self, search_results: List[Dict], start: int = 1) -> str:
         """
         검색 결과 포맷팅
         """
         formatted_results = []
         
-        for i, result in enumerate(search_results, 1):
+        for i, result in enumerate(search_results, start):
             formatted_result = f"""**{i}. {result['title']}**
 출처: {result['url']}
 내용: {result['content'][:200]}{'...' if len(result['content']) > 200 else ''}
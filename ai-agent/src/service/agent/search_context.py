@@ -0,0 +1,120 @@
+"""
+Local relevance ranking and compression of search results before summarization
+"""
+from typing import Any, Dict, List
+
+from pydantic import BaseModel, Field
+
+from utils.bm25 import BM25
+from utils.minhash import MinHasher
+from utils.text_tokenizer import split_sentences, tokenize
+from utils.token_counter import count_tokens
+
+
+class SearchContext(BaseModel):
+    """요약 프롬프트에 넣을 검색 결과 컨텍스트"""
+    text: str
+    results: List[Dict[str, Any]] = Field(default_factory=list)
+    raw_tokens: int = 0       # 결과 원문을 그대로 넣었을 때의 토큰 수
+    tokens: int = 0           # 실제 컨텍스트 토큰 수
+    duplicates_removed: int = 0
+    results_dropped: int = 0  # 토큰 예산 초과로 제외된 결과 수
+
+
+class SearchContextBuilder:
+    """
+    검색 결과를 LLM에 보내기 전에 로컬에서 정리
+
+    1. 제목+본문을 질의에 대해 BM25로 점수화
+       (merge_results가 붙인 sub_queries가 있으면 더 많은 하위 질의에서 나온 결과 우선)
+    2. MinHash로 근사 중복(전재 기사 등) 제거 - 점수가 높은 쪽 유지
+    3. 결과마다 질의와 관련도가 높은 문장만 남김 (원래 순서 유지)
+    4. 점수 순으로 토큰 예산 안에 들어가는 만큼만 포함
+    """
+
+    def __init__(
+        self,
+        token_budget: int = 1500,
+        sentences_per_result: int = 3,
+        duplicate_threshold: float = 0.7,
+    ):
+        self.token_budget = token_budget
+        self.sentences_per_result = sentences_per_result
+        self.duplicate_threshold = duplicate_threshold
+        self.minhasher = MinHasher()
+
+    def build(self, query: str, results: List[Dict[str, Any]]) -> SearchContext:
+        raw_text = format_results(results)
+        if not results:
+            return SearchContext(text="")
+
+        query_tokens = tokenize(query)
+        doc_tokens = [tokenize(f"{r.get('title', '')} {r.get('content', '')}") for r in results]
+        scores = BM25(doc_tokens).scores(query_tokens)
+
+        ranked = sorted(
+            range(len(results)),
+            key=lambda i: (len(results[i].get("sub_queries", ())), scores[i]),
+            reverse=True,
+        )
+        kept = self._remove_near_duplicates(ranked, doc_tokens)
+
+        selected = []
+        used = 0
+        for i in kept:
+            result = {**results[i], "content": self._trim(query_tokens, results[i].get("content", ""))}
+            entry_tokens = count_tokens(format_results([result]))
+            if used + entry_tokens > self.token_budget:
+                # 예산이 남아 있으면 더 짧은 다음 결과는 들어갈 수 있으므로 계속 확인
+                continue
+            selected.append(result)
+            used += entry_tokens
+
+        text = format_results(selected)
+        return SearchContext(
+            text=text,
+            results=selected,
+            raw_tokens=count_tokens(raw_text),
+            tokens=count_tokens(text),
+            duplicates_removed=len(results) - len(kept),
+            results_dropped=len(kept) - len(selected),
+        )
+
+    def _remove_near_duplicates(self, ranked: List[int], doc_tokens: List[List[str]]) -> List[int]:
+        kept: List[int] = []
+        signatures = []
+        for i in ranked:
+            signature = self.minhasher.signature(doc_tokens[i])
+            if any(
+                MinHasher.similarity(signature, other) >= self.duplicate_threshold
+                for other in signatures
+            ):
+                continue
+            kept.append(i)
+            signatures.append(signature)
+        return kept
+
+    def _trim(self, query_tokens: List[str], content: str) -> str:
+        """질의 관련도가 높은 상위 문장만 원래 순서대로 유지"""
+        sentences = split_sentences(content)
+        if len(sentences) <= self.sentences_per_result:
+            return content.strip()
+
+        scores = BM25([tokenize(s) for s in sentences]).scores(query_tokens)
+        if not any(scores):
+            # 관련 문장이 없으면 도입부 유지
+            return " ".join(sentences[: self.sentences_per_result])
+
+        top = sorted(range(len(sentences)), key=lambda i: scores[i], reverse=True)
+        keep = sorted(i for i in top[: self.sentences_per_result] if scores[i] > 0)
+        return " ".join(sentences[i] for i in keep)
+
+
+def format_results(results: List[Dict[str, Any]]) -> str:
+    """LLM 프롬프트용 검색 결과 텍스트"""
+    return "\n\n".join(
+        f"제목: {result.get('title', '')}\n"
+        f"출처: {result.get('url', '')}\n"
+        f"내용: {result.get('content', '')}"
+        for result in results
+    )
@@ -0,0 +1,178 @@
+"""
+Parallel multi-query web search fan-out
+"""
+import asyncio
+import re
+import time
+from typing import Any, AsyncIterator, Dict, List
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from pydantic import BaseModel, Field
+
+from infrastructure.external.search_cache import SearchCache
+from infrastructure.external.tavily_client import TavilyClient
+from utils.logger import logger
+
+
+# 하위 질의로 나눌 때 기준이 되는 구분자 (여러 질문, 나열)
+SUB_QUERY_SEPARATORS = re.compile(
+    r"\s*(?:[?？]\s+|[,;，]\s*|\s그리고\s|\s및\s|\s또한\s|\sand also\s|\s+vs\.?\s+)\s*",
+    re.IGNORECASE,
+)
+
+# 조각 앞에 남는 접속어
+LEADING_CONNECTORS = re.compile(r"^(?:그리고|및|또한|and also|and)\s+", re.IGNORECASE)
+
+# 정규화 시 제거할 추적용 쿼리 파라미터
+TRACKING_PARAMS = re.compile(r"^(utm_\w+|gclid|fbclid|ref|ref_src|mc_cid|mc_eid)$")
+
+
+def canonicalize_url(url: str) -> str:
+    """중복 판단용 URL 정규화 (scheme/host 소문자, www/fragment/추적 파라미터/끝 슬래시 제거)"""
+    try:
+        parts = urlsplit(url.strip())
+    except ValueError:
+        return url.strip()
+
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+
+    query = urlencode(
+        sorted(
+            (k, v)
+            for k, v in parse_qsl(parts.query, keep_blank_values=True)
+            if not TRACKING_PARAMS.match(k)
+        )
+    )
+    # http/https는 같은 문서로 취급
+    scheme = "https" if parts.scheme in ("http", "https") else parts.scheme
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit((scheme, host, path, query, ""))
+
+
+def decompose_query(query: str, max_sub_queries: int = 3) -> List[str]:
+    """
+    질문을 검색용 하위 질의로 분해
+
+    원 질의를 항상 첫 번째로 두고, 여러 질문/나열/비교 구문을 나눈
+    조각을 추가 (LLM 호출 없이 규칙 기반으로 처리해 지연을 늘리지 않음)
+    """
+    sub_queries = [query.strip()]
+    seen = {SearchCache.normalize_query(query)}
+
+    for part in SUB_QUERY_SEPARATORS.split(query):
+        part = LEADING_CONNECTORS.sub("", part.strip(" ?？"))
+        normalized = SearchCache.normalize_query(part)
+        # 너무 짧은 조각은 단독 검색 가치가 낮음
+        if len(normalized) < 4 or normalized in seen:
+            continue
+        seen.add(normalized)
+        sub_queries.append(part)
+        if len(sub_queries) >= max_sub_queries:
+            break
+
+    return sub_queries
+
+
+class SubQueryResult(BaseModel):
+    """하위 질의 하나의 검색 결과"""
+    sub_query: str
+    results: List[Dict[str, Any]] = Field(default_factory=list)
+    latency_ms: float = 0.0
+    timed_out: bool = False
+
+
+class SearchFanout:
+    """
+    하위 질의 병렬 검색기
+
+    - 하위 질의를 세마포어로 동시 실행 수를 제한해 TavilyClient에 동시에 요청
+    - 검색마다 마감 시간(per_search_timeout)을 두고 넘기면 해당 질의만 버림
+      (느린 하위 질의가 전체 응답을 붙잡지 않도록)
+    - 결과는 merge_results로 정규화 URL 기준 중복 제거 후 병합 (호출자가 배치를 모아 사용)
+    """
+
+    def __init__(
+        self,
+        search_client: TavilyClient,
+        max_sub_queries: int = 3,
+        max_concurrency: int = 4,
+        per_search_timeout: float = 4.0,
+        max_results_per_query: int = 5,
+        search_depth: str = "basic",
+    ):
+        self.search_client = search_client
+        self.max_sub_queries = max_sub_queries
+        self.per_search_timeout = per_search_timeout
+        self.max_results_per_query = max_results_per_query
+        self.search_depth = search_depth
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def stream(self, query: str) -> AsyncIterator[SubQueryResult]:
+        """하위 질의 결과를 완료되는 순서대로 반환"""
+        sub_queries = decompose_query(query, self.max_sub_queries)
+        tasks = [asyncio.create_task(self._search_one(q)) for q in sub_queries]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    async def _search_one(self, sub_query: str) -> SubQueryResult:
+        start = time.monotonic()
+        try:
+            # 마감 시간은 세마포어 대기 시간까지 포함
+            results = await asyncio.wait_for(
+                self._limited_search(sub_query), timeout=self.per_search_timeout
+            )
+            timed_out = False
+        except asyncio.TimeoutError:
+            logger.warning(
+                f"Sub-query timed out after {self.per_search_timeout:.1f}s: {sub_query}"
+            )
+            results, timed_out = [], True
+
+        return SubQueryResult(
+            sub_query=sub_query,
+            results=results,
+            latency_ms=(time.monotonic() - start) * 1000,
+            timed_out=timed_out,
+        )
+
+    async def _limited_search(self, sub_query: str) -> List[Dict[str, Any]]:
+        async with self._semaphore:
+            return await self.search_client.search(
+                sub_query,
+                max_results=self.max_results_per_query,
+                search_depth=self.search_depth,
+                mock_on_error=False,
+            )
+
+
+def merge_results(batches: List[SubQueryResult]) -> List[Dict[str, Any]]:
+    """
+    하위 질의 결과 병합
+
+    같은 정규화 URL은 하나로 합치고 점수가 높은 쪽을 유지,
+    여러 하위 질의에서 나온 결과를 먼저 두고 점수 순으로 정렬
+    """
+    merged: Dict[str, Dict[str, Any]] = {}
+    for batch in batches:
+        for result in batch.results:
+            key = canonicalize_url(result.get("url", ""))
+            existing = merged.get(key)
+            if existing is None:
+                merged[key] = {**result, "sub_queries": [batch.sub_query]}
+                continue
+            existing["sub_queries"].append(batch.sub_query)
+            if result.get("score", 0.0) > existing.get("score", 0.0):
+                merged[key] = {**result, "sub_queries": existing["sub_queries"]}
+
+    return sorted(
+        merged.values(),
+        key=lambda r: (len(r["sub_queries"]), r.get("score", 0.0)),
+        reverse=True,
+    )
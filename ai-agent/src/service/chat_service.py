@@ -1,9 +1,13 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, AsyncIterator, Optional
 from datetime import datetime
 from domain.models.chat import ChatRequest, ChatResponse, ChatMessage
 from service.graph.workflow import MultiAgentWorkflow
 from infrastructure.llm.openai_client import OpenAIClient
+from infrastructure.external.tavily_client import TavilyClient
+from service.rag.retriever import DocumentRetriever
 from utils.logger import logger
+import asyncio
+import json
 import time
 import uuid
 
@@ -17,15 +21,28 @@ class ChatService:
     - 상태 기반 대화 관리
     - 자동 에이전트 라우팅
     - 다중 에이전트 응답 통합
+    - SSE 기반 토큰 스트리밍
     """
 
     def __init__(
         self,
         openai_client: OpenAIClient,
+        heartbeat_interval: float = 10.0,
+        tavily_client: Optional[TavilyClient] = None,
+        rag_retriever: Optional[DocumentRetriever] = None,
     ):
+        self.openai_client = openai_client
+
+        # 스트리밍 중 토큰이 없을 때 heartbeat 전송 간격 (초)
+        self.heartbeat_interval = heartbeat_interval
+
+        self.rag_retriever = rag_retriever
+
         # LangGraph 워크플로우 초기화
         self.workflow = MultiAgentWorkflow(
             openai_client=openai_client,
+            tavily_client=tavily_client,
+            rag_retriever=rag_retriever,
         )
 
         # 세션 관리 (메모리 기반, 추후 Redis/DB로 확장 가능)
@@ -51,63 +68,170 @@ class ChatService:
         try:
             # LangGraph 워크플로우 실행
             result = await self.workflow.execute(
-                query=request.message, session_id=session_id, history=history
+                query=request.message, session_id=session_id, history=history,
+                filters=request.filters
             )
 
-            # 응답 생성
-            response_message = result["response"]
-            metadata = result["metadata"]
-
-            # 대화 히스토리 업데이트
-            self._update_session_history(
-                session_id=session_id,
-                user_message=request.message,
-                assistant_response=response_message,
+            chat_response = self._build_chat_response(
+                request, session_id, result, start_time
             )
 
-            # 처리 시간 계산
-            total_time = (time.time() - start_time) * 1000
-
-            # 응답 객체 생성
-            chat_response = ChatResponse(
-                message=response_message,
-                session_id=session_id,
-                agent_used=(
-                    result.get("agent_route", ["general"])[-1]
-                    if result.get("agent_route")
-                    else "general"
-                ),
-                thinking_process=result.get("reasoning", []),
-                metadata={
-                    **metadata,
-                    "total_latency_ms": total_time,
-                    "agent_route": result.get("agent_route", []),
-                    "langgraph_enabled": True,
-                    "workflow_success": result.get("success", True),
-                },
+            logger.info(
+                f"Chat response completed in "
+                f"{chat_response.metadata['total_latency_ms']:.2f}ms"
             )
-
-            logger.info(f"Chat response completed in {total_time:.2f}ms")
             return chat_response
 
         except Exception as e:
             logger.error(f"Chat service error: {e}")
+            return self._build_error_response(session_id, e, start_time)
 
-            # 에러 응답
-            error_response = ChatResponse(
-                message=f"죄송합니다. 처리 중 오류가 발생했습니다: {str(e)}",
-                session_id=session_id,
-                agent_used="error_handler",
-                thinking_process=[f"Error occurred: {str(e)}"],
-                metadata={
-                    "error": str(e),
-                    "total_latency_ms": (time.time() - start_time) * 1000,
-                    "langgraph_enabled": True,
-                    "workflow_success": False,
-                },
-            )
+    async def chat_stream(self, request: ChatRequest) -> AsyncIterator[str]:
+        """
+        스트리밍 채팅 요청 처리 - SSE 프레임 생성
 
-            return error_response
+        Events:
+        - token: 에이전트가 생성한 토큰
+        - reset: 실패한 에이전트 시도 알림 (지금까지 받은 토큰을 버리고 이후 토큰으로 다시 표시)
+        - status: 워크플로우 노드 진행 상황
+        - heartbeat: 토큰이 없는 동안 주기적으로 전송 (프록시 타임아웃 방지)
+        - done: 최종 ChatResponse (metadata에 time_to_first_token_ms 포함)
+        """
+        start_time = time.time()
+        session_id = request.session_id or str(uuid.uuid4())
+        history = self.sessions.get(session_id, [])
+
+        logger.info(f"Processing streaming chat request - Session: {session_id}")
+
+        # 워크플로우 이벤트를 큐로 받아서 heartbeat와 섞어 전송
+        queue: asyncio.Queue = asyncio.Queue()
+
+        async def produce():
+            try:
+                async for event in self.workflow.stream(
+                    query=request.message, session_id=session_id, history=history,
+                    filters=request.filters
+                ):
+                    await queue.put(event)
+            finally:
+                queue.put_nowait(None)
+
+        producer = asyncio.create_task(produce())
+        first_token_time = None
+
+        try:
+            while True:
+                try:
+                    event = await asyncio.wait_for(
+                        queue.get(), timeout=self.heartbeat_interval
+                    )
+                except asyncio.TimeoutError:
+                    yield self._format_sse("heartbeat", {"timestamp": time.time()})
+                    continue
+
+                if event is None:
+                    break
+
+                if event["type"] == "token":
+                    if first_token_time is None:
+                        first_token_time = time.time()
+                    yield self._format_sse(
+                        "token", {"content": event["content"], "agent": event["agent"]}
+                    )
+
+                elif event["type"] == "reset":
+                    yield self._format_sse(
+                        "reset", {"agent": event["agent"], "reason": event["reason"]}
+                    )
+
+                elif event["type"] == "status":
+                    yield self._format_sse("status", {"node": event["node"]})
+
+                elif event["type"] == "done":
+                    chat_response = self._build_chat_response(
+                        request, session_id, event, start_time
+                    )
+                    chat_response.metadata["streamed"] = True
+                    chat_response.metadata["time_to_first_token_ms"] = (
+                        (first_token_time - start_time) * 1000
+                        if first_token_time
+                        else None
+                    )
+                    yield self._format_sse("done", chat_response.model_dump())
+
+        except Exception as e:
+            logger.error(f"Chat stream error: {e}")
+            error_response = self._build_error_response(session_id, e, start_time)
+            yield self._format_sse("done", error_response.model_dump())
+
+        finally:
+            # 클라이언트 연결 종료 시 워크플로우도 중단
+            if not producer.done():
+                producer.cancel()
+
+    def _build_chat_response(
+        self,
+        request: ChatRequest,
+        session_id: str,
+        result: Dict[str, Any],
+        start_time: float,
+    ) -> ChatResponse:
+        """워크플로우 결과로 ChatResponse 생성 및 히스토리 업데이트"""
+        # 응답 생성
+        response_message = result["response"]
+        metadata = result["metadata"]
+
+        # 대화 히스토리 업데이트
+        self._update_session_history(
+            session_id=session_id,
+            user_message=request.message,
+            assistant_response=response_message,
+        )
+
+        # 처리 시간 계산
+        total_time = (time.time() - start_time) * 1000
+
+        # 응답 객체 생성
+        return ChatResponse(
+            message=response_message,
+            session_id=session_id,
+            agent_used=(
+                result.get("agent_route", ["general"])[-1]
+                if result.get("agent_route")
+                else "general"
+            ),
+            thinking_process=result.get("reasoning", []),
+            metadata={
+                **metadata,
+                "total_latency_ms": total_time,
+                "agent_route": result.get("agent_route", []),
+                "langgraph_enabled": True,
+                "workflow_success": result.get("success", True),
+            },
+        )
+
+    def _build_error_response(
+        self, session_id: str, error: Exception, start_time: float
+    ) -> ChatResponse:
+        """에러 응답 생성"""
+        return ChatResponse(
+            message=f"죄송합니다. 처리 중 오류가 발생했습니다: {str(error)}",
+            session_id=session_id,
+            agent_used="error_handler",
+            thinking_process=[f"Error occurred: {str(error)}"],
+            metadata={
+                "error": str(error),
+                "total_latency_ms": (time.time() - start_time) * 1000,
+                "langgraph_enabled": True,
+                "workflow_success": False,
+            },
+        )
+
+    @staticmethod
+    def _format_sse(event: str, data: Dict[str, Any]) -> str:
+        """SSE 프레임 포맷팅"""
+        payload = json.dumps(data, ensure_ascii=False, default=str)
+        return f"event: {event}\ndata: {payload}\n\n"
 
     def _update_session_history(
         self, session_id: str, user_message: str, assistant_response: str
@@ -136,6 +260,10 @@ class ChatService:
             )
         )
 
+        # 토큰 수는 저장 시 한 번만 계산해서 메시지에 캐시
+        for message in self.sessions[session_id][-2:]:
+            message.get_token_count()
+
         # 히스토리 길이 제한 (최근 20개 메시지만 보관)
         if len(self.sessions[session_id]) > 20:
             self.sessions[session_id] = self.sessions[session_id][-20:]
@@ -144,8 +272,14 @@ class ChatService:
         """세션 히스토리 조회"""
         return self.sessions.get(session_id, [])
 
+    async def close(self):
+        """워크플로우 에이전트가 소유한 리소스 정리"""
+        await self.workflow.nodes.close()
+
     def clear_session(self, session_id: str) -> bool:
         """세션 히스토리 삭제"""
+        # 같은 session_id를 다시 쓸 때 이전 대화의 롤링 요약이 섞이지 않도록 함께 삭제
+        self.workflow.nodes.context_builder.clear(session_id)
         if session_id in self.sessions:
             del self.sessions[session_id]
             logger.info(f"🗑️ Cleared session: {session_id}")
@@ -166,6 +300,8 @@ class ChatService:
             "description": "Multi-agent chatbot powered by LangGraph",
             "active_sessions": len(self.sessions),
             "workflow_info": workflow_info,
+            "llm_client": self.openai_client.get_stats(),
+            "retrieval": self.rag_retriever.get_stats() if self.rag_retriever else None,
             "capabilities": [
                 "Multi-agent coordination with LangGraph",
                 "Automatic intent analysis and routing",
@@ -182,6 +318,7 @@ class ChatService:
                 "Conversation history management",
                 "Performance monitoring and tracing",
                 "Retry mechanisms with graceful degradation",
+                "SSE token streaming with heartbeats",
             ],
         }
 
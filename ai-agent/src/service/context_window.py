@@ -0,0 +1,140 @@
+"""
+Token-aware conversation window builder
+"""
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from domain.models.chat import ChatMessage, ConversationWindow
+from infrastructure.llm.openai_client import OpenAIClient
+from utils.cache import TTLCache
+from utils.logger import logger
+from utils.token_counter import count_tokens, truncate_to_tokens
+
+
+SUMMARY_SYSTEM_PROMPT = """당신은 대화 요약 도우미입니다.
+기존 요약과 새로 추가된 대화를 합쳐 하나의 간결한 요약으로 갱신하세요.
+- 사용자의 목표, 결정된 사항, 중요한 사실 위주로 정리
+- 인사말이나 반복되는 내용은 생략
+- 한국어로 작성"""
+
+
+class ContextWindowBuilder:
+    """
+    대화 히스토리를 모델별 토큰 예산에 맞춰 구성
+
+    - 최신 대화부터 예산이 허용하는 만큼 원문 그대로 포함
+    - 예산을 넘는 이전 대화는 세션별 롤링 요약으로 대체
+    - 요약은 세션별로 캐시하고, 새로 밀려난 메시지만 기존 요약에 합쳐 갱신
+    """
+
+    def __init__(
+        self,
+        llm_client: OpenAIClient,
+        token_budgets: Optional[Dict[str, int]] = None,
+        default_budget: int = 2000,
+        summary_model: str = "gpt-4o-mini",
+        summary_max_tokens: int = 300,
+        summary_ttl_seconds: float = 1800,
+    ):
+        self.llm_client = llm_client
+        self.token_budgets = token_budgets or {}
+        self.default_budget = default_budget
+        self.summary_model = summary_model
+        self.summary_max_tokens = summary_max_tokens
+
+        # session_id -> (요약에 반영된 마지막 메시지 시각, 요약)
+        self._summaries = TTLCache(max_entries=4096, ttl_seconds=summary_ttl_seconds)
+
+    def get_budget(self, model: str) -> int:
+        """모델별 대화 컨텍스트 토큰 예산"""
+        return self.token_budgets.get(model, self.default_budget)
+
+    async def build(
+        self,
+        session_id: str,
+        history: List[ChatMessage],
+        model: str,
+        reserved_tokens: int = 0,
+    ) -> ConversationWindow:
+        """
+        대화 윈도우 생성
+
+        Args:
+            session_id: 세션 ID (요약 캐시 키)
+            history: 시간순 대화 히스토리
+            model: 프롬프트를 받을 모델 (예산 결정)
+            reserved_tokens: 다른 프롬프트 요소를 위해 비워둘 토큰 수
+        """
+        budget = max(self.get_budget(model) - reserved_tokens, 0)
+        total = sum(message.get_token_count() for message in history)
+
+        # 전체가 예산 안에 들어가면 그대로 사용
+        if total <= budget:
+            return ConversationWindow(
+                messages=list(history), token_count=total, token_budget=budget
+            )
+
+        # 요약 자리를 비워두고 최신 메시지부터 채움
+        recent_budget = max(budget - self.summary_max_tokens, 0)
+        recent, used = self._pack_recent(history, recent_budget)
+        older = history[: len(history) - len(recent)]
+
+        summary = await self._rolling_summary(session_id, older)
+        summary = truncate_to_tokens(summary, self.summary_max_tokens)
+
+        return ConversationWindow(
+            messages=recent,
+            summary=summary or None,
+            token_count=used + count_tokens(summary),
+            token_budget=budget,
+            summarized_count=len(older),
+        )
+
+    def _pack_recent(
+        self, history: List[ChatMessage], budget: int
+    ) -> Tuple[List[ChatMessage], int]:
+        """최신 메시지부터 예산 안에 들어가는 만큼 선택"""
+        selected = []
+        used = 0
+        for message in reversed(history):
+            tokens = message.get_token_count()
+            if used + tokens > budget:
+                break
+            selected.append(message)
+            used += tokens
+        selected.reverse()
+        return selected, used
+
+    async def _rolling_summary(self, session_id: str, older: List[ChatMessage]) -> str:
+        """이전 대화 롤링 요약 (캐시된 요약에 새로 밀려난 메시지만 반영)"""
+        cached = self._summaries.get(session_id)
+        covered_until, summary = cached if cached else (datetime.min, "")
+
+        new_messages = [m for m in older if m.timestamp > covered_until]
+        if not new_messages:
+            return summary
+
+        transcript = "\n".join(f"{m.role}: {m.content}" for m in new_messages)
+        prompt = f"[기존 요약]\n{summary or '(없음)'}\n\n[새 대화]\n{transcript}"
+
+        try:
+            summary = await self.llm_client.generate(
+                prompt=prompt,
+                system_prompt=SUMMARY_SYSTEM_PROMPT,
+                model=self.summary_model,
+                temperature=0.0,
+                max_tokens=self.summary_max_tokens,
+            )
+        except Exception as e:
+            # 요약 실패 시 기존 요약 + 새 대화 원문을 잘라서 사용
+            logger.warning(f"Conversation summary failed, truncating instead: {e}")
+            summary = truncate_to_tokens(
+                f"{summary}\n{transcript}".strip(), self.summary_max_tokens
+            )
+
+        self._summaries.set(session_id, (new_messages[-1].timestamp, summary))
+        return summary
+
+    def clear(self, session_id: str):
+        """세션 요약 캐시 삭제"""
+        self._summaries.delete(session_id)
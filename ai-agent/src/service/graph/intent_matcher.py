@@ -0,0 +1,172 @@
+"""
+Compiled multi-pattern intent matcher for supervisor routing
+"""
+import json
+import os
+import re
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from pydantic import BaseModel, Field
+
+from domain.models.agent import AgentType
+from utils.logger import logger
+
+
+class IntentMatch(BaseModel):
+    """의도 분석 결과"""
+    agent: AgentType
+    confidence: float = 0.0               # 1순위 점수 / 전체 점수 (일치 키워드가 없으면 0)
+    scores: Dict[str, float] = Field(default_factory=dict)
+    matched_keywords: List[str] = Field(default_factory=list)
+    multi_intent: bool = False
+    candidates: List[AgentType] = Field(default_factory=list)  # 점수 순 상위 의도들
+
+
+def parse_intent_rules(raw_rules: Dict[str, Dict[str, float]]) -> Dict[str, Dict[AgentType, float]]:
+    """{"rag": {"문서": 1.0}} -> 키워드(소문자) -> 에이전트별 가중치 (알 수 없는 에이전트, 0 이하 가중치는 무시)"""
+    keywords: Dict[str, Dict[AgentType, float]] = {}
+    for agent_name, rules in raw_rules.items():
+        try:
+            agent = AgentType(agent_name)
+        except ValueError:
+            logger.warning(f"Unknown agent in intent rules: {agent_name}")
+            continue
+        for keyword, weight in rules.items():
+            keyword = keyword.strip().lower()
+            if keyword and weight > 0:
+                keywords.setdefault(keyword, {})[agent] = float(weight)
+    return keywords
+
+
+class CompiledIntentRules:
+    """
+    키워드 사전을 한 번에 훑는 패턴 하나로 컴파일한 규칙
+
+    - 긴 키워드 우선 alternation 정규식: 질의를 C 수준에서 한 번만 스캔 (키워드 수와 무관)
+    - 일치한 키워드에 포함된 더 짧은 키워드의 가중치도 미리 합산
+      ("실행해" 일치 시 "실행" 가중치도 반영, Aho-Corasick 출력 링크와 같은 효과)
+    """
+
+    def __init__(self, keywords: Dict[str, Dict[AgentType, float]]):
+        self.keywords = keywords
+        # 동점이면 규칙에 먼저 나온 에이전트 우선
+        self.priority: Dict[AgentType, int] = {}
+        for agent_weights in keywords.values():
+            for agent in agent_weights:
+                self.priority.setdefault(agent, len(self.priority))
+        self.weights: Dict[str, List[Tuple[AgentType, float]]] = {}
+        for keyword in keywords:
+            totals: Dict[AgentType, float] = {}
+            for inner, agent_weights in keywords.items():
+                if inner in keyword:
+                    for agent, weight in agent_weights.items():
+                        totals[agent] = totals.get(agent, 0.0) + weight
+            self.weights[keyword] = list(totals.items())
+
+        ordered = sorted(keywords, key=len, reverse=True)
+        self.pattern = re.compile("|".join(map(re.escape, ordered))) if ordered else None
+
+    def scan(self, text: str) -> Tuple[Dict[AgentType, float], List[str]]:
+        """에이전트별 점수 합계와 일치한 키워드 (등장 순, 중복 제거)"""
+        scores: Dict[AgentType, float] = {}
+        if self.pattern is None:
+            return scores, []
+
+        matched = self.pattern.findall(text.lower())
+        for keyword in matched:
+            for agent, weight in self.weights[keyword]:
+                scores[agent] = scores.get(agent, 0.0) + weight
+        return scores, list(dict.fromkeys(matched))
+
+
+class IntentMatcher:
+    """
+    가중치 키워드 기반 의도 분석기
+
+    - 모든 에이전트의 점수를 한 번의 스캔으로 계산, 최고 점수 에이전트로 라우팅
+      (일치 키워드가 없으면 General)
+    - 2순위 이상 의도의 점수가 1순위의 multi_intent_ratio 이상이고 min_score 이상이면 다중 의도
+    - rules_path(JSON, 에이전트 -> {키워드: 가중치})가 있으면 설정 대신 파일을 사용하고
+      파일이 바뀌면 다음 질의에서 다시 컴파일 (reload_interval_seconds마다 mtime 확인)
+    """
+
+    def __init__(
+        self,
+        rules: Dict[str, Dict[str, float]],
+        rules_path: str = "",
+        multi_intent_ratio: float = 0.6,
+        min_score: float = 1.0,
+        reload_interval_seconds: float = 5.0,
+    ):
+        self.rules_path = rules_path
+        self.multi_intent_ratio = multi_intent_ratio
+        self.min_score = min_score
+        self.reload_interval_seconds = reload_interval_seconds
+
+        self._lock = threading.Lock()
+        self._rules_mtime: Optional[float] = None
+        self._next_check = 0.0
+        self.reloads = 0
+        self.compiled = CompiledIntentRules(parse_intent_rules(rules))
+        if rules_path:
+            self._reload_if_changed()
+
+    def reload(self, rules: Dict[str, Dict[str, float]]):
+        """규칙 교체 (컴파일이 끝난 뒤 참조만 바꾸므로 진행 중인 분석에 영향 없음)"""
+        self.compiled = CompiledIntentRules(parse_intent_rules(rules))
+        self.reloads += 1
+        logger.info(f"Intent rules compiled: {len(self.compiled.keywords)} keywords")
+
+    def _reload_if_changed(self):
+        now = time.monotonic()
+        if now < self._next_check or not self._lock.acquire(blocking=False):
+            return
+        try:
+            self._next_check = now + self.reload_interval_seconds
+            mtime = os.path.getmtime(self.rules_path)
+            if mtime == self._rules_mtime:
+                return
+            with open(self.rules_path, "r", encoding="utf-8") as f:
+                rules = json.load(f)
+            self._rules_mtime = mtime
+            self.reload(rules)
+        except (OSError, ValueError) as e:
+            # 파일 오류 시 마지막으로 컴파일된 규칙 유지
+            logger.warning(f"Intent rules reload failed ({self.rules_path}): {e}")
+        finally:
+            self._lock.release()
+
+    def match(self, query: str) -> IntentMatch:
+        if self.rules_path:
+            self._reload_if_changed()
+
+        compiled = self.compiled
+        scores, matched = compiled.scan(query)
+        if not scores:
+            return IntentMatch(agent=AgentType.GENERAL, candidates=[AgentType.GENERAL])
+
+        priority = compiled.priority
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], priority[item[0]]))
+        top_score = ranked[0][1]
+        candidates = [
+            agent for agent, score in ranked
+            if score >= self.min_score and score >= top_score * self.multi_intent_ratio
+        ] or [ranked[0][0]]
+
+        return IntentMatch(
+            agent=ranked[0][0],
+            confidence=top_score / sum(scores.values()),
+            scores={agent.value: score for agent, score in ranked},
+            matched_keywords=matched,
+            multi_intent=len(candidates) > 1,
+            candidates=candidates,
+        )
+
+    def get_stats(self) -> Dict[str, object]:
+        return {
+            "keywords": len(self.compiled.keywords),
+            "rules_path": self.rules_path or None,
+            "reloads": self.reloads,
+        }
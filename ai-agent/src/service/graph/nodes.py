@@ -1,10 +1,19 @@
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from domain.models.graph_state import GraphState, AgentDecision
 from domain.models.agent import AgentType, AgentRequest, AgentResponse
-from service.agent.RAG_agent import RAGAgent
+from service.agent.rag_agent import RAGAgent
 from service.agent.search_agent import SearchAgent
+from service.agent.search_context import SearchContextBuilder
 from service.agent.general_agent import GeneralAgent
+from service.agent.model_cascade import load_model_policies
+from service.graph.intent_matcher import IntentMatcher, IntentMatch
+from service.rag.context_packer import ContextPacker
+from service.context_window import ContextWindowBuilder
 from infrastructure.llm.openai_client import OpenAIClient
+from infrastructure.external.tavily_client import TavilyClient
+from service.rag.retriever import DocumentRetriever
+from config.settings import settings
+from langgraph.config import get_stream_writer
 from utils.logger import logger
 import time
 
@@ -14,12 +23,48 @@ class LangGraphNodes:
     
     def __init__(
         self,
-        openai_client: OpenAIClient
+        openai_client: OpenAIClient,
+        tavily_client: Optional[TavilyClient] = None,
+        rag_retriever: Optional[DocumentRetriever] = None
     ):
+        # 에이전트별 모델 정책 (빠른 모델 -> 필요 시 상위 모델로 에스컬레이션)
+        self.model_policies = load_model_policies(
+            settings.agent_model_policies,
+            default_model=settings.openai_model,
+            default_max_tokens=settings.openai_max_tokens,
+        )
+        threshold = settings.complex_query_token_threshold
+        
         # 에이전트 인스턴스 생성
-        self.rag_agent = RAGAgent(openai_client)
-        self.search_agent = SearchAgent(openai_client)
-        self.general_agent = GeneralAgent(openai_client)
+        self.rag_agent = RAGAgent(
+            openai_client,
+            self.model_policies[AgentType.RAG],
+            threshold,
+            retriever=rag_retriever,
+            top_k=settings.rag_top_k,
+            context_packer=ContextPacker(
+                token_budgets=settings.rag_context_token_budgets,
+                default_budget=settings.rag_context_default_token_budget,
+                duplicate_threshold=settings.rag_context_duplicate_threshold
+            )
+        )
+        self.search_agent = SearchAgent(
+            openai_client,
+            self.model_policies[AgentType.SEARCH],
+            threshold,
+            search_client=tavily_client,
+            max_sub_queries=settings.search_max_sub_queries,
+            max_concurrent_searches=settings.search_max_concurrency,
+            per_search_timeout=settings.search_timeout_seconds,
+            context_builder=SearchContextBuilder(
+                token_budget=settings.search_context_token_budget,
+                sentences_per_result=settings.search_sentences_per_result,
+                duplicate_threshold=settings.search_duplicate_threshold
+            )
+        )
+        self.general_agent = GeneralAgent(
+            openai_client, self.model_policies[AgentType.GENERAL], threshold
+        )
         
         # 서비스 매핑
         self.services = {
@@ -28,8 +73,30 @@ class LangGraphNodes:
             AgentType.GENERAL: self.general_agent
         }
         
+        # 의도 분석기 (키워드 사전을 컴파일해 한 번의 스캔으로 에이전트별 점수 계산)
+        self.intent_matcher = IntentMatcher(
+            settings.intent_rules,
+            rules_path=settings.intent_rules_path,
+            multi_intent_ratio=settings.intent_multi_agent_ratio,
+            min_score=settings.intent_min_score,
+            reload_interval_seconds=settings.intent_rules_reload_seconds,
+        )
+        
+        # 대화 히스토리를 토큰 예산에 맞춰 구성
+        self.context_builder = ContextWindowBuilder(
+            openai_client,
+            token_budgets=settings.context_token_budgets,
+            default_budget=settings.context_default_token_budget,
+            summary_model=settings.context_summary_model,
+            summary_max_tokens=settings.context_summary_max_tokens,
+        )
+        
         logger.info("LangGraph nodes initialized")
 
+    async def close(self):
+        """에이전트가 직접 만든 외부 클라이언트 정리"""
+        await self.search_agent.close()
+
     async def supervisor_node(self, state: GraphState) -> Dict[str, Any]:
         """
         Supervisor 노드 - 사용자 의도 분석 및 라우팅 결정
@@ -39,28 +106,38 @@ class LangGraphNodes:
         start_time = time.time()
         
         # 의도 분석
-        agent_type = self._analyze_intent(state.query)
+        intent = self._analyze_intent(state.query)
+        agent_type = intent.agent
         
         # 상태 업데이트
         state.current_agent = agent_type
         state.agent_route.append(agent_type)
+        state.requires_multi_agent = intent.multi_intent
         state.reasoning.append(f"🎯 Supervisor: Routing to {agent_type.value} agent")
+        if intent.multi_intent:
+            state.reasoning.append(
+                "🎯 Supervisor: Multiple intents detected "
+                f"({', '.join(agent.value for agent in intent.candidates)})"
+            )
         
         # 메타데이터 업데이트
         processing_time = (time.time() - start_time) * 1000
         state.metadata.update({
             "supervisor_decision": agent_type.value,
             "supervisor_latency_ms": processing_time,
-            "routing_confidence": 0.85  # TODO: 실제 신뢰도 계산
+            "routing_confidence": intent.confidence,
+            "intent_scores": intent.scores,
+            "intent_keywords": intent.matched_keywords
         })
         
-        logger.info(f"🎯 Supervisor decision: {agent_type.value}")
+        logger.info(f"🎯 Supervisor decision: {agent_type.value} (confidence {intent.confidence:.2f})")
         
         return {
             "current_agent": agent_type,
             "agent_route": state.agent_route,
             "reasoning": state.reasoning,
-            "metadata": state.metadata
+            "metadata": state.metadata,
+            "requires_multi_agent": state.requires_multi_agent
         }
 
     async def rag_agent_node(self, state: GraphState) -> Dict[str, Any]:
@@ -116,24 +193,71 @@ class LangGraphNodes:
         logger.info(f"{emoji} Executing {agent_type.value} agent")
         
         start_time = time.time()
+        reset_stream = None
         
         try:
             # 에이전트 서비스 가져오기
             service = self.services[agent_type]
             
+            # 스트리밍 모드면 LangGraph custom 스트림으로 토큰 전달
+            on_token = None
+            streamed_tokens = []
+            if state.stream:
+                writer = get_stream_writer()
+
+                def on_token(token: str):
+                    streamed_tokens.append(token)
+                    writer({
+                        "type": "token",
+                        "agent": agent_type.value,
+                        "content": token
+                    })
+
+                def reset_stream(reason: str):
+                    # 실패한 시도의 토큰은 클라이언트가 버리도록 알림
+                    # (폴백/재시도 응답 토큰이 그 뒤에 이어 붙지 않도록)
+                    if streamed_tokens:
+                        streamed_tokens.clear()
+                        writer({
+                            "type": "reset",
+                            "agent": agent_type.value,
+                            "reason": reason
+                        })
+            
+            # 토큰 예산 안의 대화 컨텍스트 (초과분은 롤링 요약)
+            # 대화 창을 쓰지 않는 에이전트는 요약 LLM 호출/토큰 계산을 생략
+            conversation = None
+            if service.uses_conversation:
+                conversation = await self.context_builder.build(
+                    session_id=state.session_id,
+                    history=state.history,
+                    model=self.model_policies[agent_type].primary.model
+                )
+            
             # 요청 생성
             request = AgentRequest(
                 query=state.query,
                 context={
                     "session_id": state.session_id,
                     "history": state.history,
+                    "conversation": conversation,
+                    "filters": state.filters or None,
                     "metadata": state.metadata
                 },
-                session_id=state.session_id
+                session_id=state.session_id,
+                on_token=on_token
             )
             
-            # 에이전트 실행 (동기 방식)
-            response = service.process(request)
+            # 에이전트 실행 (비동기 방식 - 이벤트 루프에서 다른 요청과 겹쳐 실행)
+            response = await service.process(request)
+            
+            # 스트리밍 도중 실패해 에이전트가 오류 응답을 돌려준 경우 부분 토큰 폐기
+            if reset_stream and response.metadata.get("error"):
+                reset_stream(response.metadata["error"])
+            
+            # LLM을 거치지 않은 응답(도움말, 인사, 오류 안내 등)은 한 번에 전달
+            if on_token and not streamed_tokens:
+                on_token(response.content)
             
             # 응답 처리
             state.response = response.content
@@ -146,6 +270,11 @@ class LangGraphNodes:
                 f"{agent_type.value}_latency_ms": processing_time,
                 **response.metadata
             })
+            if conversation is not None:
+                state.metadata.update({
+                    "conversation_tokens": conversation.token_count,
+                    "conversation_summarized_messages": conversation.summarized_count
+                })
             
             # 완료 표시
             state.is_complete = True
@@ -162,6 +291,8 @@ class LangGraphNodes:
             
         except Exception as e:
             logger.error(f"{emoji} Error in {agent_type.value} agent: {e}")
+            if reset_stream:
+                reset_stream(str(e))
             
             # 에러 처리
             state.errors.append(f"{agent_type.value}: {str(e)}")
@@ -179,38 +310,11 @@ class LangGraphNodes:
                 "reasoning": state.reasoning
             }
 
-    def _analyze_intent(self, query: str) -> AgentType:
+    def _analyze_intent(self, query: str) -> IntentMatch:
         """
-        간단한 의도 분석 (추후 ML 모델로 교체 가능)
+        가중치 키워드 의도 분석 (모든 에이전트 점수를 한 번에 계산, 추후 ML 모델로 교체 가능)
         """
-        query_lower = query.lower()
-        
-        # RAG Agent 키워드
-        rag_keywords = [
-            "문서", "api", "가이드", "매뉴얼", "설명서", 
-            "찾아", "검색", "사용법", "방법", "어떻게"
-        ]
-        if any(keyword in query_lower for keyword in rag_keywords):
-            return AgentType.RAG
-        
-        # Code Agent 키워드
-        code_keywords = [
-            "코드", "실행", "프로그램", "계산", "함수",
-            "python", "javascript", "실행해", "계산해"
-        ]
-        if any(keyword in query_lower for keyword in code_keywords):
-            return AgentType.CODE
-        
-        # Search Agent 키워드
-        search_keywords = [
-            "최신", "뉴스", "검색", "인터넷", "웹",
-            "현재", "오늘", "요즘", "트렌드"
-        ]
-        if any(keyword in query_lower for keyword in search_keywords):
-            return AgentType.SEARCH
-        
-        # 기본: General Agent
-        return AgentType.GENERAL
+        return self.intent_matcher.match(query)
 
     def should_continue(self, state: GraphState) -> str:
         """
@@ -1,11 +1,13 @@
 import time
 from langgraph.graph import StateGraph, END
-from typing import Dict, Any
+from typing import Dict, Any, AsyncIterator, Optional
 
 from domain.models.graph_state import GraphState, AgentDecision
 from domain.models.agent import AgentType
 from service.graph.nodes import LangGraphNodes
 from infrastructure.llm.openai_client import OpenAIClient
+from infrastructure.external.tavily_client import TavilyClient
+from service.rag.retriever import DocumentRetriever
 from utils.logger import logger
 
 
@@ -17,8 +19,10 @@ class MultiAgentWorkflow:
     def __init__(
         self,
         openai_client: OpenAIClient,
+        tavily_client: Optional[TavilyClient] = None,
+        rag_retriever: Optional[DocumentRetriever] = None,
     ):
-        self.nodes = LangGraphNodes(openai_client)
+        self.nodes = LangGraphNodes(openai_client, tavily_client, rag_retriever)
         self.graph = self._build_workflow()
         logger.info("Multi-Agent Workflow initialized with LangGraph")
 
@@ -108,7 +112,7 @@ class MultiAgentWorkflow:
         return AgentDecision.FINISH.value
 
     async def execute(
-        self, query: str, session_id: str, history: list = None
+        self, query: str, session_id: str, history: list = None, filters: dict = None
     ) -> Dict[str, Any]:
         """
         워크플로우 실행
@@ -120,6 +124,7 @@ class MultiAgentWorkflow:
             query=query,
             session_id=session_id,
             history=history or [],
+            filters=filters or {},
             metadata={"workflow_version": "1.0", "start_time": time.time()},
         )
 
@@ -127,33 +132,82 @@ class MultiAgentWorkflow:
             # 워크플로우 실행
             result = await self.graph.ainvoke(initial_state.model_dump())
 
-            # 결과 처리
-            final_state = GraphState(**result)
+            return self._build_result(result)
 
-            # 실행 시간 계산
-            execution_time = time.time() - final_state.metadata.get("start_time", 0)
-            final_state.metadata["execution_time_ms"] = execution_time * 1000
+        except Exception as e:
+            logger.error(f"❌ Workflow execution failed: {e}")
+            return self._build_error_result(e)
+
+    async def stream(
+        self, query: str, session_id: str, history: list = None, filters: dict = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        워크플로우 스트리밍 실행
+
+        LangGraph 스트림을 그대로 이벤트로 변환합니다.
+        - {"type": "token", ...}: 에이전트가 생성한 토큰 (custom 스트림)
+        - {"type": "reset", ...}: 실패한 에이전트 시도의 토큰 폐기 (custom 스트림)
+        - {"type": "status", "node": ...}: 노드 실행 완료 (updates 스트림)
+        - {"type": "done", ...}: 최종 결과 (execute()와 동일한 형태)
+        """
+        logger.info(f"🚀 Starting streaming workflow for query: {query}")
 
-            logger.info(f"✅ Workflow completed in {execution_time:.2f}s")
+        initial_state = GraphState(
+            query=query,
+            session_id=session_id,
+            history=history or [],
+            filters=filters or {},
+            stream=True,
+            metadata={"workflow_version": "1.0", "start_time": time.time()},
+        )
 
-            return {
-                "response": final_state.response,
-                "metadata": final_state.metadata,
-                "reasoning": final_state.reasoning,
-                "agent_route": final_state.agent_route,
-                "success": True,
-            }
+        final_values = None
+        try:
+            async for mode, chunk in self.graph.astream(
+                initial_state.model_dump(),
+                stream_mode=["custom", "updates", "values"],
+            ):
+                if mode == "custom":
+                    yield chunk
+                elif mode == "updates":
+                    for node_name in chunk:
+                        yield {"type": "status", "node": node_name}
+                else:
+                    final_values = chunk
+
+            yield {"type": "done", **self._build_result(final_values)}
 
         except Exception as e:
-            logger.error(f"❌ Workflow execution failed: {e}")
+            logger.error(f"❌ Streaming workflow failed: {e}")
+            yield {"type": "done", **self._build_error_result(e)}
+
+    def _build_result(self, result: Dict[str, Any]) -> Dict[str, Any]:
+        """그래프 최종 상태를 응답 형태로 변환"""
+        final_state = GraphState(**result)
+
+        # 실행 시간 계산
+        execution_time = time.time() - final_state.metadata.get("start_time", 0)
+        final_state.metadata["execution_time_ms"] = execution_time * 1000
+
+        logger.info(f"✅ Workflow completed in {execution_time:.2f}s")
 
-            return {
-                "response": f"죄송합니다. 처리 중 오류가 발생했습니다: {str(e)}",
-                "metadata": {"error": str(e)},
-                "reasoning": ["Workflow execution failed"],
-                "agent_route": [],
-                "success": False,
-            }
+        return {
+            "response": final_state.response,
+            "metadata": final_state.metadata,
+            "reasoning": final_state.reasoning,
+            "agent_route": final_state.agent_route,
+            "success": True,
+        }
+
+    def _build_error_result(self, error: Exception) -> Dict[str, Any]:
+        """워크플로우 실패 응답"""
+        return {
+            "response": f"죄송합니다. 처리 중 오류가 발생했습니다: {str(error)}",
+            "metadata": {"error": str(error)},
+            "reasoning": ["Workflow execution failed"],
+            "agent_route": [],
+            "success": False,
+        }
 
     def get_workflow_info(self) -> Dict[str, Any]:
         """워크플로우 정보"""
@@ -182,5 +236,6 @@ class MultiAgentWorkflow:
                 "Response aggregation",
                 "Execution tracing",
                 "Retry mechanism",
+                "Token streaming",
             ],
         }
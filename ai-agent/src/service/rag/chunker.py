@@ -0,0 +1,120 @@
+"""
+Document loading and markdown-aware chunking
+"""
+import os
+import re
+from typing import Iterator, List, Sequence, Tuple
+
+from domain.models.document import DocumentChunk
+from infrastructure.retrieval.metadata_index import EXTENSION_LANGUAGES
+
+
+DOCUMENT_EXTENSIONS = (".md", ".markdown", ".txt", ".rst")
+# 소스 코드도 수집해 language 필터("server/의 Java 코드만")가 실제 청크와 일치하도록 함
+CODE_EXTENSIONS = tuple(EXTENSION_LANGUAGES)
+SKIP_DIRS = {"node_modules", "__pycache__", ".git", ".cache", ".venv", "venv", "dist", "build"}
+
+_HEADING = re.compile(r"^(#{1,6})\s+(.*?)\s*#*\s*$")
+_FENCE = re.compile(r"^\s*(```|~~~)")
+
+
+def iter_document_paths(paths: Sequence[str]) -> Iterator[str]:
+    """경로 목록에서 문서 / 소스 코드 파일 나열 (디렉터리는 재귀 탐색)"""
+    for path in paths:
+        if os.path.isfile(path):
+            yield path
+        elif os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                dirs[:] = sorted(d for d in dirs if d not in SKIP_DIRS and not d.startswith("."))
+                for name in sorted(files):
+                    if name.lower().endswith(DOCUMENT_EXTENSIONS + CODE_EXTENSIONS):
+                        yield os.path.join(root, name)
+
+
+class MarkdownChunker:
+    """
+    마크다운 문서 청크 분할
+
+    - 헤딩 단위로 섹션을 나누고 섹션 경로를 청크 메타데이터로 보존
+    - 섹션이 길면 문단 경계에서 max_chars 이하로 분할
+    - 코드 블록 안의 '#'은 헤딩으로 취급하지 않음
+    - 소스 코드 파일은 헤딩 없이 빈 줄 경계에서 분할 (주석 '#'을 헤딩으로 오인하지 않고 들여쓰기 보존)
+    """
+
+    def __init__(self, max_chars: int = 1200, min_chars: int = 40):
+        self.max_chars = max_chars
+        self.min_chars = min_chars
+
+    def chunk_file(self, path: str, doc_id: str) -> List[DocumentChunk]:
+        with open(path, encoding="utf-8", errors="replace") as f:
+            return self.chunk_text(f.read(), doc_id)
+
+    def chunk_text(self, text: str, doc_id: str) -> List[DocumentChunk]:
+        title = os.path.basename(doc_id)
+        chunks: List[DocumentChunk] = []
+
+        is_code = doc_id.lower().endswith(CODE_EXTENSIONS)
+        sections = [([], text)] if is_code else self._sections(text)
+        for headings, body in sections:
+            if headings and title == os.path.basename(doc_id):
+                title = headings[0]
+            section = " > ".join(headings)
+            for piece in self._split(body, keep_indent=is_code):
+                if len(piece) < self.min_chars and not section:
+                    continue
+                chunks.append(
+                    DocumentChunk(
+                        chunk_id=f"{doc_id}#{len(chunks)}",
+                        doc_id=doc_id,
+                        title=title,
+                        section=section,
+                        content=piece,
+                        position=len(chunks),
+                    )
+                )
+        return chunks
+
+    def _sections(self, text: str) -> Iterator[Tuple[List[str], str]]:
+        """(헤딩 경로, 본문) 단위로 분리"""
+        headings: List[str] = []
+        lines: List[str] = []
+        in_fence = False
+
+        for line in text.splitlines():
+            if _FENCE.match(line):
+                in_fence = not in_fence
+            match = None if in_fence else _HEADING.match(line)
+            if match:
+                if any(l.strip() for l in lines):
+                    yield list(headings), "\n".join(lines).strip()
+                lines = []
+                level = len(match.group(1))
+                headings = headings[: level - 1] + [match.group(2)]
+            else:
+                lines.append(line)
+
+        if any(l.strip() for l in lines):
+            yield list(headings), "\n".join(lines).strip()
+
+    def _split(self, body: str, keep_indent: bool = False) -> List[str]:
+        """문단 경계에서 max_chars 이하로 묶기 (긴 문단은 강제로 자름)"""
+        pieces: List[str] = []
+        current = ""
+        for paragraph in re.split(r"\n\s*\n", body):
+            paragraph = paragraph.strip("\n").rstrip() if keep_indent else paragraph.strip()
+            if not paragraph.strip():
+                continue
+            while len(paragraph) > self.max_chars:
+                if current:
+                    pieces.append(current)
+                    current = ""
+                pieces.append(paragraph[: self.max_chars])
+                paragraph = paragraph[self.max_chars:]
+            if current and len(current) + len(paragraph) + 2 > self.max_chars:
+                pieces.append(current)
+                current = paragraph
+            else:
+                current = f"{current}\n\n{paragraph}" if current else paragraph
+        if current:
+            pieces.append(current)
+        return pieces
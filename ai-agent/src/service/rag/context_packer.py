@@ -0,0 +1,211 @@
+"""
+Token-budgeted packing of retrieved chunks into the RAG prompt context
+"""
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+from domain.models.document import RetrievedChunk
+from utils.minhash import MinHasher
+from utils.text_tokenizer import tokenize
+from utils.token_counter import count_tokens, truncate_to_tokens
+
+
+EMPTY_CONTEXT = "관련 문서를 찾을 수 없습니다."
+
+
+class ContextBlock(BaseModel):
+    """같은 문서의 연속 청크를 합친 컨텍스트 단위"""
+    doc_id: str
+    title: str
+    sections: List[str] = Field(default_factory=list)
+    chunk_ids: List[str] = Field(default_factory=list)
+    content: str
+    score: float              # 포함된 청크 중 최고 점수
+    last_position: int = 0
+
+
+class PackedContext(BaseModel):
+    """시스템 프롬프트에 넣을 문서 컨텍스트"""
+    text: str
+    sources: List[str] = Field(default_factory=list)         # 포함된 청크 ID (블록 점수 순)
+    dropped_chunks: List[str] = Field(default_factory=list)  # 토큰 예산 초과로 제외된 청크 ID
+    token_budget: int = 0
+    raw_tokens: int = 0       # 검색 결과를 그대로 나열했을 때의 토큰 수
+    tokens: int = 0           # 실제 컨텍스트 토큰 수
+    duplicates_removed: int = 0
+    chunks_merged: int = 0    # 인접 청크와 합쳐진 청크 수
+    truncated: bool = False   # 최상위 블록을 예산에 맞게 잘랐는지
+
+    @property
+    def saved_tokens(self) -> int:
+        return max(self.raw_tokens - self.tokens, 0)
+
+    def to_metadata(self) -> Dict[str, Any]:
+        """AgentResponse.metadata에 기록할 정보"""
+        return {
+            "context_tokens": self.tokens,
+            "context_token_budget": self.token_budget,
+            "context_saved_tokens": self.saved_tokens,
+            "context_dropped_chunks": self.dropped_chunks,
+            "context_duplicates_removed": self.duplicates_removed,
+            "context_chunks_merged": self.chunks_merged,
+            "context_truncated": self.truncated,
+        }
+
+
+class ContextPacker:
+    """
+    검색된 청크를 모델별 토큰 예산에 맞춰 컨텍스트로 구성
+
+    1. 같은 청크 / 같은 내용(content_hash) / MinHash 근사 중복은 점수가 높은 쪽만 유지
+    2. 같은 문서에서 위치가 이어지는 청크는 하나의 블록으로 합침
+       (앞 청크 끝과 다음 청크 앞부분이 겹치면 겹친 부분은 한 번만)
+    3. 블록을 최고 점수 순으로 예산 안에 들어가는 만큼 포함
+       - 들어가지 않는 블록은 건너뛰고 더 짧은 다음 블록 확인
+       - 최상위 블록 하나도 들어가지 않으면 예산에 맞게 잘라서 포함
+    """
+
+    def __init__(
+        self,
+        token_budgets: Optional[Dict[str, int]] = None,
+        default_budget: int = 3000,
+        duplicate_threshold: float = 0.8,
+        min_overlap_chars: int = 20,
+    ):
+        self.token_budgets = token_budgets or {}
+        self.default_budget = default_budget
+        self.duplicate_threshold = duplicate_threshold
+        self.min_overlap_chars = min_overlap_chars
+        self.minhasher = MinHasher()
+
+    def get_budget(self, model: Optional[str]) -> int:
+        """모델별 문서 컨텍스트 토큰 예산"""
+        return self.token_budgets.get(model, self.default_budget)
+
+    def pack(self, documents: List[RetrievedChunk], model: Optional[str] = None) -> PackedContext:
+        budget = self.get_budget(model)
+        if not documents:
+            return PackedContext(text=EMPTY_CONTEXT, token_budget=budget)
+
+        raw_tokens = count_tokens(
+            "\n".join(format_block(i, self._block(doc)) for i, doc in enumerate(documents, 1)),
+            model,
+        )
+        ranked = sorted(documents, key=lambda doc: doc.score, reverse=True)
+        kept = self._remove_duplicates(ranked)
+        blocks = self._merge_adjacent(kept)
+
+        selected: List[ContextBlock] = []
+        dropped: List[str] = []
+        used = 0
+        truncated = False
+        for block in blocks:
+            tokens = count_tokens(format_block(len(selected) + 1, block), model) + 1
+            if used + tokens > budget:
+                if selected:
+                    dropped.extend(block.chunk_ids)
+                    continue
+                block = self._truncate(block, budget, model)
+                if block is None:
+                    dropped.extend(chunk_id for b in blocks for chunk_id in b.chunk_ids)
+                    break
+                truncated = True
+                tokens = count_tokens(format_block(1, block), model) + 1
+            selected.append(block)
+            used += tokens
+
+        text = "\n".join(format_block(i, block) for i, block in enumerate(selected, 1))
+        return PackedContext(
+            text=text or EMPTY_CONTEXT,
+            sources=[chunk_id for block in selected for chunk_id in block.chunk_ids],
+            dropped_chunks=dropped,
+            token_budget=budget,
+            raw_tokens=raw_tokens,
+            tokens=count_tokens(text, model),
+            duplicates_removed=len(documents) - len(kept),
+            chunks_merged=len(kept) - len(blocks),
+            truncated=truncated,
+        )
+
+    def _remove_duplicates(self, ranked: List[RetrievedChunk]) -> List[RetrievedChunk]:
+        kept: List[RetrievedChunk] = []
+        seen = set()
+        signatures = []
+        for doc in ranked:
+            chunk = doc.chunk
+            keys = {chunk.chunk_id, chunk.content_hash} - {""}
+            if keys & seen:
+                continue
+            signature = self.minhasher.signature(tokenize(chunk.content))
+            if any(
+                MinHasher.similarity(signature, other) >= self.duplicate_threshold
+                for other in signatures
+            ):
+                continue
+            seen |= keys
+            kept.append(doc)
+            signatures.append(signature)
+        return kept
+
+    def _merge_adjacent(self, kept: List[RetrievedChunk]) -> List[ContextBlock]:
+        """문서별 위치 순으로 이어 붙인 뒤 블록 최고 점수 순으로 정렬"""
+        blocks: List[ContextBlock] = []
+        ordered = sorted(kept, key=lambda doc: (doc.chunk.doc_id, doc.chunk.position))
+        for doc in ordered:
+            chunk = doc.chunk
+            last = blocks[-1] if blocks else None
+            if (
+                last is not None
+                and last.doc_id == chunk.doc_id
+                and chunk.position == last.last_position + 1
+            ):
+                last.content = self._join(last.content, chunk.content)
+                last.chunk_ids.append(chunk.chunk_id)
+                if chunk.section and chunk.section not in last.sections:
+                    last.sections.append(chunk.section)
+                last.score = max(last.score, doc.score)
+                last.last_position = chunk.position
+            else:
+                blocks.append(self._block(doc))
+        return sorted(blocks, key=lambda block: block.score, reverse=True)
+
+    def _join(self, head: str, tail: str) -> str:
+        """head 끝과 tail 앞이 겹치면 겹친 부분을 한 번만 포함"""
+        for size in range(min(len(head), len(tail)), self.min_overlap_chars - 1, -1):
+            if head.endswith(tail[:size]):
+                return head + tail[size:]
+        return f"{head}\n\n{tail}"
+
+    @staticmethod
+    def _block(doc: RetrievedChunk) -> ContextBlock:
+        chunk = doc.chunk
+        return ContextBlock(
+            doc_id=chunk.doc_id,
+            title=chunk.title,
+            sections=[chunk.section] if chunk.section else [],
+            chunk_ids=[chunk.chunk_id],
+            content=chunk.content,
+            score=doc.score,
+            last_position=chunk.position,
+        )
+
+    @staticmethod
+    def _truncate(block: ContextBlock, budget: int, model: Optional[str]) -> Optional[ContextBlock]:
+        """본문 외 머리말을 뺀 나머지 예산만큼 본문을 자름 (남는 예산이 없으면 None)"""
+        overhead = count_tokens(format_block(1, block.model_copy(update={"content": ""})), model) + 1
+        content = truncate_to_tokens(block.content, budget - overhead, model)
+        if not content:
+            return None
+        return block.model_copy(update={"content": content})
+
+
+def format_block(index: int, block: ContextBlock) -> str:
+    """시스템 프롬프트용 문서 블록 텍스트"""
+    return (
+        f"## 문서 {index}: {block.title}\n"
+        f"**섹션**: {' / '.join(block.sections) or '-'}\n"
+        f"**출처**: {block.doc_id}\n"
+        f"**내용**: {block.content}\n"
+        f"**관련도**: {block.score:.2f}\n"
+    )
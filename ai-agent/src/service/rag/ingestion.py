@@ -0,0 +1,370 @@
+"""
+Incremental, content-hash driven ingestion for the RAG corpus
+"""
+import asyncio
+import hashlib
+import json
+import os
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from pydantic import BaseModel, Field
+
+from domain.models.document import DocumentChunk
+from infrastructure.retrieval.embeddings import Embedder
+from infrastructure.retrieval.hnsw_index import ANN_INDEX_KINDS, HNSWGraph
+from infrastructure.retrieval.quantization import ProductQuantizer, train_quantizer
+from infrastructure.retrieval.vector_index import VectorIndex
+from service.rag.chunker import MarkdownChunker, iter_document_paths
+from utils.logger import logger
+
+
+INGEST_STATE_FILE = "ingest_state.json"
+
+
+def embedding_text(chunk: DocumentChunk) -> str:
+    """임베딩/색인 입력 (제목/섹션을 함께 넣어 짧은 청크의 문맥 보강)"""
+    return f"{chunk.title}\n{chunk.section}\n{chunk.content}"
+
+
+def content_hash(text: str) -> str:
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def load_state(path: str) -> Optional[Dict[str, Any]]:
+    """인덱스 디렉터리의 파일별 수집 상태 (없으면 None)"""
+    state_path = os.path.join(path, INGEST_STATE_FILE)
+    if not os.path.exists(state_path):
+        return None
+    with open(state_path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def write_state(directory: str, state: Dict[str, Any]):
+    with open(os.path.join(directory, INGEST_STATE_FILE), "w", encoding="utf-8") as f:
+        json.dump(state, f, ensure_ascii=False)
+
+
+class IngestionStats(BaseModel):
+    """수집 1회의 변경량과 단계별 소요 시간"""
+    files_scanned: int = 0
+    files_changed: int = 0
+    files_deleted: int = 0
+    chunks_total: int = 0           # 변경된 파일에서 새로 나온 청크
+    chunks_embedded: int = 0
+    chunks_reused: int = 0          # 해시가 같아 기존 벡터 재사용
+    chunks_tombstoned: int = 0
+    compacted: bool = False
+    stage_seconds: Dict[str, float] = Field(default_factory=dict)
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.files_changed or self.files_deleted)
+
+    def throughput(self) -> Dict[str, float]:
+        """단계별 처리량 (files/s, chunks/s, embeddings/s)"""
+        def rate(count: int, stage: str) -> float:
+            seconds = self.stage_seconds.get(stage, 0.0)
+            return count / seconds if seconds > 0 else 0.0
+
+        return {
+            "files_per_s": rate(self.files_scanned, "scan"),
+            "chunks_per_s": rate(self.chunks_total, "chunk"),
+            "embeddings_per_s": rate(self.chunks_embedded, "embed"),
+        }
+
+
+class IngestionResult:
+    """수집 결과: 새 인덱스(변경 없으면 이전 인덱스), 파일 상태, 통계"""
+
+    def __init__(
+        self, index: Optional[VectorIndex], state: Dict[str, Any], stats: IngestionStats
+    ):
+        self.index = index
+        self.state = state
+        self.stats = stats
+
+
+class IngestionPipeline:
+    """
+    증분 수집 파이프라인
+
+    scan -> chunk -> embed -> assemble
+    - scan: 크기/mtime이 같으면 건너뛰고, 다르면 파일 해시로 실제 변경 여부 확인
+    - chunk: 변경된 파일만 청크 분할 후 청크별 content_hash 계산
+    - embed: 이전 인덱스에 같은 해시가 없는 청크만 임베딩 (있으면 벡터 복사)
+    - assemble: 변경/삭제된 파일의 기존 행은 tombstone, 새 청크는 뒤에 추가
+      tombstone 비율이 compact_ratio를 넘으면 살아 있는 행만 남겨 재배치
+    - quantization이 설정되면 기존 코드북/스케일로 새 행만 인코딩
+      (처음이거나 설정이 바뀌었으면 전체 벡터로 학습)
+    - ann_index가 hnsw(또는 auto이면서 hnsw_min_chunks 이상)이면 기존 그래프에
+      새 행만 삽입 (compact했거나 처음이면 살아 있는 행으로 새로 생성)
+    """
+
+    def __init__(
+        self,
+        embedder: Embedder,
+        chunker: Optional[MarkdownChunker] = None,
+        embed_batch_size: int = 64,
+        compact_ratio: float = 0.3,
+        quantization: str = "none",
+        pq_subspaces: int = 48,
+        ann_index: str = "auto",
+        hnsw_m: int = 16,
+        hnsw_ef_construction: int = 100,
+        hnsw_min_chunks: int = 50000,
+    ):
+        self.embedder = embedder
+        self.chunker = chunker or MarkdownChunker()
+        self.embed_batch_size = embed_batch_size
+        self.compact_ratio = compact_ratio
+        self.quantization = quantization
+        self.pq_subspaces = pq_subspaces
+        if ann_index not in ANN_INDEX_KINDS:
+            raise ValueError(f"Unknown ann index: {ann_index} (expected one of {ANN_INDEX_KINDS})")
+        self.ann_index = ann_index
+        self.hnsw_m = hnsw_m
+        self.hnsw_ef_construction = hnsw_ef_construction
+        self.hnsw_min_chunks = hnsw_min_chunks
+
+    async def run(
+        self,
+        source_paths: Sequence[str],
+        previous: Optional[VectorIndex] = None,
+        state: Optional[Dict[str, Any]] = None,
+    ) -> IngestionResult:
+        if previous is None or state is None:
+            # 상태 파일이 없는 이전 인덱스는 행-파일 대응을 알 수 없으므로 전체 재수집
+            previous, state = None, {"files": {}}
+
+        stats = IngestionStats()
+        start = time.monotonic()
+        files, changed, deleted = await asyncio.to_thread(
+            self._scan, source_paths, state["files"], stats
+        )
+        stats.stage_seconds["scan"] = time.monotonic() - start
+
+        if previous is not None and not changed and not deleted and self._layout_matches(previous):
+            return IngestionResult(previous, {"files": files}, stats)
+
+        start = time.monotonic()
+        new_chunks = await asyncio.to_thread(self._chunk, changed)
+        stats.chunks_total = len(new_chunks)
+        stats.stage_seconds["chunk"] = time.monotonic() - start
+
+        # 변경 전 살아 있는 행의 해시 -> 행 번호 (변경된 파일의 그대로인 청크도 재사용)
+        reusable: Dict[str, int] = {}
+        if previous is not None:
+            for row, chunk in enumerate(previous.chunks):
+                if chunk.content_hash and not previous.tombstones[row]:
+                    reusable.setdefault(chunk.content_hash, row)
+
+        start = time.monotonic()
+        embedded = await self._embed_missing(new_chunks, reusable, stats)
+        stats.stage_seconds["embed"] = time.monotonic() - start
+
+        # 전체 벡터 복사 / 양자화 학습 / HNSW 구성은 CPU 작업이므로 이벤트 루프 밖에서 실행
+        start = time.monotonic()
+        index = await asyncio.to_thread(
+            self._assemble, previous, state["files"], files, changed, deleted,
+            new_chunks, reusable, embedded, stats,
+        )
+        stats.stage_seconds["assemble"] = time.monotonic() - start
+
+        return IngestionResult(index, {"files": files}, stats)
+
+    def _scan(
+        self,
+        source_paths: Sequence[str],
+        previous_files: Dict[str, Dict[str, Any]],
+        stats: IngestionStats,
+    ) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, str], List[str]]:
+        """(새 파일 상태, 변경된 파일 본문, 삭제된 파일)"""
+        files: Dict[str, Dict[str, Any]] = {}
+        changed: Dict[str, str] = {}
+
+        for path in iter_document_paths(source_paths):
+            doc_id = os.path.normpath(path)
+            if doc_id in files:
+                continue
+            stats.files_scanned += 1
+            stat = os.stat(path)
+            prev = previous_files.get(doc_id)
+            if prev and prev["size"] == stat.st_size and prev["mtime_ns"] == stat.st_mtime_ns:
+                # 복사본 사용 (compact 시 행 번호를 고쳐 쓰므로 사용 중인 이전 상태를 건드리지 않음)
+                files[doc_id] = {**prev, "rows": list(prev["rows"])}
+                continue
+
+            with open(path, "rb") as f:
+                data = f.read()
+            entry = {
+                "size": stat.st_size,
+                "mtime_ns": stat.st_mtime_ns,
+                "sha": hashlib.blake2b(data, digest_size=16).hexdigest(),
+                "rows": list(prev["rows"]) if prev else [],
+            }
+            files[doc_id] = entry
+            if prev and prev["sha"] == entry["sha"]:
+                continue  # touch만 된 파일
+
+            entry["rows"] = []
+            changed[doc_id] = data.decode("utf-8", errors="replace")
+
+        deleted = [doc_id for doc_id in previous_files if doc_id not in files]
+        stats.files_changed = len(changed)
+        stats.files_deleted = len(deleted)
+        return files, changed, deleted
+
+    def _chunk(self, changed: Dict[str, str]) -> List[DocumentChunk]:
+        chunks = []
+        for doc_id, text in changed.items():
+            for chunk in self.chunker.chunk_text(text, doc_id):
+                chunk.content_hash = content_hash(embedding_text(chunk))
+                chunks.append(chunk)
+        return chunks
+
+    async def _embed_missing(
+        self,
+        chunks: List[DocumentChunk],
+        reusable: Dict[str, int],
+        stats: IngestionStats,
+    ) -> Dict[str, np.ndarray]:
+        """재사용할 수 없는 해시만 배치 임베딩 (같은 해시는 한 번만)"""
+        missing: Dict[str, str] = {}
+        for chunk in chunks:
+            if chunk.content_hash in reusable:
+                stats.chunks_reused += 1
+            elif chunk.content_hash not in missing:
+                missing[chunk.content_hash] = embedding_text(chunk)
+
+        hashes = list(missing)
+        embedded: Dict[str, np.ndarray] = {}
+        for i in range(0, len(hashes), self.embed_batch_size):
+            batch = hashes[i:i + self.embed_batch_size]
+            vectors = await self.embedder.embed([missing[h] for h in batch])
+            embedded.update(zip(batch, vectors))
+            if len(hashes) > self.embed_batch_size:
+                logger.info(f"RAG ingestion: embedded {len(embedded)}/{len(hashes)} chunks")
+
+        stats.chunks_embedded = len(hashes)
+        return embedded
+
+    def _assemble(
+        self,
+        previous: Optional[VectorIndex],
+        previous_files: Dict[str, Dict[str, Any]],
+        files: Dict[str, Dict[str, Any]],
+        changed: Dict[str, str],
+        deleted: List[str],
+        new_chunks: List[DocumentChunk],
+        reusable: Dict[str, int],
+        embedded: Dict[str, np.ndarray],
+        stats: IngestionStats,
+    ) -> VectorIndex:
+        dim = self.embedder.dim
+        if previous is not None:
+            old_vectors = np.asarray(previous.vectors)
+            chunks = list(previous.chunks)
+            tombstones = previous.tombstones.copy()
+            version = previous.version + 1
+        else:
+            old_vectors = np.zeros((0, dim), dtype=np.float32)
+            chunks, tombstones, version = [], np.zeros(0, dtype=bool), 1
+
+        for doc_id in list(changed) + deleted:
+            rows = previous_files.get(doc_id, {}).get("rows", [])
+            stats.chunks_tombstoned += int((~tombstones[rows]).sum()) if rows else 0
+            tombstones[rows] = True
+
+        new_vectors = np.empty((len(new_chunks), dim), dtype=np.float32)
+        base = len(chunks)
+        for i, chunk in enumerate(new_chunks):
+            row = reusable.get(chunk.content_hash)
+            new_vectors[i] = old_vectors[row] if row is not None else embedded[chunk.content_hash]
+            files[chunk.doc_id]["rows"].append(base + i)
+
+        vectors = np.vstack([old_vectors, new_vectors])
+        chunks.extend(new_chunks)
+        tombstones = np.concatenate([tombstones, np.zeros(len(new_chunks), dtype=bool)])
+
+        quantizer = None
+        if previous is not None and previous.quantizer is not None:
+            if self._quantizer_matches(previous):
+                quantizer = previous.quantizer.append(new_vectors)
+
+        if len(tombstones) and tombstones.mean() > self.compact_ratio:
+            live = ~tombstones
+            vectors, chunks, tombstones = self._compact(vectors, chunks, tombstones, files)
+            quantizer = quantizer.select(live) if quantizer is not None else None
+            stats.compacted = True
+
+        if quantizer is None and self.quantization != "none":
+            quantizer = train_quantizer(self.quantization, vectors, self.pq_subspaces)
+
+        start = time.monotonic()
+        graph = None
+        if self._wants_graph(len(tombstones) - int(tombstones.sum())):
+            extend = (
+                previous is not None
+                and previous.graph is not None
+                and not stats.compacted
+                and self._graph_matches(previous)
+            )
+            if extend:
+                graph = previous.graph.copy()
+                for row in range(base, len(vectors)):
+                    graph.insert(vectors, row)
+            else:
+                graph = HNSWGraph.build(
+                    vectors, self.hnsw_m, self.hnsw_ef_construction,
+                    rows=np.flatnonzero(~tombstones),
+                )
+            stats.stage_seconds["graph"] = time.monotonic() - start
+
+        return VectorIndex(
+            vectors, chunks, self.embedder.name, tombstones, version, quantizer, graph=graph
+        )
+
+    def _layout_matches(self, index: VectorIndex) -> bool:
+        """저장된 인덱스의 양자화/그래프 구성이 현재 설정과 같은지"""
+        if not self._quantizer_matches(index):
+            return False
+        if (index.graph is not None) != self._wants_graph(index.live_count):
+            return False
+        return index.graph is None or self._graph_matches(index)
+
+    def _quantizer_matches(self, index: VectorIndex) -> bool:
+        if index.quantization != self.quantization:
+            return False
+        if isinstance(index.quantizer, ProductQuantizer):
+            return index.quantizer.subspaces == self.pq_subspaces
+        return True
+
+    def _graph_matches(self, index: VectorIndex) -> bool:
+        return (
+            index.graph.m == self.hnsw_m
+            and index.graph.ef_construction == self.hnsw_ef_construction
+        )
+
+    def _wants_graph(self, live_count: int) -> bool:
+        """코퍼스별 검색 방식: hnsw / flat(전수 탐색) / auto(크기 기준)"""
+        if self.ann_index == "auto":
+            return live_count >= self.hnsw_min_chunks
+        return self.ann_index == "hnsw"
+
+    @staticmethod
+    def _compact(
+        vectors: np.ndarray,
+        chunks: List[DocumentChunk],
+        tombstones: np.ndarray,
+        files: Dict[str, Dict[str, Any]],
+    ) -> Tuple[np.ndarray, List[DocumentChunk], np.ndarray]:
+        """tombstone 행 제거 후 파일 상태의 행 번호 재매핑"""
+        live = ~tombstones
+        new_rows = np.cumsum(live) - 1
+        for entry in files.values():
+            entry["rows"] = [int(new_rows[row]) for row in entry["rows"]]
+
+        chunks = [chunk for chunk, keep in zip(chunks, live) if keep]
+        return vectors[live], chunks, np.zeros(len(chunks), dtype=bool)
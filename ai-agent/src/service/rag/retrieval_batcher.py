@@ -0,0 +1,140 @@
+"""
+Micro-batching of concurrent retrieval queries
+"""
+import asyncio
+import json
+import time
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from domain.models.document import RetrievedChunk
+from service.rag.retriever import DocumentRetriever
+from utils.logger import logger
+
+
+Pending = Tuple[str, int, Optional[Dict[str, Any]], asyncio.Future]
+
+
+class RetrievalBatcher:
+    """
+    동시 검색 요청 묶음 처리
+
+    - 요청을 큐에 넣고, 워커가 max_wait_ms 동안 또는 max_batch_size까지 모음
+    - 같은 필터끼리 묶어 DocumentRetriever.retrieve_batch 한 번으로 처리
+      (질의 임베딩 한 번 + dense 행렬 곱 한 번, k는 묶음 내 최댓값으로 검색 후 잘라 반환)
+    - 여러 에이전트 / uvicorn 워커의 요청을 받는 retrieval 서버에서 사용
+    """
+
+    def __init__(
+        self,
+        retriever: DocumentRetriever,
+        max_batch_size: int = 32,
+        max_wait_ms: float = 2.0,
+    ):
+        self.retriever = retriever
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._flushes: Set[asyncio.Task] = set()
+
+        self.requests = 0
+        self.batches = 0
+
+    async def retrieve(
+        self, query: str, k: int = 5, filters: Optional[Dict[str, Any]] = None
+    ) -> List[RetrievedChunk]:
+        self._ensure_worker()
+        self.requests += 1
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((query, k, filters, future))
+        return await future
+
+    def _ensure_worker(self):
+        loop = asyncio.get_running_loop()
+        if self._worker is None or self._worker.get_loop() is not loop:
+            self._queue = asyncio.Queue()
+        elif not self._worker.done():
+            return
+        self._worker = loop.create_task(self._run())
+
+    async def _run(self):
+        batch: List[Pending] = []
+        try:
+            while True:
+                batch = [await self._queue.get()]
+                deadline = time.monotonic() + self.max_wait
+                while len(batch) < self.max_batch_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                    except asyncio.TimeoutError:
+                        break
+
+                groups: Dict[str, List[Pending]] = defaultdict(list)
+                for item in batch:
+                    groups[json.dumps(item[2] or {}, sort_keys=True, default=str)].append(item)
+                for group in groups.values():
+                    task = asyncio.create_task(self._flush(group))
+                    self._flushes.add(task)
+                    task.add_done_callback(self._flushes.discard)
+                batch = []
+        finally:
+            # 모으던 중 종료되면 아직 묶음으로 넘기지 않은 요청 취소
+            self._cancel(batch)
+
+    async def _flush(self, group: List[Pending]):
+        self.batches += 1
+        k = max(item[1] for item in group)
+        try:
+            try:
+                results = await self.retriever.retrieve_batch(
+                    [item[0] for item in group], k, group[0][2]
+                )
+            except Exception as e:
+                logger.error(f"Retrieval batch failed ({len(group)} queries): {e}")
+                for *_, future in group:
+                    if not future.done():
+                        future.set_exception(e)
+                return
+
+            for (_, item_k, _, future), hits in zip(group, results):
+                if not future.done():
+                    future.set_result(hits[:item_k])
+        finally:
+            # 검색 중 취소되면 결과를 받지 못한 요청 취소 (완료된 future는 영향 없음)
+            self._cancel(group)
+
+    @staticmethod
+    def _cancel(items: List[Pending]):
+        for *_, future in items:
+            future.cancel()
+
+    async def close(self):
+        """워커 종료 (큐 / 묶음 / 검색 중인 대기 요청은 모두 취소)"""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+        flushes = list(self._flushes)
+        for task in flushes:
+            task.cancel()
+        await asyncio.gather(*flushes, return_exceptions=True)
+        if self._queue is not None:
+            while not self._queue.empty():
+                self._cancel([self._queue.get_nowait()])
+        self._queue = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """평균 배치 크기"""
+        return {
+            "requests": self.requests,
+            "batches": self.batches,
+            "avg_batch_size": self.requests / self.batches if self.batches else 0.0,
+        }
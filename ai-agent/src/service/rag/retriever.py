@@ -0,0 +1,426 @@
+"""
+Hybrid (dense + BM25) retriever over in-process indexes
+"""
+import asyncio
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from domain.models.document import RetrievedChunk
+from infrastructure.retrieval.embedding_service import EmbeddingService
+from infrastructure.llm.single_flight import SingleFlight
+from infrastructure.retrieval.embeddings import Embedder
+from infrastructure.retrieval.index_store import IndexLock, atomic_write_dir, resolve_index_dir
+from infrastructure.retrieval.metadata_index import MetadataIndex
+from infrastructure.retrieval.result_cache import RetrievalCache
+from infrastructure.retrieval.sparse_index import SparseIndex
+from infrastructure.retrieval.vector_index import VectorIndex
+from service.rag.chunker import MarkdownChunker
+from service.rag.ingestion import (
+    IngestionPipeline,
+    IngestionStats,
+    embedding_text,
+    load_state,
+    write_state,
+)
+from utils.logger import logger
+from utils.text_tokenizer import tokenize
+
+
+RETRIEVAL_MODES = ("dense", "sparse", "hybrid")
+
+
+def reciprocal_rank_fusion(
+    rankings: Sequence[List[Tuple[int, float]]],
+    weights: Sequence[float],
+    k: int = 60,
+) -> List[Tuple[int, float]]:
+    """
+    RRF: 각 순위 목록에서 weight / (k + rank) 를 합산
+
+    점수 척도가 다른 검색기(코사인 vs BM25)를 정규화 없이 합칠 수 있음
+    """
+    fused: Dict[int, float] = {}
+    for ranking, weight in zip(rankings, weights):
+        if weight <= 0:
+            continue
+        for rank, (row, _) in enumerate(ranking, start=1):
+            fused[row] = fused.get(row, 0.0) + weight / (k + rank)
+    return sorted(fused.items(), key=lambda item: item[1], reverse=True)
+
+
+class DocumentRetriever:
+    """
+    문서 검색기
+
+    - 시작 시 저장된 인덱스를 mmap으로 로드하고 IngestionPipeline으로
+      source_paths의 변경분만 반영 (임베딩 설정이 바뀌었으면 전체 재생성)
+    - dense 검색은 코퍼스 크기/설정에 따라 전수 탐색 또는 HNSW 그래프
+    - mode
+      - dense: 질의 임베딩 후 VectorIndex 코사인 유사도 top-k
+      - sparse: SparseIndex BM25 top-k (한글 bigram + 코드 식별자 토큰)
+      - hybrid: 두 검색기에서 k * candidate_multiplier 후보를 뽑아 RRF로 병합
+    - filters(메타데이터 사전 필터)는 posting list 비트맵으로 만들어 dense/sparse 검색 안에서 적용
+    - result_cache가 있으면 같은 인덱스 버전의 반복 질의는 임베딩/검색 생략
+    """
+
+    def __init__(
+        self,
+        embedder: Embedder,
+        index_dir: str,
+        source_paths: Sequence[str],
+        chunker: Optional[MarkdownChunker] = None,
+        embed_batch_size: int = 64,
+        mode: str = "hybrid",
+        dense_weight: float = 1.0,
+        sparse_weight: float = 1.0,
+        rrf_k: int = 60,
+        candidate_multiplier: int = 4,
+        compact_ratio: float = 0.3,
+        quantization: str = "none",
+        pq_subspaces: int = 48,
+        rerank_multiplier: int = 10,
+        ann_index: str = "auto",
+        hnsw_m: int = 16,
+        hnsw_ef_construction: int = 100,
+        hnsw_ef_search: int = 64,
+        hnsw_min_chunks: int = 50000,
+        result_cache: Optional[RetrievalCache] = None,
+    ):
+        if mode not in RETRIEVAL_MODES:
+            raise ValueError(f"Unknown retrieval mode: {mode} (expected one of {RETRIEVAL_MODES})")
+
+        self.embedder = embedder
+        self.index_dir = index_dir
+        self.source_paths = list(source_paths)
+        self.pipeline = IngestionPipeline(
+            embedder,
+            chunker,
+            embed_batch_size,
+            compact_ratio,
+            quantization,
+            pq_subspaces,
+            ann_index,
+            hnsw_m,
+            hnsw_ef_construction,
+            hnsw_min_chunks,
+        )
+        self.rerank_multiplier = rerank_multiplier
+        self.hnsw_ef_search = hnsw_ef_search
+        self.mode = mode
+        self.dense_weight = dense_weight
+        self.sparse_weight = sparse_weight
+        self.rrf_k = rrf_k
+        self.candidate_multiplier = candidate_multiplier
+        self.result_cache = result_cache
+        self.single_flight = SingleFlight()
+
+        self.index: Optional[VectorIndex] = None
+        self.sparse_index: Optional[SparseIndex] = None
+        self.metadata_index: Optional[MetadataIndex] = None
+        self._ingest_state: Optional[Dict[str, Any]] = None
+        self._index_path: Optional[str] = None  # 현재 로드한 버전 디렉터리
+        self._lock = asyncio.Lock()
+        self._index_lock = IndexLock(index_dir)
+        self.last_ingestion: Optional[IngestionStats] = None
+
+        self.queries = 0
+        self.total_latency_ms = 0.0
+
+    async def initialize(self, rebuild: bool = False):
+        """인덱스 로드 후 소스 변경분 반영 (여러 번 호출해도 한 번만 수행)"""
+        async with self._lock:
+            if self.index is not None and not rebuild:
+                return
+
+            # 다른 워커가 수집/저장 중이면 끝날 때까지 기다린 뒤 그 결과를 로드
+            await asyncio.to_thread(self._index_lock.acquire)
+            try:
+                if not rebuild:
+                    await self._load_current()
+                await self._ingest(
+                    self.index if not rebuild else None,
+                    self._ingest_state if not rebuild else None,
+                )
+            finally:
+                self._index_lock.release()
+
+    async def refresh(self) -> IngestionStats:
+        """소스 문서의 변경분만 다시 수집 (변경이 없으면 인덱스 유지)"""
+        async with self._lock:
+            await asyncio.to_thread(self._index_lock.acquire)
+            try:
+                # 다른 워커가 더 새 버전을 저장했으면 그 버전을 기준으로 수집
+                if await asyncio.to_thread(resolve_index_dir, self.index_dir) != self._index_path:
+                    await self._load_current()
+                return await self._ingest(self.index, self._ingest_state)
+            finally:
+                self._index_lock.release()
+
+    async def _load_current(self):
+        """현재 버전 디렉터리 하나에서 dense/sparse 인덱스와 수집 상태를 함께 로드"""
+        directory, index, sparse_index, state = await asyncio.to_thread(self._load_version)
+        if index is not None and index.embedder_name != self.embedder.name:
+            logger.info(
+                f"Embedder changed ({index.embedder_name} -> {self.embedder.name}), rebuilding index"
+            )
+            index = None
+        if index is None:
+            return
+
+        if sparse_index is None:
+            # 이전 버전 인덱스 디렉터리: 저장된 청크로 BM25 색인만 생성
+            sparse_index = await asyncio.to_thread(self._build_sparse, index)
+        metadata_index = await asyncio.to_thread(
+            MetadataIndex.build, index.chunks, index.tombstones
+        )
+        self.index, self.sparse_index = index, sparse_index
+        self.metadata_index = metadata_index
+        self._ingest_state, self._index_path = state, directory
+
+    def _load_version(
+        self, directory: Optional[str] = None
+    ) -> Tuple[Optional[str], Optional[VectorIndex], Optional[SparseIndex], Optional[Dict[str, Any]]]:
+        directory = directory or resolve_index_dir(self.index_dir)
+        if directory is None:
+            return None, None, None, None
+        index = VectorIndex.load(directory)
+        if index is None:
+            return directory, None, None, None
+        return directory, self._configure(index), SparseIndex.load(directory), load_state(directory)
+
+    async def _ingest(
+        self, previous: Optional[VectorIndex], state: Optional[Dict[str, Any]]
+    ) -> IngestionStats:
+        result = await self.pipeline.run(self.source_paths, previous, state)
+        stats = result.stats
+        self.last_ingestion = stats
+
+        if result.index is previous:
+            self._ingest_state = result.state
+            return stats
+
+        start = time.monotonic()
+        sparse_index = await asyncio.to_thread(self._build_sparse, result.index)
+        directory = await asyncio.to_thread(self._save, result.index, sparse_index, result.state)
+        # 방금 쓴 버전 디렉터리를 mmap으로 다시 열어 다른 워커와 같은 페이지를 공유
+        _, index, loaded_sparse, _ = await asyncio.to_thread(self._load_version, directory)
+        index = index or self._configure(result.index)
+        sparse_index = loaded_sparse or sparse_index
+        metadata_index = await asyncio.to_thread(MetadataIndex.build, index.chunks, index.tombstones)
+        stats.stage_seconds["write"] = time.monotonic() - start
+
+        # 새 버전이 완전히 준비된 뒤 한 번에 교체 (진행 중인 질의는 이전 버전을 계속 사용)
+        self.index, self.sparse_index, self._ingest_state = index, sparse_index, result.state
+        self.metadata_index, self._index_path = metadata_index, directory
+        if self.result_cache is not None:
+            # 전체 재생성은 버전 번호가 1부터 다시 시작하므로 전부 제거
+            self.result_cache.invalidate(index.version if previous is not None else None)
+
+        throughput = stats.throughput()
+        logger.info(
+            f"RAG index v{index.version}: {index.live_count} live chunks "
+            f"({stats.files_changed} changed / {stats.files_deleted} deleted files, "
+            f"{stats.chunks_embedded} embedded, {stats.chunks_reused} reused, "
+            f"{stats.chunks_tombstoned} tombstoned{', compacted' if stats.compacted else ''}) - "
+            f"{throughput['files_per_s']:.0f} files/s, {throughput['chunks_per_s']:.0f} chunks/s, "
+            f"{throughput['embeddings_per_s']:.0f} embeddings/s"
+        )
+        return stats
+
+    def _configure(self, index: VectorIndex) -> VectorIndex:
+        """저장되지 않는 질의 시점 파라미터 적용"""
+        index.rerank_multiplier = self.rerank_multiplier
+        index.ef_search = self.hnsw_ef_search
+        return index
+
+    def _save(self, index: VectorIndex, sparse_index: SparseIndex, state: Dict[str, Any]) -> str:
+        """dense/sparse 인덱스와 수집 상태를 새 버전 디렉터리 하나에 쓰고 현재 버전으로 교체"""
+        def write(directory: str):
+            index.write_files(directory)
+            sparse_index.write_files(directory)
+            write_state(directory, state)
+
+        return atomic_write_dir(self.index_dir, write)
+
+    @staticmethod
+    def _build_sparse(index: VectorIndex) -> SparseIndex:
+        return SparseIndex.build([
+            [] if removed else tokenize(embedding_text(chunk))
+            for chunk, removed in zip(index.chunks, index.tombstones)
+        ])
+
+    async def retrieve(
+        self, query: str, k: int = 5, filters: Optional[Dict[str, Any]] = None
+    ) -> List[RetrievedChunk]:
+        """
+        질의와 가장 유사한 청크 k개
+
+        Args:
+            filters: 메타데이터 사전 필터 (예: {"path": "server/*", "language": "java"})
+                     조건을 만족하는 행만 점수를 계산하므로 결과 수가 줄지 않음
+        """
+        if self.index is None:
+            await self.initialize()
+
+        # 질의 도중 인덱스가 교체되어도 같은 버전으로 끝나도록 참조 고정
+        index, sparse_index, metadata_index = self.index, self.sparse_index, self.metadata_index
+        start = time.monotonic()
+        allowed = metadata_index.mask(filters) if metadata_index is not None else None
+        if allowed is not None and not allowed.any():
+            hits = []
+        elif self.result_cache is None:
+            hits = await self._search(index, sparse_index, query, k, allowed)
+        else:
+            hits = await self._cached_search(index, sparse_index, query, k, filters, allowed)
+
+        self.queries += 1
+        self.total_latency_ms += (time.monotonic() - start) * 1000
+
+        return [
+            RetrievedChunk(chunk=index.chunks[row], score=score)
+            for row, score in hits
+        ]
+
+    async def retrieve_batch(
+        self, queries: List[str], k: int = 5, filters: Optional[Dict[str, Any]] = None
+    ) -> List[List[RetrievedChunk]]:
+        """
+        같은 필터의 질의 여러 개를 한 번에 검색
+
+        캐시 적중분을 뺀 나머지 질의만 임베딩 한 번 + dense 행렬 곱 한 번으로 처리
+        (retrieval 서버가 동시 요청을 모아 호출)
+        """
+        if self.index is None:
+            await self.initialize()
+
+        index, sparse_index, metadata_index = self.index, self.sparse_index, self.metadata_index
+        start = time.monotonic()
+        allowed = metadata_index.mask(filters) if metadata_index is not None else None
+        results: List[Optional[List[Tuple[int, float]]]] = [None] * len(queries)
+        if allowed is not None and not allowed.any():
+            results = [[] for _ in queries]
+
+        keys: List[str] = []
+        if self.result_cache is not None:
+            keys = [RetrievalCache.make_key(query, k, index.version, filters) for query in queries]
+            for i, key in enumerate(keys):
+                if results[i] is None:
+                    results[i] = self.result_cache.get(key)
+
+        missing = [i for i, hits in enumerate(results) if hits is None]
+        if missing:
+            found = await self._search_batch(
+                index, sparse_index, [queries[i] for i in missing], k, allowed
+            )
+            for i, hits in zip(missing, found):
+                results[i] = hits
+                if self.result_cache is not None and index is self.index:
+                    self.result_cache.set(keys[i], index.version, hits)
+
+        self.queries += len(queries)
+        self.total_latency_ms += (time.monotonic() - start) * 1000 * len(queries)
+
+        return [
+            [RetrievedChunk(chunk=index.chunks[row], score=score) for row, score in hits]
+            for hits in results
+        ]
+
+    async def _cached_search(
+        self,
+        index: VectorIndex,
+        sparse_index: Optional[SparseIndex],
+        query: str,
+        k: int,
+        filters: Optional[Dict[str, Any]],
+        allowed: Optional[np.ndarray],
+    ) -> List[Tuple[int, float]]:
+        """같은 버전 인덱스의 캐시 결과 사용, 동시에 들어온 같은 질의는 한 번만 검색"""
+        key = RetrievalCache.make_key(query, k, index.version, filters)
+        hits = self.result_cache.get(key)
+        if hits is not None:
+            return hits
+
+        async def search() -> List[Tuple[int, float]]:
+            results = await self._search(index, sparse_index, query, k, allowed)
+            # 검색 중 새 버전으로 교체되었으면 이전 버전 결과는 저장하지 않음
+            if index is self.index:
+                self.result_cache.set(key, index.version, results)
+            return results
+
+        return await self.single_flight.do(key, search)
+
+    async def _search(
+        self,
+        index: VectorIndex,
+        sparse_index: Optional[SparseIndex],
+        query: str,
+        k: int,
+        allowed: Optional[np.ndarray] = None,
+    ) -> List[Tuple[int, float]]:
+        return (await self._search_batch(index, sparse_index, [query], k, allowed))[0]
+
+    async def _search_batch(
+        self,
+        index: VectorIndex,
+        sparse_index: Optional[SparseIndex],
+        queries: List[str],
+        k: int,
+        allowed: Optional[np.ndarray] = None,
+    ) -> List[List[Tuple[int, float]]]:
+        """질의 여러 개를 임베딩 한 번 + dense 행렬 곱 한 번으로 검색"""
+        num_candidates = k * self.candidate_multiplier if self.mode == "hybrid" else k
+
+        dense_hits: List[List[Tuple[int, float]]] = [[] for _ in queries]
+        sparse_hits: List[List[Tuple[int, float]]] = [[] for _ in queries]
+        if self.mode in ("dense", "hybrid"):
+            query_vectors = await self.embedder.embed(queries)
+            rows = np.flatnonzero(allowed) if allowed is not None else None
+            # 행렬 곱은 GIL을 놓으므로 스레드에서 실행해 이벤트 루프를 막지 않음
+            dense_hits = await asyncio.to_thread(
+                index.search_batch, query_vectors, num_candidates, rows
+            )
+        if self.mode in ("sparse", "hybrid") and sparse_index is not None:
+            sparse_hits = await asyncio.to_thread(
+                lambda: [
+                    sparse_index.search(tokenize(query), num_candidates, allowed)
+                    for query in queries
+                ]
+            )
+
+        if self.mode == "dense":
+            return dense_hits
+        if self.mode == "sparse":
+            return sparse_hits
+        return [
+            reciprocal_rank_fusion(
+                [dense, sparse], [self.dense_weight, self.sparse_weight], self.rrf_k
+            )[:k]
+            for dense, sparse in zip(dense_hits, sparse_hits)
+        ]
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "chunks": self.index.live_count if self.index else 0,
+            "tombstoned": self.index.size - self.index.live_count if self.index else 0,
+            "index_version": self.index.version if self.index else 0,
+            "dim": self.embedder.dim,
+            "quantization": self.index.quantization if self.index else "none",
+            "ann_index": self.index.ann_index if self.index else "flat",
+            "embedder": self.embedder.name,
+            "mode": self.mode,
+            "sparse_terms": len(self.sparse_index.terms) if self.sparse_index else 0,
+            "metadata_fields": self.metadata_index.get_stats() if self.metadata_index else {},
+            "queries": self.queries,
+            "avg_latency_ms": self.total_latency_ms / self.queries if self.queries else 0.0,
+            "result_cache": (
+                {**self.result_cache.get_stats(), "coalesced": self.single_flight.coalesced}
+                if self.result_cache is not None
+                else None
+            ),
+            "last_ingestion": self.last_ingestion.model_dump() if self.last_ingestion else None,
+            "embedding": (
+                self.embedder.get_stats() if isinstance(self.embedder, EmbeddingService) else None
+            ),
+        }
@@ -0,0 +1,48 @@
+"""
+BM25 scoring for small in-memory corpora
+"""
+import math
+from collections import Counter
+from typing import Dict, List, Sequence
+
+
+class BM25:
+    """
+    Okapi BM25 점수 계산기
+
+    검색 결과 스니펫, 문장처럼 요청마다 새로 만드는 작은 문서 집합용
+    (대규모 코퍼스는 역색인 기반 구현 사용)
+    """
+
+    def __init__(self, corpus: Sequence[List[str]], k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.term_freqs = [Counter(tokens) for tokens in corpus]
+        self.doc_lengths = [len(tokens) for tokens in corpus]
+        self.avg_length = (sum(self.doc_lengths) / len(corpus)) if corpus else 0.0
+
+        doc_freqs: Counter = Counter()
+        for freqs in self.term_freqs:
+            doc_freqs.update(freqs.keys())
+        self.idf: Dict[str, float] = {
+            term: idf(len(corpus), df) for term, df in doc_freqs.items()
+        }
+
+    def scores(self, query: List[str]) -> List[float]:
+        """질의에 대한 문서별 BM25 점수"""
+        terms = [term for term in set(query) if term in self.idf]
+        results = []
+        for freqs, length in zip(self.term_freqs, self.doc_lengths):
+            norm = self.k1 * (1 - self.b + self.b * length / (self.avg_length or 1.0))
+            score = 0.0
+            for term in terms:
+                tf = freqs.get(term)
+                if tf:
+                    score += self.idf[term] * tf * (self.k1 + 1) / (tf + norm)
+            results.append(score)
+        return results
+
+
+def idf(num_docs: int, doc_freq: int) -> float:
+    """BM25 IDF (음수가 되지 않도록 +1 보정)"""
+    return math.log(1 + (num_docs - doc_freq + 0.5) / (doc_freq + 0.5))
@@ -0,0 +1,53 @@
+"""
+MinHash signatures for near-duplicate text detection
+"""
+import hashlib
+import random
+from typing import List, Sequence, Set
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+
+class MinHasher:
+    """
+    토큰 shingle 집합의 MinHash 시그니처 생성기
+
+    두 시그니처에서 값이 같은 위치의 비율이 shingle 집합 Jaccard 유사도의 추정치
+    (같은 기사를 여러 사이트가 전재한 검색 결과 등 근사 중복 판별용)
+    """
+
+    def __init__(self, num_perm: int = 64, shingle_size: int = 3, seed: int = 1):
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        rng = random.Random(seed)
+        self._params = [
+            (rng.randrange(1, _MERSENNE_PRIME), rng.randrange(0, _MERSENNE_PRIME))
+            for _ in range(num_perm)
+        ]
+
+    def shingles(self, tokens: Sequence[str]) -> Set[str]:
+        """연속 토큰 n-gram 집합 (토큰이 적으면 전체를 하나로)"""
+        n = self.shingle_size
+        if len(tokens) <= n:
+            return {" ".join(tokens)} if tokens else set()
+        return {" ".join(tokens[i:i + n]) for i in range(len(tokens) - n + 1)}
+
+    def signature(self, tokens: Sequence[str]) -> List[int]:
+        hashes = [
+            int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=4).digest(), "little")
+            for s in self.shingles(tokens)
+        ]
+        if not hashes:
+            return [_MAX_HASH] * self.num_perm
+        return [
+            min(((a * h + b) % _MERSENNE_PRIME) & _MAX_HASH for h in hashes)
+            for a, b in self._params
+        ]
+
+    @staticmethod
+    def similarity(sig_a: List[int], sig_b: List[int]) -> float:
+        """추정 Jaccard 유사도"""
+        if not sig_a:
+            return 0.0
+        return sum(1 for x, y in zip(sig_a, sig_b) if x == y) / len(sig_a)
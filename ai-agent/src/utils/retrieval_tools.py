@@ -0,0 +1,70 @@
+"""
+Internal Document Retrieval Tools (Read-Only)
+로컬 retrieval 서버를 통한 내부 문서 검색 도구 (읽기 전용)
+"""
+
+import httpx
+from langchain_core.tools import tool
+
+from config.settings import settings
+from infrastructure.retrieval.retrieval_client import RetrievalClient
+
+
+def _server_url() -> str:
+    """rag_server_url이 없으면 같은 설정으로 띄운 로컬 서버 주소"""
+    if settings.rag_server_url:
+        return settings.rag_server_url
+    if settings.rag_server_socket:
+        return f"unix://{settings.rag_server_socket}"
+    return f"http://{settings.rag_server_host}:{settings.rag_server_port}"
+
+
+@tool
+def search_internal_docs(query: str, k: int = 5, path: str = "", language: str = "") -> str:
+    """
+    내부 문서 인덱스에서 질의와 관련된 문서 조각을 검색합니다.
+    
+    Args:
+        query: 검색할 질문 또는 키워드
+        k: 반환할 결과 수 (기본값: 5)
+        path: 경로 접두사로 제한 (예: "server/*", 선택사항)
+        language: 특정 언어로 제한 (선택사항)
+        
+    Returns:
+        검색 결과
+    """
+    try:
+        filters = {}
+        if path:
+            filters["path"] = path
+        if language:
+            filters["language"] = language
+
+        client = RetrievalClient(_server_url(), settings.rag_server_timeout_seconds)
+        hits = client.retrieve_sync(query, k, filters or None)
+
+        if not hits:
+            return f"🔍 검색 결과가 없습니다: '{query}'"
+
+        result = f"## 🔍 내부 문서 검색 결과: '{query}' ({len(hits)}개)\n\n"
+        for hit in hits:
+            chunk = hit.chunk
+            result += f"### 📄 {chunk.section or chunk.title}\n"
+            result += f"**경로**: {chunk.doc_id}\n"
+            result += f"**점수**: {hit.score:.3f}\n\n"
+            result += f"{chunk.content}\n\n"
+
+        return result
+
+    except httpx.HTTPStatusError as e:
+        return f"❌ Retrieval 서버 오류: {str(e)}"
+    except httpx.HTTPError as e:
+        return f"❌ Retrieval 서버에 연결할 수 없습니다: {str(e)}"
+    except Exception as e:
+        return f"❌ 문서 검색 중 오류 발생: {str(e)}"
+
+
+# 읽기 전용 내부 문서 검색 도구 목록
+READONLY_RETRIEVAL_TOOLS = [
+    search_internal_docs
+]
@@ -0,0 +1,61 @@
+"""
+Lightweight tokenizer for Korean / English / code text
+"""
+import re
+from typing import List
+
+# 한글 연속 구간, 식별자(영문/숫자/밑줄), 숫자(버전 번호 포함)
+_TOKEN_PATTERN = re.compile(r"[가-힣]+|[A-Za-z_][A-Za-z0-9_]*|\d+(?:\.\d+)*")
+
+# camelCase / PascalCase / 약어 경계
+_CAMEL_BOUNDARY = re.compile(r"[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z]+|[A-Z]+|\d+")
+
+# 문장 경계 (마침표/물음표/느낌표 뒤 공백, 줄바꿈)
+_SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?。！？])\s+|\n+")
+
+STOPWORDS = frozenset(
+    "a an the and or of to in on for with is are was were be been by as at it this that "
+    "from what how why when which who do does did can could should would will".split()
+)
+
+
+def _split_identifier(identifier: str) -> List[str]:
+    """snake_case / camelCase 식별자를 구성 단어로 분리"""
+    parts = []
+    for piece in identifier.split("_"):
+        parts.extend(_CAMEL_BOUNDARY.findall(piece))
+    return [part.lower() for part in parts if part]
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    검색용 토큰화
+
+    - 한글: 조사가 붙어도 매칭되도록 글자 bigram으로 분해 (한 글자 단어는 그대로)
+    - 영문/코드 식별자: 소문자 전체 식별자 + snake_case/camelCase 구성 단어
+    - 숫자/버전 번호는 그대로 유지, 영어 불용어 제거
+    """
+    tokens = []
+    for match in _TOKEN_PATTERN.findall(text):
+        first = match[0]
+        if "가" <= first <= "힣":
+            if len(match) == 1:
+                tokens.append(match)
+            else:
+                tokens.extend(match[i:i + 2] for i in range(len(match) - 1))
+        elif first.isdigit():
+            tokens.append(match)
+        else:
+            lowered = match.lower()
+            if lowered in STOPWORDS:
+                continue
+            tokens.append(lowered)
+            parts = _split_identifier(match)
+            if len(parts) > 1:
+                tokens.extend(part for part in parts if part not in STOPWORDS)
+    return tokens
+
+
+def split_sentences(text: str) -> List[str]:
+    """문장 단위 분리 (빈 문장 제외)"""
+    return [sentence.strip() for sentence in _SENTENCE_BOUNDARY.split(text) if sentence.strip()]
@@ -0,0 +1,78 @@
+"""
+Token counting utilities
+"""
+from functools import lru_cache
+from typing import Optional
+
+from utils.logger import logger
+
+try:
+    import tiktoken
+except ImportError:  # tiktoken이 없으면 문자 수 기반 추정으로 대체
+    tiktoken = None
+
+
+DEFAULT_ENCODING = "cl100k_base"
+
+# 메시지 하나당 role/구분자에 붙는 고정 토큰 수 (Chat Completions 기준)
+MESSAGE_OVERHEAD_TOKENS = 4
+
+
+@lru_cache(maxsize=32)
+def _get_encoding(model: Optional[str]):
+    """모델별 인코딩 (없으면 기본 인코딩, 인코딩 파일을 받을 수 없으면 None)"""
+    if tiktoken is None:
+        return None
+    try:
+        if model:
+            try:
+                return tiktoken.encoding_for_model(model)
+            except KeyError:
+                pass
+        return tiktoken.get_encoding(DEFAULT_ENCODING)
+    except Exception as e:
+        # 오프라인 환경 등에서 BPE 파일 다운로드 실패 시 추정치 사용
+        logger.warning(f"tiktoken encoding unavailable, estimating tokens: {e}")
+        return None
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    토크나이저 없이 토큰 수 추정
+
+    - ASCII: 약 4자당 1토큰
+    - 한글 등 비ASCII: 약 1자당 1토큰
+    """
+    ascii_chars = sum(1 for ch in text if ord(ch) < 128)
+    return (ascii_chars + 3) // 4 + (len(text) - ascii_chars)
+
+
+def count_tokens(text: str, model: Optional[str] = None) -> int:
+    """텍스트 토큰 수"""
+    if not text:
+        return 0
+    encoding = _get_encoding(model)
+    if encoding is None:
+        return estimate_tokens(text)
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def truncate_to_tokens(text: str, max_tokens: int, model: Optional[str] = None) -> str:
+    """텍스트를 최대 토큰 수에 맞게 자르기"""
+    if max_tokens <= 0:
+        return ""
+    encoding = _get_encoding(model)
+    if encoding is None:
+        # 추정치 기반으로 줄여나감
+        if estimate_tokens(text) <= max_tokens:
+            return text
+        ratio = max_tokens / estimate_tokens(text)
+        cut = text[: int(len(text) * ratio)]
+        while cut and estimate_tokens(cut) > max_tokens:
+            cut = cut[: int(len(cut) * 0.9)]
+        return cut
+
+    tokens = encoding.encode(text, disallowed_special=())
+    if len(tokens) <= max_tokens:
+        return text
+    return encoding.decode(tokens[:max_tokens])